@@ -1,46 +1,661 @@
+import asyncio
+import base64
+import os
+
 import pytest
-from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
-from typing import Generator
+import pytest_asyncio
+from pytest_html import extras as html_extras
+from playwright.async_api import async_playwright, Error as AsyncPlaywrightError
+from playwright.async_api import Browser as AsyncBrowser, BrowserContext as AsyncBrowserContext, Page as AsyncPage
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Error as PlaywrightError, Page
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional, Union
+
+from utils.api_discovery import POSSIBLE_API_ENDPOINTS, ApiDiscovery, ApiEndpoint
+from utils.browser_server import DEFAULT_STATE_FILE as BROWSER_SERVER_STATE, BrowserServer
+from utils.context_pool import ContextPool, PooledContext
+from utils.deadline import (
+    Deadline,
+    bound_deadline,
+    get_deadline_budget,
+    set_action_timeout,
+    set_navigation_timeout,
+)
+from utils.failure_artifacts import (
+    ARTIFACT_MODES,
+    DEFAULT_ARTIFACTS_DIR,
+    USER_PROPERTY as ARTIFACTS_PROPERTY,
+    ArtifactWriter,
+    artifact_base_path,
+    capture_page,
+    get_artifacts_mode,
+    start_trace_chunk,
+    stop_trace_chunk,
+)
+from utils.har_replay import DEFAULT_HAR_DIR, HarReplayer, har_path_for
+from utils.helpers import get_base_url
+from utils.http_session import USER_PROPERTY as HTTP_CONNECTIONS_PROPERTY
+from utils.http_session import ConnectionReport, PooledSession, RetryPolicy, stats_delta
+from utils.network_blocking import (
+    USER_PROPERTY as BLOCKING_PROPERTY,
+    BlockingProfile,
+    BlockingReport,
+    NetworkBlocker,
+    profile_for_test,
+)
+from utils.network_waterfall import USER_PROPERTY as WATERFALL_PROPERTY
+from utils.network_waterfall import NetworkRecorder, WaterfallReport, is_waterfall_enabled, waterfall_html
+from utils.perf_metrics import (
+    BUDGET_MODES,
+    DEFAULT_PERF_BUDGETS,
+    USER_PROPERTY as PERF_PROPERTY,
+    PerfBudgets,
+    PerfBudgetWarning,
+    metrics_table_html,
+    navigation_log,
+)
+from utils.popup_timing import USER_PROPERTY as POPUP_PROPERTY
+from utils.popup_timing import PopupReport, popup_log
+from utils.reporting import ResultsCollector, is_xdist_worker
+from utils.run_profiles import RunProfile
+from utils import step_instrumentation
+from utils.step_instrumentation import USER_PROPERTY as STEP_PROFILE_PROPERTY
+from utils.step_instrumentation import StepProfileReport, flame_table_html, profile_log
+from utils.step_timing import USER_PROPERTY as STEP_PROPERTY
+from utils.step_timing import step_log
+from utils.storage_state import (
+    ensure_warm_storage_state,
+    get_storage_state_ttl,
+    is_snapshot_fresh,
+    storage_state_path_for,
+)
+from utils.structured_logging import bound_test, configure_logging, shutdown_logging
+from utils.stub_server import StubConfig, StubServer
+from utils.timing_store import DEFAULT_TIMING_DB, TimingStore, get_environment
+
+# Wspólne opcje kontekstu - dla puli, kontekstów "fresh_context" i rozgrzewania
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+}
+
+POOLED_CONTEXT_KEY = pytest.StashKey[PooledContext]()
+PERF_BUDGETS_KEY = pytest.StashKey[PerfBudgets]()
+ARTIFACT_WRITER_KEY = pytest.StashKey[Optional[ArtifactWriter]]()
+# Porażka w setup/call i ścieżka artefaktów testu (bez rozszerzenia)
+TEST_FAILED_KEY = pytest.StashKey[bool]()
+ARTIFACT_BASE_KEY = pytest.StashKey[str]()
+RUN_PROFILE_KEY = pytest.StashKey[RunProfile]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Opcje linii poleceń projektu"""
+    parser.addoption(
+        "--no-resource-blocking", action="store_true", default=False,
+        help="Nie blokuj obrazków, fontów, reklam i analityki (config/network_blocking.json)"
+    )
+    parser.addoption(
+        "--record", action="store_true", default=False,
+        help="Nagraj ruch sieciowy każdego testu do osobnego archiwum HAR"
+    )
+    parser.addoption(
+        "--replay", action="store_true", default=False,
+        help="Odtwarzaj ruch sieciowy z archiwów HAR zamiast łączyć się ze stroną"
+    )
+    parser.addoption(
+        "--update-on-miss", action="store_true", default=False,
+        help="Przy --replay pobierz brakujące żądania z sieci i dopisz je do HAR"
+    )
+    parser.addoption(
+        "--har-dir", action="store", default=DEFAULT_HAR_DIR,
+        help=f"Katalog archiwów HAR (domyślnie {DEFAULT_HAR_DIR})"
+    )
+    parser.addoption(
+        "--perf-budgets", action="store", default=None, choices=BUDGET_MODES,
+        help=f"Tryb budżetów wydajności z {DEFAULT_PERF_BUDGETS}: warn, fail albo off"
+    )
+    parser.addoption(
+        "--no-timing-store", action="store_true", default=False,
+        help=f"Nie zapisuj czasów testów i kroków do {DEFAULT_TIMING_DB}"
+    )
+    parser.addoption(
+        "--instrument-steps", action="store_true", default=False,
+        help="Profiluj kroki page objectów (round trips, selektory, czekanie) - raport HTML "
+             "i reports/step_profiles.json"
+    )
+    parser.addoption(
+        "--failure-artifacts", action="store", default=None, choices=ARTIFACT_MODES,
+        help=f"Artefakty testów, które nie przeszły, w {DEFAULT_ARTIFACTS_DIR}: off, basic "
+             "(screenshot i DOM) albo trace (także trace Playwright; domyślnie FAILURE_ARTIFACTS albo trace)"
+    )
+    parser.addoption(
+        "--run-profile", action="store", default=None,
+        help="Profil uruchomienia z config/run_profiles.json: fast, debug albo ci "
+             "(headless, slow_mo, limity czasu; domyślnie RUN_PROFILE albo fast)"
+    )
+    parser.addoption(
+        "--reuse-browser", action="store_true", default=os.getenv('REUSE_BROWSER', 'false').lower() == 'true',
+        help="Połącz się z serwerem przeglądarki współdzielonym przez kolejne uruchomienia "
+             "(startowany przy pierwszym użyciu; także REUSE_BROWSER=true)"
+    )
+    parser.addoption(
+        "--test-deadline", action="store", type=float, default=None,
+        help="Budżet czasu jednego testu w sekundach dla wszystkich oczekiwań i zapytań API "
+             "(domyślnie TEST_DEADLINE_S albo 180; 0 wyłącza)"
+    )
+    parser.addoption(
+        "--network-waterfall", action="store_true", default=is_waterfall_enabled(),
+        help="Nagrywaj waterfall sieci każdego testu (raport HTML, reports/network_waterfall.json, "
+             "historia wagi stron w reports/page_weight.jsonl; także NETWORK_WATERFALL=true)"
+    )
+    parser.addoption(
+        "--vod-url", action="store", default=None,
+        help="Adres testowanej strony (domyślnie VOD_BASE_URL albo https://vod.film)"
+    )
+    parser.addoption(
+        "--stub-server", action="store_true", default=False,
+        help="Uruchom testy na lokalnym zamienniku VOD.Film (utils/stub_server.py)"
+    )
+    parser.addoption(
+        "--stub-latency-ms", action="store", type=float, default=0,
+        help="Opóźnienie każdej odpowiedzi lokalnego serwera (ms)"
+    )
+    parser.addoption(
+        "--stub-failure-rate", action="store", type=float, default=0,
+        help="Odsetek odpowiedzi 503 lokalnego serwera (0-1)"
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Sprawdza opcje i rejestruje raporty zbiorcze (tylko w kontrolerze xdist)"""
+    if config.getoption("--record") and config.getoption("--replay"):
+        raise pytest.UsageError("--record i --replay wykluczają się")
+    configure_logging()
+    try:
+        config.stash[RUN_PROFILE_KEY] = RunProfile.from_file(config.getoption("--run-profile"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    set_action_timeout(config.stash[RUN_PROFILE_KEY].timeout_ms)
+    set_navigation_timeout(config.stash[RUN_PROFILE_KEY].navigation_timeout_ms)
+    if config.getoption("--instrument-steps"):
+        step_instrumentation.enable()
+    config.stash[PERF_BUDGETS_KEY] = PerfBudgets.from_file(DEFAULT_PERF_BUDGETS, config.getoption("--perf-budgets"))
+    config.stash[ARTIFACT_WRITER_KEY] = (
+        None if get_failure_artifacts_mode(config) == "off" else ArtifactWriter(DEFAULT_ARTIFACTS_DIR)
+    )
+    if not is_xdist_worker(config):
+        config.pluginmanager.register(ResultsCollector("reports/results.json"), "results-collector")
+        config.pluginmanager.register(BlockingReport("reports/network_blocking.json"), "blocking-report")
+        config.pluginmanager.register(ConnectionReport(), "connection-report")
+        config.pluginmanager.register(PopupReport(), "popup-report")
+        if config.getoption("--instrument-steps"):
+            config.pluginmanager.register(StepProfileReport(), "step-profile-report")
+        target = "stub" if config.getoption("--stub-server") else (config.getoption("--vod-url") or get_base_url())
+        if not config.getoption("--no-timing-store"):
+            config.pluginmanager.register(TimingStore(DEFAULT_TIMING_DB, get_environment(target)), "timing-store")
+        if config.getoption("--network-waterfall"):
+            config.pluginmanager.register(WaterfallReport(environment=get_environment(target)), "waterfall-report")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Czeka, aż wątki w tle zapiszą artefakty i logi"""
+    writer = config.stash.get(ARTIFACT_WRITER_KEY, None)
+    if writer is not None:
+        writer.close()
+    shutdown_logging()
+
+
+def get_failure_artifacts_mode(config: pytest.Config) -> str:
+    """Tryb artefaktów: --failure-artifacts albo zmienna FAILURE_ARTIFACTS"""
+    mode = config.getoption("--failure-artifacts") or get_artifacts_mode()
+    if mode not in ARTIFACT_MODES:
+        raise pytest.UsageError(f"Nieznany tryb artefaktów: {mode} (dozwolone: {', '.join(ARTIFACT_MODES)})")
+    return mode
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo) -> Generator[None, Any, None]:
+    """
+    Zapamiętuje porażkę testu, a przy porażce zapisuje screenshot i DOM
+    strony (w tle) i osadza screenshot w raporcie. Dołącza do wyniku testu
+    czasy kroków page objectów (z --instrument-steps
+    także ich profil jako tabelę "flame"), czasy do popupa oraz metryki wydajności nawigacji
+    (user_properties i tabele w raporcie HTML) i sprawdza budżety: w trybie
+    'fail' test z przekroczonym budżetem jest oblewany. Z --network-waterfall
+    osadza waterfall sieci testu w raporcie.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed and report.when in ("setup", "call"):
+        item.stash[TEST_FAILED_KEY] = True
+    if report.when == "teardown":
+        # Waterfall dopisuje fixture kontekstu przy zamykaniu, więc trafia do raportu teardown
+        waterfalls = [value for name, value in report.user_properties if name == WATERFALL_PROPERTY]
+        if waterfalls:
+            report.extras = getattr(report, "extras", []) + [html_extras.html(waterfall_html(waterfall))
+                                                             for waterfall in waterfalls]
+    pages = _pages_of(item)
+    if report.when != "call" or not pages:
+        return
+    writer = item.config.stash[ARTIFACT_WRITER_KEY]
+    if report.failed and writer is not None and isinstance(pages[0], Page):
+        # Strona jest jeszcze otwarta (fixture'y zamykane są po raporcie)
+        base_path = item.stash.setdefault(ARTIFACT_BASE_KEY, artifact_base_path(item.nodeid))
+        paths, screenshot = capture_page(pages[0], base_path, writer)
+        report.user_properties.append((ARTIFACTS_PROPERTY, paths))
+        if screenshot:
+            report.extras = getattr(report, "extras", []) + [
+                html_extras.png(base64.b64encode(screenshot).decode("ascii"))
+            ]
+    steps: Dict[str, Dict[str, Any]] = {}
+    for page in pages:
+        for step, stats in step_log.pop(page).items():
+            total = steps.setdefault(step, {"calls": 0, "duration_s": 0.0})
+            total["calls"] += stats["calls"]
+            total["duration_s"] = round(total["duration_s"] + stats["duration_s"], 4)
+    if steps:
+        report.user_properties.append((STEP_PROPERTY, steps))
+    popups = [timing for page in pages for timing in popup_log.pop(page)]
+    if popups:
+        report.user_properties.append((POPUP_PROPERTY, popups))
+    profile = [frame for page in pages for frame in profile_log.pop(page)]
+    if profile:
+        report.user_properties.append((STEP_PROFILE_PROPERTY, profile))
+        report.extras = getattr(report, "extras", []) + [html_extras.html(flame_table_html(profile))]
+    navigations = [metrics for page in pages for metrics in navigation_log.pop(page)]
+    if not navigations:
+        return
+    budgets = item.config.stash[PERF_BUDGETS_KEY]
+    violations = [violation for metrics in navigations for violation in budgets.check(metrics)]
+    report.user_properties.append((PERF_PROPERTY, navigations))
+    report.extras = getattr(report, "extras", []) + [
+        html_extras.html(metrics_table_html(navigations, [message for _, message in violations]))
+    ]
+    failures = [message for mode, message in violations if mode == "fail"]
+    for mode, message in violations:
+        if mode == "warn":
+            item.warn(PerfBudgetWarning(f"Przekroczony budżet wydajności: {message}"))
+    if failures and report.passed:
+        report.outcome = "failed"
+        report.longrepr = "Przekroczone budżety wydajności:\n" + "\n".join(failures)
+
+
+def _pages_of(item: pytest.Item) -> List[Any]:
+    """
+    Strony Playwright testu: fixture page albo wszystkie strony z async_context
+    (test async może prowadzić wiele ścieżek na osobnych stronach)
+    """
+    funcargs = getattr(item, "funcargs", {})
+    page = funcargs.get("page")
+    if isinstance(page, Page):
+        return [page]
+    context = funcargs.get("async_context")
+    if isinstance(context, AsyncBrowserContext):
+        return list(context.pages)
+    page = funcargs.get("async_page")
+    return [page] if isinstance(page, AsyncPage) else []
+
+
+@pytest.fixture(autouse=True)
+def test_logging(request: pytest.FixtureRequest) -> Generator[None, None, None]:
+    """
+    Oznacza rekordy logu identyfikatorem testu. Marker
+    @pytest.mark.log_level("DEBUG") zmienia poziom tylko dla tego testu.
+    """
+    marker = request.node.get_closest_marker("log_level")
+    with bound_test(request.node.nodeid, marker.args[0].upper() if marker else None):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def test_deadline(request: pytest.FixtureRequest) -> Generator[Optional[Deadline], None, None]:
+    """
+    Budżet czasu testu, z którego korzystają oczekiwania page objectów
+    i zapytania API: marker @pytest.mark.deadline(seconds), --test-deadline
+    albo TEST_DEADLINE_S (0 wyłącza budżet)
+    """
+    marker = request.node.get_closest_marker("deadline")
+    if marker:
+        budget = marker.args[0]
+    elif request.config.getoption("--test-deadline") is not None:
+        budget = request.config.getoption("--test-deadline")
+    else:
+        budget = get_deadline_budget()
+    with bound_deadline(budget) as deadline:
+        yield deadline
+
+
+@pytest.fixture(scope="session")
+def run_profile(pytestconfig: pytest.Config) -> RunProfile:
+    """Profil uruchomienia (--run-profile albo RUN_PROFILE): headless, slow_mo, limity czasu"""
+    return pytestconfig.stash[RUN_PROFILE_KEY]
+
+
+@pytest.fixture(scope="session")
+def browser_server(pytestconfig: pytest.Config, run_profile: RunProfile) -> Optional[BrowserServer]:
+    """Serwer przeglądarki współdzielony przez uruchomienia (tylko z --reuse-browser)"""
+    if not pytestconfig.getoption("--reuse-browser"):
+        return None
+    return BrowserServer(run_profile.server_options(), BROWSER_SERVER_STATE)
 
 
 @pytest.fixture(scope="session")
-def browser() -> Generator[Browser, None, None]:
-    """Fixture dla przeglądarki - jedna instancja na sesję testową"""
-    import os
+def browser(run_profile: RunProfile, browser_server: Optional[BrowserServer]) -> Generator[Browser, None, None]:
+    """
+    Fixture dla przeglądarki - jedna instancja na sesję testową.
     
-    # Sprawdź czy jesteśmy w Docker lub CI
-    is_headless = os.getenv('HEADLESS', 'false').lower() == 'true' or os.getenv('CI', 'false').lower() == 'true'
+    Przy uruchomieniu równoległym (pytest -n N) każdy worker xdist to osobny
+    proces z własną sesją, więc dostaje własną przeglądarkę, a konteksty
+    i strony pozostają izolowane per test.
     
+    Z --reuse-browser łączy się z serwerem przeglądarki zamiast ją startować;
+    zamknięcie tylko rozłącza (zamyka konteksty sesji), serwer działa dalej.
+    """
     with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=is_headless,
-            slow_mo=0 if is_headless else 1000,  # Bez spowolnienia w headless
-            args=['--no-sandbox', '--disable-dev-shm-usage'] if is_headless else []
-        )
+        if browser_server is None:
+            browser = p.chromium.launch(**run_profile.launch_options())
+        else:
+            endpoint = browser_server.endpoint()
+            try:
+                browser = p.chromium.connect(endpoint, slow_mo=run_profile.slow_mo)
+            except PlaywrightError:
+                # Serwer zawiesił się mimo otwartego portu - wymieniamy go,
+                # o ile inny worker nie zrobił tego wcześniej
+                browser = p.chromium.connect(browser_server.restart(endpoint), slow_mo=run_profile.slow_mo)
         yield browser
         browser.close()
 
 
+def get_har_mode(config: pytest.Config) -> Optional[str]:
+    """Tryb HAR sesji: 'record', 'replay' albo None"""
+    if config.getoption("--record"):
+        return "record"
+    if config.getoption("--replay"):
+        return "replay"
+    return None
+
+
+@pytest.fixture(scope="session")
+def storage_state(pytestconfig: pytest.Config, browser: Browser,
+                  base_url: str) -> Union[str, Dict[str, Any], None]:
+    """
+    Ścieżka do rozgrzanego snapshotu (cookies, localStorage, zgody) po jednej
+    wizycie na stronie. Snapshot jest używany ponownie między uruchomieniami
+    do czasu wygaśnięcia STORAGE_STATE_TTL (sekundy, 0 wyłącza).
+    
+    Serwer testowy (--stub-server) dostaje przy każdym uruchomieniu inny
+    port, więc jego stan trzymamy tylko w pamięci, bez pliku na dysku.
+    
+    W trybach --record/--replay rozgrzewanie jest wyłączone - nagranie
+    i odtworzenie muszą startować z tego samego, pustego stanu.
+    """
+    if get_har_mode(pytestconfig):
+        return None
+    path = None if pytestconfig.getoption("--stub-server") else storage_state_path_for(base_url)
+    return ensure_warm_storage_state(browser, base_url, CONTEXT_OPTIONS, path=path)
+
+
+@pytest.fixture(scope="session")
+def context_options(storage_state: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """Opcje nowych kontekstów - CONTEXT_OPTIONS plus rozgrzany snapshot"""
+    options = dict(CONTEXT_OPTIONS)
+    if storage_state:
+        options["storage_state"] = storage_state
+    return options
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser, context_options: Dict[str, Any]) -> Generator[ContextPool, None, None]:
+    """
+    Pula rozgrzanych kontekstów - jedna na sesję (czyli na worker xdist).
+    Rozmiar puli: zmienna CONTEXT_POOL_SIZE (domyślnie 1, testy w workerze
+    idą sekwencyjnie).
+    """
+    pool = ContextPool(browser, size=int(os.getenv('CONTEXT_POOL_SIZE', '1')), **context_options)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def blocking_profile(pytestconfig: pytest.Config) -> Optional[BlockingProfile]:
+    """Profil blokowania zasobów dla testów funkcjonalnych (None = bez blokady)"""
+    if pytestconfig.getoption("--no-resource-blocking"):
+        return None
+    return BlockingProfile.from_file()
+
+
 @pytest.fixture(scope="function")
-def context(browser: Browser) -> Generator[BrowserContext, None, None]:
-    """Fixture dla kontekstu przeglądarki - nowy na każdy test"""
-    context = browser.new_context(
-        viewport={"width": 1920, "height": 1080},
-        user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-    )
+def context(request: pytest.FixtureRequest, browser: Browser, context_pool: ContextPool,
+            context_options: Dict[str, Any], blocking_profile: Optional[BlockingProfile],
+            run_profile: RunProfile) -> Generator[BrowserContext, None, None]:
+    """
+    Fixture dla kontekstu przeglądarki - z puli, z wyczyszczonym stanem.
+    Test oznaczony @pytest.mark.fresh_context dostaje nowy kontekst.
+    
+    Obrazki, fonty, reklamy i analityka są blokowane; test może z tego
+    zrezygnować markerem no_blocking albo allow_resources("ads", ...).
+    
+    W trybach --record/--replay każdy test ma własny kontekst i własne
+    archiwum HAR (HAR zapisuje się przy zamknięciu kontekstu).
+    
+    W trybie artefaktów 'trace' każdy test nagrywa kawałek trace
+    Playwright, zapisywany do reports/screenshots tylko przy porażce.
+    """
+    har_mode = get_har_mode(request.config)
+    har_path = har_path_for(request.node.nodeid, request.config.getoption("--har-dir"))
+    update_on_miss = request.config.getoption("--update-on-miss")
+    
+    pooled = None
+    if har_mode == "record":
+        os.makedirs(os.path.dirname(har_path), exist_ok=True)
+        context = browser.new_context(**context_options, record_har_path=har_path, record_har_content="embed")
+    elif har_mode == "replay" or request.node.get_closest_marker("fresh_context"):
+        context = browser.new_context(**context_options)
+    else:
+        pooled = context_pool.acquire()
+        request.node.stash[POOLED_CONTEXT_KEY] = pooled
+        context = pooled.context
+    run_profile.apply(context)
+        
+    replayer = None
+    if har_mode == "replay":
+        if not os.path.exists(har_path) and not update_on_miss:
+            context.close()
+            pytest.fail(f"Brak nagrania {har_path} - uruchom test z --record", pytrace=False)
+        replayer = HarReplayer(har_path, update_on_miss=update_on_miss)
+        replayer.attach(context)
+        
+    # Blokada rejestrowana po HAR, więc jest sprawdzana przed odtwarzaniem
+    profile = profile_for_test(blocking_profile, request.node)
+    blocker = NetworkBlocker(profile) if profile else None
+    if blocker:
+        blocker.attach(context)
+        
+    recorder = None
+    if request.config.getoption("--network-waterfall"):
+        recorder = NetworkRecorder(request.getfixturevalue("base_url"))
+        recorder.attach(context)
+        
+    # Trace nagrywany w kawałkach - zapisywany tylko, gdy test nie przeszedł
+    tracing = get_failure_artifacts_mode(request.config) == "trace"
+    if tracing:
+        start_trace_chunk(context, request.node.nodeid)
+        
     yield context
-    context.close()
+    
+    if tracing:
+        trace_path = None
+        if request.node.stash.get(TEST_FAILED_KEY, False):
+            base_path = request.node.stash.setdefault(ARTIFACT_BASE_KEY, artifact_base_path(request.node.nodeid))
+            trace_path = f"{base_path}.zip"
+        if stop_trace_chunk(context, trace_path):
+            request.node.user_properties.append((ARTIFACTS_PROPERTY, [trace_path]))
+            request.config.stash[ARTIFACT_WRITER_KEY].enforce_retention()
+    if blocker:
+        request.node.user_properties.append((BLOCKING_PROPERTY, blocker.summary()))
+    if recorder:
+        recorder.detach(context)
+        request.node.user_properties.append((WATERFALL_PROPERTY, recorder.finalize()))
+    if pooled is not None:
+        context_pool.release(pooled)
+    else:
+        context.close()
+    if replayer:
+        replayer.finalize()
+        if replayer.misses and not update_on_miss:
+            pytest.fail(replayer.miss_report(), pytrace=False)
 
 
 @pytest.fixture(scope="function") 
-def page(context: BrowserContext) -> Generator[Page, None, None]:
-    """Fixture dla strony - nowa na każdy test"""
+def page(request: pytest.FixtureRequest, context: BrowserContext) -> Generator[Page, None, None]:
+    """Fixture dla strony - rozgrzana strona z puli albo nowa dla fresh_context"""
+    pooled = request.node.stash.get(POOLED_CONTEXT_KEY, None)
+    if pooled is not None and pooled.context is context:
+        # Stronę z puli czyści i ewentualnie odtwarza ContextPool.release
+        yield pooled.page
+        return
+        
     page = context.new_page()
     yield page
     page.close()
 
 
-@pytest.fixture
-def base_url() -> str:
-    """URL strony do testowania"""
-    return "https://vod.film"
\ No newline at end of file
+@pytest.fixture(scope="session")
+def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """
+    Jedna pętla zdarzeń na sesję (pytest-asyncio domyślnie tworzy pętlę na
+    test) - przeglądarka async_browser żyje w niej przez całą sesję
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_browser(run_profile: RunProfile,
+                        browser_server: Optional[BrowserServer]) -> AsyncGenerator[AsyncBrowser, None]:
+    """
+    Przeglądarka dla testów async (playwright.async_api) - jedna na sesję.
+    W jednej pętli zdarzeń może działać równolegle wiele stron i kontekstów.
+    Z --reuse-browser łączy się z serwerem przeglądarki jak fixture browser.
+    """
+    async with async_playwright() as p:
+        if browser_server is None:
+            browser = await p.chromium.launch(**run_profile.launch_options())
+        else:
+            endpoint = browser_server.endpoint()
+            try:
+                browser = await p.chromium.connect(endpoint, slow_mo=run_profile.slow_mo)
+            except AsyncPlaywrightError:
+                browser = await p.chromium.connect(browser_server.restart(endpoint), slow_mo=run_profile.slow_mo)
+        yield browser
+        await browser.close()
+
+
+@pytest.fixture(scope="session")
+def async_context_options(base_url: str) -> Dict[str, Any]:
+    """
+    CONTEXT_OPTIONS plus snapshot storage state, jeśli jest świeży. Testy
+    async nie rozgrzewają strony same - robi to fixture storage_state.
+    """
+    options = dict(CONTEXT_OPTIONS)
+    path = storage_state_path_for(base_url)
+    if is_snapshot_fresh(path, get_storage_state_ttl()):
+        options["storage_state"] = path
+    return options
+
+
+@pytest_asyncio.fixture
+async def async_context(request: pytest.FixtureRequest, async_browser: AsyncBrowser,
+                        async_context_options: Dict[str, Any], blocking_profile: Optional[BlockingProfile],
+                        run_profile: RunProfile) -> AsyncGenerator[AsyncBrowserContext, None]:
+    """
+    Nowy kontekst async na test, z blokadą zasobów jak w fixture context.
+    Test może otworzyć w nim wiele stron (await async_context.new_page())
+    i prowadzić na nich ścieżki równolegle przez asyncio.gather.
+    """
+    if get_har_mode(request.config):
+        pytest.skip("Tryby --record/--replay obsługują tylko synchroniczne API Playwright")
+    context = await async_browser.new_context(**async_context_options)
+    run_profile.apply(context)
+    profile = profile_for_test(blocking_profile, request.node)
+    blocker = NetworkBlocker(profile) if profile else None
+    if blocker:
+        await blocker.attach_async(context)
+    recorder = None
+    if request.config.getoption("--network-waterfall"):
+        recorder = NetworkRecorder(request.getfixturevalue("base_url"))
+        recorder.attach_async(context)
+        
+    yield context
+    
+    if blocker:
+        request.node.user_properties.append((BLOCKING_PROPERTY, blocker.summary()))
+    if recorder:
+        recorder.detach(context)
+        request.node.user_properties.append((WATERFALL_PROPERTY, recorder.finalize()))
+    await context.close()
+
+
+@pytest_asyncio.fixture
+async def async_page(async_context: AsyncBrowserContext) -> AsyncGenerator[AsyncPage, None]:
+    """Strona async w kontekście async_context"""
+    page = await async_context.new_page()
+    yield page
+    await page.close()
+
+
+@pytest.fixture(scope="session")
+def stub_server(pytestconfig: pytest.Config) -> Generator[StubServer, None, None]:
+    """
+    Lokalny zamiennik VOD.Film (osobny w każdym workerze xdist).
+    Testy mogą zmieniać jego warunki w trakcie, np.
+    stub_server.config.update({"latency_ms": 2000}).
+    """
+    config = StubConfig(
+        latency_ms=pytestconfig.getoption("--stub-latency-ms"),
+        failure_rate=pytestconfig.getoption("--stub-failure-rate"),
+    )
+    with StubServer(config=config) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def base_url(request: pytest.FixtureRequest) -> str:
+    """URL strony do testowania: --stub-server, --vod-url, VOD_BASE_URL albo vod.film"""
+    if request.config.getoption("--stub-server"):
+        return request.getfixturevalue("stub_server").url
+    return (request.config.getoption("--vod-url") or get_base_url()).rstrip('/')
+
+
+@pytest.fixture(scope="session")
+def pooled_http_session() -> Generator[PooledSession, None, None]:
+    """
+    Wspólna sesja HTTP dla testów API (keep-alive, ponawianie 429/5xx
+    z Retry-After) - jedna na sesję, czyli na worker xdist
+    """
+    session = PooledSession()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="function")
+def http_session(request: pytest.FixtureRequest,
+                 pooled_http_session: PooledSession) -> Generator[PooledSession, None, None]:
+    """Sesja HTTP dla testu; zapisuje do raportu, ile połączeń otwarto i użyto ponownie"""
+    before = pooled_http_session.connection_stats()
+    yield pooled_http_session
+    request.node.user_properties.append(
+        (HTTP_CONNECTIONS_PROPERTY, stats_delta(before, pooled_http_session.connection_stats()))
+    )
+
+
+@pytest.fixture(scope="session")
+def api_endpoint(base_url: str) -> Optional[ApiEndpoint]:
+    """
+    Działający endpoint API wyszukiwarki - szukany raz na sesję (równolegle
+    po wszystkich kandydatach) i zapamiętywany w reports/api_endpoint.json
+    na API_DISCOVERY_TTL sekund. None gdy żaden kandydat nie odpowiada.
+    """
+    # Bez ponawiania - kandydat, który nie odpowiada, kosztuje najwyżej jeden timeout
+    with PooledSession(RetryPolicy(retries=0), pool_maxsize=len(POSSIBLE_API_ENDPOINTS)) as session:
+        return ApiDiscovery(base_url, session=session).find()
@@ -2,5 +2,11 @@ from .base_page import BasePage
 from .home_page import HomePage  
 from .movie_page import MoviePage
 from .movies_page import MoviesPage
+from .async_base_page import AsyncBasePage
+from .async_home_page import AsyncHomePage
+from .async_movie_page import AsyncMoviePage
+from .async_movies_page import AsyncMoviesPage
+from .records import MovieCard
 
-__all__ = ['BasePage', 'HomePage', 'MoviePage', 'MoviesPage']
\ No newline at end of file
+__all__ = ['BasePage', 'HomePage', 'MoviePage', 'MoviesPage',
+           'AsyncBasePage', 'AsyncHomePage', 'AsyncMoviePage', 'AsyncMoviesPage', 'MovieCard']
@@ -0,0 +1,245 @@
+from playwright.async_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import time
+import weakref
+
+from utils.deadline import navigation_timeout_ms, timeout_ms
+from utils.helpers import page_type_for_url
+from utils.perf_metrics import get_perf_load_timeout, is_perf_capture_enabled, navigation_log
+from utils.step_timing import instrument_public_methods
+from .base_page import BasePage
+from .records import MovieCard
+from .scripts import (
+    ANY_VISIBLE,
+    COLLECT_PERF_METRICS,
+    COUNT_FIRST_MATCH,
+    EXTRACT_CARDS,
+    INSTALL_PERF_OBSERVER,
+    INSTALL_WAIT_TRACKER,
+    PAGE_SETTLED,
+    SELECTOR_UNSUPPORTED,
+    SELECTOR_VISIBLE,
+    VISIBILITY_STATUSES,
+    VISIBLE_HREFS,
+)
+
+# Strony (async), które mają już zainstalowany init script śledzący aktywność
+_TRACKED_PAGES: "weakref.WeakSet[Page]" = weakref.WeakSet()
+
+
+def with_constants_of(sync_class: type) -> Callable[[type], type]:
+    """
+    Przejmuje stałe (selektory, limity czasu) z synchronicznego page objectu,
+    żeby obie wersje API korzystały z jednego źródła selektorów
+    """
+
+    def decorate(cls: type) -> type:
+        for name, value in vars(sync_class).items():
+            if name.isupper() and name not in vars(cls):
+                setattr(cls, name, value)
+        return cls
+
+    return decorate
+
+
+@with_constants_of(BasePage)
+class AsyncBasePage:
+    """
+    Asynchroniczny odpowiednik BasePage (playwright.async_api) - te same
+    nazwy metod, ale każdą trzeba wywołać przez await. Pozwala prowadzić
+    wiele ścieżek użytkownika naraz w jednej pętli zdarzeń.
+    """
+
+    # Cache zwycięskich selektorów wspólny z synchronicznymi page objectami
+    selector_cache = BasePage.selector_cache
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        # Publiczne metody stron są krokami testu - mierzymy ich czas
+        super().__init_subclass__(**kwargs)
+        instrument_public_methods(cls)
+
+    def __init__(self, page: Page):
+        # Init script instalowany jest przy pierwszym await (konstruktor nie
+        # może czekać) - najpóźniej przed nawigacją w navigate_to
+        self.page = page
+
+    async def navigate_to(self, url: str) -> None:
+        """Nawiguje do podanego URL"""
+        await self._install_wait_tracker()
+        await self.page.goto(url, timeout=navigation_timeout_ms())
+        await self.record_navigation_metrics()
+
+    async def accept_cookie_consent(self) -> bool:
+        """Akceptuje zgodę na cookies, jeśli baner jest widoczny"""
+        return await self.click_first_visible(self.COOKIE_CONSENT_SELECTORS) is not None
+
+    async def wait_for_element(self, selector: str, timeout: int = 10000) -> None:
+        """Czeka na pojawienie się elementu"""
+        await self.page.wait_for_selector(selector, timeout=timeout_ms(timeout))
+
+    async def click_element(self, selector: str) -> None:
+        """Klika w element"""
+        await self.page.click(selector, timeout=timeout_ms())
+
+    async def type_text(self, selector: str, text: str) -> None:
+        """Wpisuje tekst w pole"""
+        await self.page.fill(selector, text, timeout=timeout_ms())
+
+    async def get_text(self, selector: str) -> str:
+        """Pobiera tekst z elementu"""
+        return await self.page.text_content(selector, timeout=timeout_ms()) or ""
+
+    async def is_element_visible(self, selector: str) -> bool:
+        """Sprawdza czy element jest widoczny"""
+        try:
+            return await self.page.is_visible(selector)
+        except Exception:
+            return False
+
+    async def get_current_url(self) -> str:
+        """Zwraca aktualny URL"""
+        return self.page.url
+
+    async def wait_for_url_change(self, timeout: int = 10000) -> str:
+        """Czeka na zmianę URL (commit nawigacji) i zwraca nowy URL"""
+        current_url = self.page.url
+        try:
+            await self.page.wait_for_url(lambda url: url != current_url, timeout=timeout_ms(timeout), wait_until="commit")
+        except PlaywrightTimeoutError:
+            return self.page.url
+
+        await self.record_navigation_metrics(wait_for_load=True)
+        return self.page.url
+
+    async def record_navigation_metrics(self, wait_for_load: bool = False) -> Optional[Dict[str, Any]]:
+        """Zapisuje metryki wydajności bieżącego dokumentu (jak BasePage.record_navigation_metrics)"""
+        if not is_perf_capture_enabled():
+            return None
+        if wait_for_load:
+            try:
+                await self.page.wait_for_load_state("load", timeout=timeout_ms(get_perf_load_timeout()))
+            except PlaywrightTimeoutError:
+                pass
+        try:
+            metrics = await self.page.evaluate(COLLECT_PERF_METRICS)
+        except PlaywrightError:
+            return None
+        metrics["page_type"] = page_type_for_url(metrics["url"])
+        navigation_log.record(self.page, metrics)
+        return metrics
+
+    async def get_attribute(self, selector: str, attribute: str) -> Optional[str]:
+        """Pobiera wartość atrybutu elementu"""
+        return await self.page.get_attribute(selector, attribute, timeout=timeout_ms())
+
+    async def get_first_visible_href(self, selectors: Sequence[str]) -> str:
+        """Pobiera href pierwszego widocznego linku z łańcucha, pomijając linki bez href"""
+        try:
+            hrefs = await self.page.evaluate(VISIBLE_HREFS, list(selectors))
+        except Exception:
+            hrefs = [None] * len(selectors)
+        for selector, href in zip(selectors, hrefs):
+            if href is None and await self.is_element_visible(selector):
+                href = await self.get_attribute(selector, 'href')
+            if href:
+                return href
+        return ""
+
+    async def resolve_selector(self, selectors: Sequence[str]) -> Optional[str]:
+        """Zwraca pierwszy widoczny selektor z łańcucha fallbacków (jednym evaluate, z cache)"""
+        key = self.selector_cache.make_key(page_type_for_url(self.page.url), selectors)
+        cached = self.selector_cache.get(key)
+        if cached is not None and cached in selectors:
+            if await self._first_visible([cached]) == cached:
+                return cached
+            self.selector_cache.invalidate(key)
+
+        selector = await self._first_visible(selectors)
+        if selector is not None:
+            self.selector_cache.set(key, selector)
+        return selector
+
+    async def is_any_visible(self, selectors: Sequence[str]) -> bool:
+        """Sprawdza czy którykolwiek z selektorów jest widoczny"""
+        return await self.resolve_selector(selectors) is not None
+
+    async def click_first_visible(self, selectors: Sequence[str]) -> Optional[str]:
+        """Klika w pierwszy widoczny element z łańcucha i zwraca użyty selektor"""
+        selector = await self.resolve_selector(selectors)
+        if selector is not None:
+            await self.click_element(selector)
+        return selector
+
+    async def extract_cards(self, selectors: Sequence[str]) -> List[MovieCard]:
+        """Dane wszystkich kart jednym evaluate (jak BasePage.extract_cards)"""
+        try:
+            rows = await self.page.evaluate(EXTRACT_CARDS, list(selectors))
+        except PlaywrightError:
+            return []
+        return [MovieCard.from_script(row) for row in rows]
+
+    async def count_matching(self, selectors: Sequence[str]) -> int:
+        """Liczba elementów pierwszego selektora, który cokolwiek wskazuje (jedno evaluate)"""
+        try:
+            return await self.page.evaluate(COUNT_FIRST_MATCH, list(selectors))
+        except PlaywrightError:
+            return 0
+
+    async def _visibility_statuses(self, selectors: Sequence[str]) -> List[int]:
+        try:
+            return await self.page.evaluate(VISIBILITY_STATUSES, list(selectors))
+        except Exception:
+            return [SELECTOR_UNSUPPORTED] * len(selectors)
+
+    async def _first_visible(self, selectors: Sequence[str]) -> Optional[str]:
+        statuses = await self._visibility_statuses(selectors)
+        for selector, status in zip(selectors, statuses):
+            if status == SELECTOR_VISIBLE or (
+                    status == SELECTOR_UNSUPPORTED and await self.is_element_visible(selector)):
+                return selector
+        return None
+
+    async def wait_for_page_settled(self, selectors: Sequence[str] = (), quiet_ms: Optional[int] = None,
+                                    timeout: Optional[int] = None) -> bool:
+        """
+        Czeka aż któryś z selektorów zacznie pasować albo strona się uspokoi.
+        Zwraca False po przekroczeniu timeoutu.
+        """
+        quiet_ms = self.QUIET_MS if quiet_ms is None else quiet_ms
+        timeout = self.SETTLE_TIMEOUT if timeout is None else timeout
+        return await self._wait_for_function(PAGE_SETTLED, {"selectors": list(selectors), "quietMs": quiet_ms},
+                                             timeout)
+
+    async def wait_for_any_visible(self, selectors: Sequence[str], timeout: int = 10000) -> bool:
+        """Czeka aż którykolwiek z selektorów CSS wskaże widoczny element"""
+        return await self._wait_for_function(ANY_VISIBLE, list(selectors), timeout)
+
+    async def _install_wait_tracker(self) -> None:
+        """Instaluje śledzenie aktywności dla kolejnych dokumentów strony"""
+        if self.page in _TRACKED_PAGES:
+            return
+        _TRACKED_PAGES.add(self.page)
+        await self.page.add_init_script(
+            script=f"({INSTALL_WAIT_TRACKER.strip()})();\n({INSTALL_PERF_OBSERVER.strip()})();"
+        )
+
+    async def _wait_for_function(self, expression: str, arg: Any, timeout: int) -> bool:
+        """page.wait_for_function odporne na nawigację (jak w BasePage)"""
+        await self._install_wait_tracker()
+        # Limit przycięty do budżetu czasu testu
+        deadline = time.monotonic() + timeout_ms(timeout) / 1000
+        while True:
+            remaining = int((deadline - time.monotonic()) * 1000)
+            if remaining <= 0:
+                return False
+            try:
+                await self.page.wait_for_function(expression, arg=arg, timeout=remaining)
+                return True
+            except PlaywrightTimeoutError:
+                return False
+            except PlaywrightError as error:
+                if "context was destroyed" not in str(error) and "navigat" not in str(error):
+                    raise
+
+
+instrument_public_methods(AsyncBasePage)
@@ -0,0 +1,67 @@
+from .async_base_page import AsyncBasePage, with_constants_of
+from .home_page import HomePage
+from .records import MovieCard
+from playwright.async_api import Page
+from typing import List, Optional
+
+from utils.helpers import get_base_url
+
+
+@with_constants_of(HomePage)
+class AsyncHomePage(AsyncBasePage):
+    """Strona główna VOD.Film - wersja async (selektory z HomePage)"""
+    
+    def __init__(self, page: Page, base_url: Optional[str] = None):
+        super().__init__(page)
+        self.base_url = (base_url or get_base_url()).rstrip('/')
+        
+    async def open_homepage(self) -> None:
+        """Otwiera stronę główną"""
+        await self.navigate_to(self.base_url)
+        
+    async def click_search_icon(self) -> None:
+        """Klika w ikonę wyszukiwania (lupkę)"""
+        if await self.click_first_visible(self.SEARCH_ICON_SELECTORS):
+            return
+        await self.click_search_input()
+        
+    async def click_search_input(self) -> None:
+        """Klika w pole wyszukiwania"""
+        await self.click_first_visible(self.SEARCH_INPUT_SELECTORS)
+        
+    async def search_for_movie(self, query: str) -> None:
+        """Wyszukuje film po frazie"""
+        search_selector = await self.resolve_selector(self.SEARCH_FIELD_SELECTORS)
+        if search_selector:
+            await self.type_text(search_selector, query)
+            
+        await self.wait_for_page_settled(quiet_ms=300, timeout=1000)
+        
+        if await self.click_first_visible(self.SEARCH_SUBMIT_SELECTORS):
+            return
+        if await self.is_any_visible(self.SEARCH_FIELD_SELECTORS):
+            await self.page.keyboard.press("Enter")
+            
+    async def get_search_results(self) -> List[MovieCard]:
+        """Pobiera wyniki wyszukiwania (href, tytuł, rok, plakat) jednym wywołaniem"""
+        await self.wait_for_page_settled(self.RESULT_SELECTORS)
+        return await self.extract_cards(self.RESULT_SELECTORS)
+        
+    async def click_first_movie_result(self) -> str:
+        """Klika w pierwszy wynik wyszukiwania i zwraca URL"""
+        selector = await self.resolve_selector(self.FIRST_RESULT_SELECTORS)
+        if selector:
+            href = await self.get_attribute(selector, 'href')
+            await self.click_element(selector)
+            await self.wait_for_url_change()
+            return href or ""
+            
+        return ""
+        
+    async def go_to_movies_page(self) -> None:
+        """Przechodzi do strony Filmy"""
+        if await self.is_element_visible(self.MENU_FILMY):
+            await self.click_element(self.MENU_FILMY)
+            await self.wait_for_url_change()
+        else:
+            await self.navigate_to(f"{self.base_url}/filmy")
@@ -0,0 +1,87 @@
+from .async_base_page import AsyncBasePage, with_constants_of
+from .movie_page import MoviePage
+from .scripts import ARM_POPUP_OBSERVER, AWAIT_POPUP
+from playwright.async_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from typing import Optional
+
+from utils.deadline import timeout_ms
+from utils.popup_timing import PopupTiming, popup_log
+
+
+@with_constants_of(MoviePage)
+class AsyncMoviePage(AsyncBasePage):
+    """Strona szczegółów filmu - wersja async (selektory z MoviePage)"""
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        
+    async def wait_for_movie_page(self, timeout: int = 10000) -> bool:
+        """Czeka na załadowanie strony filmu (DOM i nagłówek H1)"""
+        try:
+            await self.page.wait_for_load_state("domcontentloaded", timeout=timeout_ms(timeout))
+        except PlaywrightTimeoutError:
+            return False
+        return await self.wait_for_any_visible([self.MOVIE_TITLE_H1], timeout=timeout)
+        
+    async def get_movie_title(self) -> str:
+        """Pobiera tytuł filmu z H1"""
+        if await self.is_element_visible(self.MOVIE_TITLE_H1):
+            return await self.get_text(self.MOVIE_TITLE_H1)
+        return ""
+        
+    async def is_video_player_visible(self) -> bool:
+        """Sprawdza czy odtwarzacz wideo jest widoczny"""
+        return await self.is_any_visible(self.PLAYER_SELECTORS)
+        
+    async def play_video(self) -> None:
+        """Uruchamia odtwarzanie wideo (i mierzy czas od kliknięcia do popupa)"""
+        await self._arm_popup_observer(reset=True)
+        if await self.click_first_visible(self.PLAY_BUTTON_SELECTORS):
+            return
+        await self.click_first_visible(self.PLAYER_CLICK_SELECTORS)
+        
+    async def wait_for_popup(self, timeout: int = 60) -> bool:
+        """Czeka na pojawienie się popupa (1-60 sekund)"""
+        return await self.measure_popup(timeout) is not None
+        
+    async def measure_popup(self, timeout: int = 60) -> Optional[PopupTiming]:
+        """Czas od kliknięcia play do popupa i URL przekierowania (jak MoviePage.measure_popup)"""
+        await self._arm_popup_observer(reset=False)
+        try:
+            result = await self.page.evaluate(AWAIT_POPUP, timeout_ms(timeout * 1000))
+        except PlaywrightError:
+            return None
+        if result is None:
+            return None
+        timing = PopupTiming.from_script(result)
+        popup_log.record(self.page, timing)
+        return timing
+        
+    async def get_popup_redirect_url(self) -> str:
+        """Pobiera URL przekierowania z popupa"""
+        if not await self.is_popup_visible():
+            return ""
+            
+        return await self.get_first_visible_href(self.POPUP_REDIRECT_LINK_SELECTORS)
+        
+    async def is_popup_visible(self) -> bool:
+        """Sprawdza czy popup jest widoczny"""
+        return await self.is_any_visible(self.POPUP_SELECTORS)
+        
+    async def click_popup_link(self) -> str:
+        """Klika w link w popupie i zwraca URL docelowy"""
+        selector = await self.resolve_selector(self.POPUP_LINK_SELECTORS)
+        if selector:
+            href = await self.get_attribute(selector, 'href')
+            await self.click_element(selector)
+            url_after = await self.wait_for_url_change(timeout=2000)
+            return href or url_after
+            
+        return ""
+        
+    async def close_popup(self) -> None:
+        """Zamyka popup"""
+        await self.click_first_visible(self.CLOSE_SELECTORS)
+        
+    async def _arm_popup_observer(self, reset: bool) -> None:
+        await self.page.evaluate(ARM_POPUP_OBSERVER, {"selectors": list(self.POPUP_WAIT_SELECTORS), "reset": reset})
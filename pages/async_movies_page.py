@@ -0,0 +1,56 @@
+from .async_base_page import AsyncBasePage, with_constants_of
+from .movies_page import MoviesPage
+from .records import MovieCard
+from playwright.async_api import Page
+from typing import List, Optional
+
+from utils.deadline import timeout_ms
+from utils.helpers import get_base_url
+
+
+@with_constants_of(MoviesPage)
+class AsyncMoviesPage(AsyncBasePage):
+    """Strona z listą filmów - wersja async (selektory z MoviesPage)"""
+    
+    def __init__(self, page: Page, base_url: Optional[str] = None):
+        super().__init__(page)
+        self.movies_url = f"{(base_url or get_base_url()).rstrip('/')}/filmy"
+        
+    async def open_movies_page(self) -> None:
+        """Otwiera stronę filmów"""
+        await self.navigate_to(self.movies_url)
+        
+    async def is_sort_dropdown_visible(self) -> bool:
+        """Sprawdza czy lista rozwijana sortowania jest widoczna"""
+        return await self.is_any_visible(self.SORT_DROPDOWN_SELECTORS)
+        
+    async def select_sort_option(self, option_text: str) -> None:
+        """Wybiera opcję sortowania"""
+        selector = await self.resolve_selector(self.SORT_SELECT_SELECTORS)
+        if selector:
+            await self.page.select_option(selector, label=option_text, timeout=timeout_ms())
+            await self.wait_for_page_settled()
+            
+    async def click_clear_button(self) -> None:
+        """Klika przycisk Wyczyść"""
+        if await self.click_first_visible(self.CLEAR_BUTTON_SELECTORS):
+            await self.wait_for_page_settled()
+            
+    async def is_clear_button_visible(self) -> bool:
+        """Sprawdza czy przycisk Wyczyść jest widoczny"""
+        return await self.is_any_visible(self.CLEAR_BUTTON_VISIBLE_SELECTORS)
+        
+    async def get_current_sort_value(self) -> str:
+        """Pobiera aktualną wartość sortowania"""
+        selector = await self.resolve_selector(self.SORT_SELECT_SELECTORS)
+        if selector:
+            return await self.page.input_value(selector, timeout=timeout_ms()) or ""
+        return ""
+        
+    async def get_movies(self) -> List[MovieCard]:
+        """Pobiera wszystkie filmy z listy (href, tytuł, rok, plakat) jednym wywołaniem"""
+        return await self.extract_cards(self.MOVIE_COUNT_SELECTORS)
+        
+    async def get_movies_count(self) -> int:
+        """Zwraca liczbę filmów na stronie"""
+        return await self.count_matching(self.MOVIE_COUNT_SELECTORS)
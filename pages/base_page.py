@@ -1,33 +1,89 @@
-from playwright.sync_api import Page, expect
-from typing import Optional
+from playwright.sync_api import Page, expect, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from typing import Any, Dict, List, Optional, Sequence
 import time
+import weakref
+
+from utils.deadline import navigation_timeout_ms, timeout_ms
+from utils.helpers import page_type_for_url
+from utils.perf_metrics import get_perf_load_timeout, is_perf_capture_enabled, navigation_log
+from utils.selector_cache import SelectorCache
+from utils.step_instrumentation import record_selectors
+from utils.step_timing import instrument_public_methods
+from .records import MovieCard
+from .scripts import (
+    ANY_VISIBLE,
+    COLLECT_PERF_METRICS,
+    COUNT_FIRST_MATCH,
+    EXTRACT_CARDS,
+    INSTALL_PERF_OBSERVER,
+    INSTALL_WAIT_TRACKER,
+    PAGE_SETTLED,
+    SELECTOR_UNSUPPORTED,
+    SELECTOR_VISIBLE,
+    VISIBILITY_STATUSES,
+    VISIBLE_HREFS,
+)
+
+# Strony, które mają już zainstalowany init script śledzący aktywność
+_TRACKED_PAGES: "weakref.WeakSet[Page]" = weakref.WeakSet()
 
 
 class BasePage:
     """Bazowa klasa dla wszystkich stron - zawiera wspólne metody"""
     
+    # Wspólny cache zwycięskich selektorów (plik: SELECTOR_CACHE_FILE)
+    selector_cache = SelectorCache.from_env()
+    
+    # Ile ms bez zmian DOM i bez fetch/XHR oznacza "strona się uspokoiła"
+    QUIET_MS = 500
+    # Górny limit czekania na uspokojenie (strony z reklamami mogą nie
+    # uspokoić się nigdy) - nie dłużej niż dawne stałe sleepy (2 s)
+    SETTLE_TIMEOUT = 2000
+    
+    # Przyciski akceptacji zgody na cookies (CMP) spotykane na stronie
+    COOKIE_CONSENT_SELECTORS = (
+        "#onetrust-accept-btn-handler",
+        "#didomi-notice-agree-button",
+        ".fc-cta-consent",
+        "button:has-text('Akceptuję')",
+        "button:has-text('Zgadzam się')",
+        "button:has-text('Akceptuj')",
+        "button:has-text('Accept')"
+    )
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        # Publiczne metody stron są krokami testu - mierzymy ich czas
+        super().__init_subclass__(**kwargs)
+        instrument_public_methods(cls)
+        
     def __init__(self, page: Page):
         self.page = page
+        self._install_wait_tracker()
         
     def navigate_to(self, url: str) -> None:
         """Nawiguje do podanego URL"""
-        self.page.goto(url)
+        self.page.goto(url, timeout=navigation_timeout_ms())
+        self.record_navigation_metrics()
+        
+    def accept_cookie_consent(self) -> bool:
+        """Akceptuje zgodę na cookies, jeśli baner jest widoczny"""
+        return self.click_first_visible(self.COOKIE_CONSENT_SELECTORS) is not None
         
     def wait_for_element(self, selector: str, timeout: int = 10000) -> None:
         """Czeka na pojawienie się elementu"""
-        self.page.wait_for_selector(selector, timeout=timeout)
+        self.page.wait_for_selector(selector, timeout=timeout_ms(timeout))
         
     def click_element(self, selector: str) -> None:
         """Klika w element"""
-        self.page.click(selector)
+        self.page.click(selector, timeout=timeout_ms())
         
     def type_text(self, selector: str, text: str) -> None:
         """Wpisuje tekst w pole"""
-        self.page.fill(selector, text)
+        self.page.fill(selector, text, timeout=timeout_ms())
         
     def get_text(self, selector: str) -> str:
         """Pobiera tekst z elementu"""
-        return self.page.text_content(selector) or ""
+        return self.page.text_content(selector, timeout=timeout_ms()) or ""
         
     def is_element_visible(self, selector: str) -> bool:
         """Sprawdza czy element jest widoczny"""
@@ -41,18 +97,172 @@ class BasePage:
         return self.page.url
         
     def wait_for_url_change(self, timeout: int = 10000) -> str:
-        """Czeka na zmianę URL i zwraca nowy URL"""
+        """Czeka na zmianę URL (commit nawigacji) i zwraca nowy URL"""
         current_url = self.get_current_url()
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout/1000:
-            new_url = self.get_current_url()
-            if new_url != current_url:
-                return new_url
-            time.sleep(0.1)
+        try:
+            self.page.wait_for_url(lambda url: url != current_url, timeout=timeout_ms(timeout), wait_until="commit")
+        except PlaywrightTimeoutError:
+            return self.get_current_url()
             
+        self.record_navigation_metrics(wait_for_load=True)
         return self.get_current_url()
         
+    def record_navigation_metrics(self, wait_for_load: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Zapisuje metryki wydajności bieżącego dokumentu (Navigation Timing,
+        TTFB, DCL, load, LCP, CLS, transfer, liczba żądań). Po nawigacji
+        wywołanej kliknięciem najpierw czeka na load, ale najwyżej
+        PERF_LOAD_TIMEOUT ms - wolna strona dostaje wtedy load_ms = null.
+        """
+        if not is_perf_capture_enabled():
+            return None
+        if wait_for_load:
+            try:
+                self.page.wait_for_load_state("load", timeout=timeout_ms(get_perf_load_timeout()))
+            except PlaywrightTimeoutError:
+                pass
+        try:
+            metrics = self.page.evaluate(COLLECT_PERF_METRICS)
+        except PlaywrightError:
+            # Dokument podmieniony w trakcie odczytu - pomijamy tę nawigację
+            return None
+        metrics["page_type"] = page_type_for_url(metrics["url"])
+        navigation_log.record(self.page, metrics)
+        return metrics
+        
     def get_attribute(self, selector: str, attribute: str) -> Optional[str]:
         """Pobiera wartość atrybutu elementu"""
-        return self.page.get_attribute(selector, attribute)
\ No newline at end of file
+        return self.page.get_attribute(selector, attribute, timeout=timeout_ms())
+        
+    def get_first_visible_href(self, selectors: Sequence[str]) -> str:
+        """Pobiera href pierwszego widocznego linku z łańcucha, pomijając linki bez href"""
+        try:
+            hrefs = self.page.evaluate(VISIBLE_HREFS, list(selectors))
+        except Exception:
+            hrefs = [None] * len(selectors)
+        for selector, href in zip(selectors, hrefs):
+            if href is None and self.is_element_visible(selector):
+                href = self.get_attribute(selector, 'href')
+            if href:
+                return href
+        return ""
+        
+    def resolve_selector(self, selectors: Sequence[str]) -> Optional[str]:
+        """
+        Zwraca pierwszy widoczny selektor z łańcucha fallbacków.
+        
+        Cały łańcuch sprawdzany jest jednym wywołaniem evaluate, a zwycięski
+        selektor zapamiętywany per typ strony - przy kolejnym wywołaniu
+        sprawdzany jest tylko on, dopóki nadal pasuje.
+        """
+        key = self.selector_cache.make_key(page_type_for_url(self.page.url), selectors)
+        cached = self.selector_cache.get(key)
+        if cached is not None and cached in selectors:
+            if self._first_visible([cached]) == cached:
+                return cached
+            self.selector_cache.invalidate(key)
+            
+        selector = self._first_visible(selectors)
+        if selector is not None:
+            self.selector_cache.set(key, selector)
+        return selector
+        
+    def is_any_visible(self, selectors: Sequence[str]) -> bool:
+        """Sprawdza czy którykolwiek z selektorów jest widoczny"""
+        return self.resolve_selector(selectors) is not None
+        
+    def click_first_visible(self, selectors: Sequence[str]) -> Optional[str]:
+        """Klika w pierwszy widoczny element z łańcucha i zwraca użyty selektor"""
+        selector = self.resolve_selector(selectors)
+        if selector is not None:
+            self.click_element(selector)
+        return selector
+        
+    def extract_cards(self, selectors: Sequence[str]) -> List[MovieCard]:
+        """
+        Dane wszystkich kart (href, tytuł, rok, plakat) dla pierwszego
+        selektora, który cokolwiek wskazuje - jednym evaluate, niezależnie
+        od liczby kart na stronie
+        """
+        try:
+            rows = self.page.evaluate(EXTRACT_CARDS, list(selectors))
+        except PlaywrightError:
+            # Dokument podmieniony w trakcie odczytu
+            return []
+        return [MovieCard.from_script(row) for row in rows]
+        
+    def count_matching(self, selectors: Sequence[str]) -> int:
+        """Liczba elementów pierwszego selektora, który cokolwiek wskazuje (jedno evaluate)"""
+        try:
+            return self.page.evaluate(COUNT_FIRST_MATCH, list(selectors))
+        except PlaywrightError:
+            return 0
+            
+    def _visibility_statuses(self, selectors: Sequence[str]) -> List[int]:
+        """Statusy widoczności wszystkich selektorów z jednego evaluate"""
+        try:
+            return self.page.evaluate(VISIBILITY_STATUSES, list(selectors))
+        except Exception:
+            # Np. kontekst zniszczony przez nawigację - sprawdzamy po kolei
+            return [SELECTOR_UNSUPPORTED] * len(selectors)
+            
+    def _first_visible(self, selectors: Sequence[str]) -> Optional[str]:
+        """
+        Selektory spoza CSS (np. :has-text) sprawdzane są przez Playwright,
+        ale tylko te, które stoją w łańcuchu przed pierwszym trafieniem CSS
+        """
+        statuses = self._visibility_statuses(selectors)
+        for tried, (selector, status) in enumerate(zip(selectors, statuses), start=1):
+            if status == SELECTOR_VISIBLE or (
+                    status == SELECTOR_UNSUPPORTED and self.is_element_visible(selector)):
+                record_selectors(tried, matched=True)
+                return selector
+        record_selectors(len(selectors), matched=False)
+        return None
+        
+    def wait_for_page_settled(self, selectors: Sequence[str] = (), quiet_ms: Optional[int] = None,
+                              timeout: Optional[int] = None) -> bool:
+        """
+        Czeka aż któryś z selektorów zacznie pasować albo strona się uspokoi:
+        dokument załadowany, brak trwających fetch/XHR i brak zmian DOM
+        przez quiet_ms. Zwraca False po przekroczeniu timeoutu.
+        """
+        quiet_ms = self.QUIET_MS if quiet_ms is None else quiet_ms
+        timeout = self.SETTLE_TIMEOUT if timeout is None else timeout
+        return self._wait_for_function(PAGE_SETTLED, {"selectors": list(selectors), "quietMs": quiet_ms}, timeout)
+        
+    def wait_for_any_visible(self, selectors: Sequence[str], timeout: int = 10000) -> bool:
+        """Czeka aż którykolwiek z selektorów CSS wskaże widoczny element"""
+        return self._wait_for_function(ANY_VISIBLE, list(selectors), timeout)
+        
+    def _install_wait_tracker(self) -> None:
+        """Instaluje śledzenie aktywności dla kolejnych dokumentów strony"""
+        if self.page in _TRACKED_PAGES:
+            return
+        self.page.add_init_script(
+            script=f"({INSTALL_WAIT_TRACKER.strip()})();\n({INSTALL_PERF_OBSERVER.strip()})();"
+        )
+        _TRACKED_PAGES.add(self.page)
+        
+    def _wait_for_function(self, expression: str, arg: Any, timeout: int) -> bool:
+        """
+        page.wait_for_function odporne na nawigację - jeśli dokument zostanie
+        podmieniony w trakcie czekania, predykat sprawdzany jest w nowym
+        """
+        # Limit przycięty do budżetu czasu testu
+        deadline = time.monotonic() + timeout_ms(timeout) / 1000
+        while True:
+            remaining = int((deadline - time.monotonic()) * 1000)
+            if remaining <= 0:
+                return False
+            try:
+                self.page.wait_for_function(expression, arg=arg, timeout=remaining)
+                return True
+            except PlaywrightTimeoutError:
+                return False
+            except PlaywrightError as error:
+                if "context was destroyed" not in str(error) and "navigat" not in str(error):
+                    raise
+
+
+instrument_public_methods(BasePage)
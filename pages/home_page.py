@@ -1,6 +1,9 @@
 from .base_page import BasePage
+from .records import MovieCard
 from playwright.sync_api import Page
-import time
+from typing import List, Optional
+
+from utils.helpers import get_base_url
 
 
 class HomePage(BasePage):
@@ -15,9 +18,54 @@ class HomePage(BasePage):
     LOGO = ".logo"
     MENU_FILMY = "a[href='/filmy']"
     
-    def __init__(self, page: Page):
+    # Łańcuchy fallbacków - sprawdzane przez BasePage.resolve_selector
+    SEARCH_ICON_SELECTORS = (
+        "button[title='Szukaj']",
+        ".search-icon",
+        "[data-testid='search-button']",
+        "button[aria-label*='search']",
+        "button[aria-label*='szukaj']",
+        ".fa-search",
+        "[class*='search-btn']",
+        "button:has(.fa-search)",
+        "a[href*='search']"
+    )
+    SEARCH_INPUT_SELECTORS = (
+        "input[placeholder*='Szukaj']",
+        "input[placeholder*='szukaj']",
+        "input[name='search']",
+        "input[type='search']",
+        ".search-input",
+        "#search",
+        "[data-testid='search-input']"
+    )
+    SEARCH_FIELD_SELECTORS = SEARCH_INPUT_SELECTORS + (
+        "input",  # ostateczność
+    )
+    SEARCH_SUBMIT_SELECTORS = (
+        "button[type='submit']",
+        "button:has-text('Szukaj')",
+        ".search-button",
+        "[data-testid='search-submit']"
+    )
+    RESULT_SELECTORS = (
+        ".search-results a",
+        ".movie-item a",
+        "[data-testid='movie-link']",
+        "a[href*='/film/']",
+        ".film-link",
+        ".movie-link"
+    )
+    FIRST_RESULT_SELECTORS = (
+        ".search-results a:first-child",
+        ".movie-item:first-child a",
+        "a[href*='/film/']:first-child",
+        ".film-link:first-child"
+    )
+    
+    def __init__(self, page: Page, base_url: Optional[str] = None):
         super().__init__(page)
-        self.base_url = "https://vod.film"
+        self.base_url = (base_url or get_base_url()).rstrip('/')
         
     def open_homepage(self) -> None:
         """Otwiera stronę główną"""
@@ -25,120 +73,48 @@ class HomePage(BasePage):
         
     def click_search_icon(self) -> None:
         """Klika w ikonę wyszukiwania (lupkę)"""
-        # Próba różnych selektorów dla ikony wyszukiwania
-        possible_selectors = [
-            "button[title='Szukaj']",
-            ".search-icon",
-            "[data-testid='search-button']",
-            "button[aria-label*='search']",
-            "button[aria-label*='szukaj']",
-            ".fa-search",
-            "[class*='search-btn']",
-            "button:has(.fa-search)",
-            "a[href*='search']"
-        ]
-        
-        for selector in possible_selectors:
-            if self.is_element_visible(selector):
-                self.click_element(selector)
-                return
+        if self.click_first_visible(self.SEARCH_ICON_SELECTORS):
+            return
                 
         # Jeśli nie znajdzie ikony, spróbuje bezpośrednio pola wyszukiwania
         self.click_search_input()
         
     def click_search_input(self) -> None:
         """Klika w pole wyszukiwania"""
-        possible_selectors = [
-            "input[placeholder*='Szukaj']",
-            "input[placeholder*='szukaj']",
-            "input[name='search']",
-            "input[type='search']",
-            ".search-input",
-            "#search",
-            "[data-testid='search-input']"
-        ]
-        
-        for selector in possible_selectors:
-            if self.is_element_visible(selector):
-                self.click_element(selector)
-                return
+        self.click_first_visible(self.SEARCH_INPUT_SELECTORS)
                 
     def search_for_movie(self, query: str) -> None:
         """Wyszukuje film po frazie"""
         # Znajdź pole wyszukiwania
-        search_selectors = [
-            "input[placeholder*='Szukaj']",
-            "input[placeholder*='szukaj']", 
-            "input[name='search']",
-            "input[type='search']",
-            ".search-input",
-            "#search",
-            "[data-testid='search-input']",
-            "input"  # ostateczność
-        ]
-        
-        for selector in search_selectors:
-            if self.is_element_visible(selector):
-                self.type_text(selector, query)
-                break
+        search_selector = self.resolve_selector(self.SEARCH_FIELD_SELECTORS)
+        if search_selector:
+            self.type_text(search_selector, query)
                 
-        # Poczekaj chwilę na live search
-        time.sleep(1)
+        # Poczekaj na live search (maks. 1 s, jak wcześniej stały sleep)
+        self.wait_for_page_settled(quiet_ms=300, timeout=1000)
         
         # Spróbuj różnych sposobów zatwierdzenia wyszukiwania
-        submit_selectors = [
-            "button[type='submit']",
-            "button:has-text('Szukaj')",
-            ".search-button",
-            "[data-testid='search-submit']"
-        ]
-        
-        for selector in submit_selectors:
-            if self.is_element_visible(selector):
-                self.click_element(selector)
-                return
+        if self.click_first_visible(self.SEARCH_SUBMIT_SELECTORS):
+            return
                 
         # Jeśli nie ma przycisku, naciśnij Enter
-        for selector in search_selectors:
-            if self.is_element_visible(selector):
-                self.page.keyboard.press("Enter")
-                return
+        if self.is_any_visible(self.SEARCH_FIELD_SELECTORS):
+            self.page.keyboard.press("Enter")
                 
-    def get_search_results(self) -> list:
-        """Pobiera wyniki wyszukiwania"""
-        # Czekaj na wyniki
-        time.sleep(2)
-        
-        result_selectors = [
-            ".search-results a",
-            ".movie-item a",
-            "[data-testid='movie-link']",
-            "a[href*='/film/']",
-            ".film-link",
-            ".movie-link"
-        ]
-        
-        for selector in result_selectors:
-            elements = self.page.query_selector_all(selector)
-            if elements:
-                return [elem.get_attribute('href') for elem in elements]
-                
-        return []
+    def get_search_results(self) -> List[MovieCard]:
+        """Pobiera wyniki wyszukiwania (href, tytuł, rok, plakat) jednym wywołaniem"""
+        # Czekaj na render wyników (a gdy ich brak - aż wyszukiwanie się zakończy)
+        self.wait_for_page_settled(self.RESULT_SELECTORS)
+        return self.extract_cards(self.RESULT_SELECTORS)
         
     def click_first_movie_result(self) -> str:
         """Klika w pierwszy wynik wyszukiwania i zwraca URL"""
-        movie_selectors = [
-            ".search-results a:first-child",
-            ".movie-item:first-child a",
-            "a[href*='/film/']:first-child",
-            ".film-link:first-child"
-        ]
-        
-        for selector in movie_selectors:
-            if self.is_element_visible(selector):
-                href = self.get_attribute(selector, 'href')
-                self.click_element(selector)
-                return href or ""
+        selector = self.resolve_selector(self.FIRST_RESULT_SELECTORS)
+        if selector:
+            href = self.get_attribute(selector, 'href')
+            self.click_element(selector)
+            self.wait_for_url_change()
+            return href or ""
                 
         return ""
         
@@ -146,5 +122,6 @@ class HomePage(BasePage):
         """Przechodzi do strony Filmy"""
         if self.is_element_visible(self.MENU_FILMY):
             self.click_element(self.MENU_FILMY)
+            self.wait_for_url_change()
         else:
             self.navigate_to(f"{self.base_url}/filmy")
\ No newline at end of file
@@ -1,6 +1,10 @@
 from .base_page import BasePage
-from playwright.sync_api import Page
-import time
+from .scripts import ARM_POPUP_OBSERVER, AWAIT_POPUP
+from playwright.sync_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from typing import Optional
+
+from utils.deadline import timeout_ms
+from utils.popup_timing import PopupTiming, popup_log
 
 
 class MoviePage(BasePage):
@@ -14,9 +18,84 @@ class MoviePage(BasePage):
     POPUP_LINK = ".modal a, .popup a, [role='dialog'] a"
     CLOSE_BUTTON = "button[aria-label*='close'], .close, .modal-close"
     
+    # Łańcuchy fallbacków - sprawdzane przez BasePage.resolve_selector
+    PLAYER_SELECTORS = (
+        "video",
+        "iframe[src*='player']",
+        ".video-player",
+        "[class*='player']",
+        "[id*='player']",
+        "iframe[src*='youtube']",
+        "iframe[src*='vimeo']",
+        ".embed-container"
+    )
+    PLAY_BUTTON_SELECTORS = (
+        "button[aria-label*='play']",
+        "button[title*='play']",
+        ".play-button",
+        "button:has-text('Play')",
+        "[class*='play-btn']",
+        ".vjs-play-control",  # Video.js
+        "button[data-testid='play-button']"
+    )
+    PLAYER_CLICK_SELECTORS = ("video", ".video-player", "[class*='player']")
+    POPUP_WAIT_SELECTORS = (
+        ".modal",
+        ".popup",
+        "[role='dialog']",
+        ".overlay",
+        ".ad-overlay",
+        ".advertisement",
+        "[class*='modal']",
+        "[class*='popup']",
+        "[id*='modal']",
+        "[id*='popup']"
+    )
+    POPUP_SELECTORS = (
+        ".modal",
+        ".popup",
+        "[role='dialog']",
+        ".overlay",
+        ".ad-overlay",
+        "[class*='modal']",
+        "[class*='popup']"
+    )
+    POPUP_REDIRECT_LINK_SELECTORS = (
+        ".modal a",
+        ".popup a",
+        "[role='dialog'] a",
+        ".overlay a",
+        ".ad-overlay a",
+        ".advertisement a",
+        "[class*='modal'] a",
+        "[class*='popup'] a"
+    )
+    POPUP_LINK_SELECTORS = (
+        ".modal a",
+        ".popup a",
+        "[role='dialog'] a",
+        ".overlay a",
+        ".ad-overlay a"
+    )
+    CLOSE_SELECTORS = (
+        "button[aria-label*='close']",
+        ".close",
+        ".modal-close",
+        ".popup-close",
+        "[data-dismiss='modal']"
+    )
+    
     def __init__(self, page: Page):
         super().__init__(page)
         
+    def wait_for_movie_page(self, timeout: int = 10000) -> bool:
+        """Czeka na załadowanie strony filmu (DOM i nagłówek H1)"""
+        try:
+            self.page.wait_for_load_state("domcontentloaded", timeout=timeout_ms(timeout))
+        except PlaywrightTimeoutError:
+            return False
+        return self.wait_for_any_visible([self.MOVIE_TITLE_H1], timeout=timeout)
+        
     def get_movie_title(self) -> str:
         """Pobiera tytuł filmu z H1"""
         if self.is_element_visible(self.MOVIE_TITLE_H1):
@@ -25,150 +104,73 @@ class MoviePage(BasePage):
         
     def is_video_player_visible(self) -> bool:
         """Sprawdza czy odtwarzacz wideo jest widoczny"""
-        player_selectors = [
-            "video",
-            "iframe[src*='player']", 
-            ".video-player",
-            "[class*='player']",
-            "[id*='player']",
-            "iframe[src*='youtube']",
-            "iframe[src*='vimeo']",
-            ".embed-container"
-        ]
-        
-        for selector in player_selectors:
-            if self.is_element_visible(selector):
-                return True
-        return False
+        return self.is_any_visible(self.PLAYER_SELECTORS)
         
     def play_video(self) -> None:
-        """Uruchamia odtwarzanie wideo"""
-        play_selectors = [
-            "button[aria-label*='play']",
-            "button[title*='play']", 
-            ".play-button",
-            "button:has-text('Play')",
-            "[class*='play-btn']",
-            ".vjs-play-control",  # Video.js
-            "button[data-testid='play-button']"
-        ]
-        
-        for selector in play_selectors:
-            if self.is_element_visible(selector):
-                self.click_element(selector)
-                return
+        """Uruchamia odtwarzanie wideo (i mierzy czas od kliknięcia do popupa)"""
+        # Obserwator uzbrajany przed kliknięciem - zapisze moment kliknięcia
+        self._arm_popup_observer(reset=True)
+        if self.click_first_visible(self.PLAY_BUTTON_SELECTORS):
+            return
                 
         # Jeśli nie ma przycisku play, spróbuj kliknąć w sam player
-        player_selectors = ["video", ".video-player", "[class*='player']"]
-        for selector in player_selectors:
-            if self.is_element_visible(selector):
-                self.click_element(selector)
-                return
+        self.click_first_visible(self.PLAYER_CLICK_SELECTORS)
                 
     def wait_for_popup(self, timeout: int = 60) -> bool:
         """Czeka na pojawienie się popupa (1-60 sekund)"""
-        popup_selectors = [
-            ".modal",
-            ".popup", 
-            "[role='dialog']",
-            ".overlay",
-            ".ad-overlay",
-            ".advertisement",
-            "[class*='modal']",
-            "[class*='popup']",
-            "[id*='modal']",
-            "[id*='popup']"
-        ]
-        
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            for selector in popup_selectors:
-                if self.is_element_visible(selector):
-                    return True
-            time.sleep(1)
-            
-        return False
+        return self.measure_popup(timeout) is not None
+        
+    def measure_popup(self, timeout: int = 60) -> Optional[PopupTiming]:
+        """
+        Czeka na popup i zwraca dokładny czas od kliknięcia play do jego
+        pojawienia się oraz URL przekierowania. Moment pojawienia się zapisuje
+        obserwator DOM w przeglądarce, a Python czeka jednym evaluate -
+        bez odpytywania selektorów. None, gdy popup nie pojawił się
+        w ciągu timeout sekund.
+        """
+        self._arm_popup_observer(reset=False)
+        try:
+            result = self.page.evaluate(AWAIT_POPUP, timeout_ms(timeout * 1000))
+        except PlaywrightError:
+            # Nawigacja w trakcie czekania - obserwator zginął razem z dokumentem
+            return None
+        if result is None:
+            return None
+        timing = PopupTiming.from_script(result)
+        popup_log.record(self.page, timing)
+        return timing
         
     def get_popup_redirect_url(self) -> str:
         """Pobiera URL przekierowania z popupa"""
         if not self.is_popup_visible():
             return ""
             
-        link_selectors = [
-            ".modal a",
-            ".popup a",
-            "[role='dialog'] a",
-            ".overlay a",
-            ".ad-overlay a", 
-            ".advertisement a",
-            "[class*='modal'] a",
-            "[class*='popup'] a"
-        ]
-        
-        for selector in link_selectors:
-            if self.is_element_visible(selector):
-                href = self.get_attribute(selector, 'href')
-                if href:
-                    return href
-                    
-        return ""
+        # Widoczny link bez href (np. zamknięcie) nie jest przekierowaniem
+        return self.get_first_visible_href(self.POPUP_REDIRECT_LINK_SELECTORS)
         
     def is_popup_visible(self) -> bool:
         """Sprawdza czy popup jest widoczny"""
-        popup_selectors = [
-            ".modal",
-            ".popup",
-            "[role='dialog']", 
-            ".overlay",
-            ".ad-overlay",
-            "[class*='modal']",
-            "[class*='popup']"
-        ]
-        
-        for selector in popup_selectors:
-            if self.is_element_visible(selector):
-                return True
-        return False
+        return self.is_any_visible(self.POPUP_SELECTORS)
         
     def click_popup_link(self) -> str:
         """Klika w link w popupie i zwraca URL docelowy"""
-        url_before = self.get_current_url()
-        
-        link_selectors = [
-            ".modal a",
-            ".popup a", 
-            "[role='dialog'] a",
-            ".overlay a",
-            ".ad-overlay a"
-        ]
-        
-        for selector in link_selectors:
-            if self.is_element_visible(selector):
-                # Pobierz href przed kliknięciem
-                href = self.get_attribute(selector, 'href')
-                self.click_element(selector)
-                
-                # Poczekaj na ewentualną zmianę URL
-                time.sleep(2)
-                url_after = self.get_current_url()
-                
-                # Zwróć href lub nowy URL
-                return href or url_after
+        selector = self.resolve_selector(self.POPUP_LINK_SELECTORS)
+        if selector:
+            # Pobierz href przed kliknięciem
+            href = self.get_attribute(selector, 'href')
+            self.click_element(selector)
+            
+            # Poczekaj na ewentualną zmianę URL (maks. 2 s)
+            url_after = self.wait_for_url_change(timeout=2000)
+            
+            # Zwróć href lub nowy URL
+            return href or url_after
                 
         return ""
         
     def close_popup(self) -> None:
         """Zamyka popup"""
-        close_selectors = [
-            "button[aria-label*='close']",
-            ".close",
-            ".modal-close",
-            ".popup-close",
-            "[data-dismiss='modal']"
-        ]
+        self.click_first_visible(self.CLOSE_SELECTORS)
         
-        for selector in close_selectors:
-            if self.is_element_visible(selector):
-                self.click_element(selector)
-                return
\ No newline at end of file
+    def _arm_popup_observer(self, reset: bool) -> None:
+        self.page.evaluate(ARM_POPUP_OBSERVER, {"selectors": list(self.POPUP_WAIT_SELECTORS), "reset": reset})
\ No newline at end of file
@@ -1,5 +1,10 @@
 from .base_page import BasePage
+from .records import MovieCard
 from playwright.sync_api import Page
+from typing import List, Optional
+
+from utils.deadline import timeout_ms
+from utils.helpers import get_base_url
 
 
 class MoviesPage(BasePage):
@@ -10,9 +15,38 @@ class MoviesPage(BasePage):
     CLEAR_BUTTON = "button:has-text('Wyczyść'), .clear-button, [data-action='clear']"
     MOVIE_ITEMS = ".movie-item, .film-card, [class*='movie-card']"
     
-    def __init__(self, page: Page):
+    # Łańcuchy fallbacków - sprawdzane przez BasePage.resolve_selector
+    SORT_DROPDOWN_SELECTORS = (
+        "select[name*='sort']",
+        ".sort-select",
+        "[class*='sort-dropdown']",
+        "select:has-text('Sortuj')",
+        "[id*='sort']"
+    )
+    SORT_SELECT_SELECTORS = (
+        "select[name*='sort']",
+        ".sort-select",
+        "[class*='sort-dropdown']"
+    )
+    CLEAR_BUTTON_SELECTORS = (
+        "button:has-text('Wyczyść')",
+        ".clear-button",
+        "[data-action='clear']",
+        "button[title*='wyczyść']",
+        "button[aria-label*='clear']",
+        ".reset-button"
+    )
+    CLEAR_BUTTON_VISIBLE_SELECTORS = CLEAR_BUTTON_SELECTORS[:4]
+    MOVIE_COUNT_SELECTORS = (
+        ".movie-item",
+        ".film-card",
+        "[class*='movie-card']",
+        ".movie"
+    )
+    
+    def __init__(self, page: Page, base_url: Optional[str] = None):
         super().__init__(page)
-        self.movies_url = "https://vod.film/filmy"
+        self.movies_url = f"{(base_url or get_base_url()).rstrip('/')}/filmy"
         
     def open_movies_page(self) -> None:
         """Otwiera stronę filmów"""
@@ -20,88 +54,36 @@ class MoviesPage(BasePage):
         
     def is_sort_dropdown_visible(self) -> bool:
         """Sprawdza czy lista rozwijana sortowania jest widoczna"""
-        sort_selectors = [
-            "select[name*='sort']",
-            ".sort-select",
-            "[class*='sort-dropdown']",
-            "select:has-text('Sortuj')",
-            "[id*='sort']"
-        ]
-        
-        for selector in sort_selectors:
-            if self.is_element_visible(selector):
-                return True
-        return False
+        return self.is_any_visible(self.SORT_DROPDOWN_SELECTORS)
         
     def select_sort_option(self, option_text: str) -> None:
         """Wybiera opcję sortowania"""
-        sort_selectors = [
-            "select[name*='sort']", 
-            ".sort-select",
-            "[class*='sort-dropdown']"
-        ]
-        
-        for selector in sort_selectors:
-            if self.is_element_visible(selector):
-                self.page.select_option(selector, label=option_text)
-                return
+        selector = self.resolve_selector(self.SORT_SELECT_SELECTORS)
+        if selector:
+            self.page.select_option(selector, label=option_text, timeout=timeout_ms())
+            # Sortowanie może przeładować stronę albo listę przez XHR
+            self.wait_for_page_settled()
                 
     def click_clear_button(self) -> None:
         """Klika przycisk Wyczyść"""
-        clear_selectors = [
-            "button:has-text('Wyczyść')",
-            ".clear-button",
-            "[data-action='clear']",
-            "button[title*='wyczyść']",
-            "button[aria-label*='clear']",
-            ".reset-button"
-        ]
-        
-        for selector in clear_selectors:
-            if self.is_element_visible(selector):
-                self.click_element(selector)
-                return
+        if self.click_first_visible(self.CLEAR_BUTTON_SELECTORS):
+            self.wait_for_page_settled()
                 
     def is_clear_button_visible(self) -> bool:
         """Sprawdza czy przycisk Wyczyść jest widoczny"""
-        clear_selectors = [
-            "button:has-text('Wyczyść')",
-            ".clear-button", 
-            "[data-action='clear']",
-            "button[title*='wyczyść']"
-        ]
-        
-        for selector in clear_selectors:
-            if self.is_element_visible(selector):
-                return True
-        return False
+        return self.is_any_visible(self.CLEAR_BUTTON_VISIBLE_SELECTORS)
         
     def get_current_sort_value(self) -> str:
         """Pobiera aktualną wartość sortowania"""
-        sort_selectors = [
-            "select[name*='sort']",
-            ".sort-select", 
-            "[class*='sort-dropdown']"
-        ]
-        
-        for selector in sort_selectors:
-            if self.is_element_visible(selector):
-                element = self.page.query_selector(selector)
-                if element:
-                    return element.input_value() or ""
+        selector = self.resolve_selector(self.SORT_SELECT_SELECTORS)
+        if selector:
+            return self.page.input_value(selector, timeout=timeout_ms()) or ""
         return ""
         
+    def get_movies(self) -> List[MovieCard]:
+        """Pobiera wszystkie filmy z listy (href, tytuł, rok, plakat) jednym wywołaniem"""
+        return self.extract_cards(self.MOVIE_COUNT_SELECTORS)
+        
     def get_movies_count(self) -> int:
         """Zwraca liczbę filmów na stronie"""
-        movie_selectors = [
-            ".movie-item",
-            ".film-card", 
-            "[class*='movie-card']",
-            ".movie"
-        ]
-        
-        for selector in movie_selectors:
-            elements = self.page.query_selector_all(selector)
-            if elements:
-                return len(elements)
-        return 0
\ No newline at end of file
+        return self.count_matching(self.MOVIE_COUNT_SELECTORS)
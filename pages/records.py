@@ -0,0 +1,31 @@
+"""Zwarte rekordy danych wyciąganych ze stron przez page objecty"""
+from typing import Any, Dict, Optional, Sequence
+
+
+class MovieCard:
+    """Karta filmu z wyników wyszukiwania albo listy filmów"""
+
+    __slots__ = ("href", "title", "year", "poster")
+
+    def __init__(self, href: Optional[str], title: Optional[str] = None, year: Optional[int] = None,
+                 poster: Optional[str] = None):
+        self.href = href
+        self.title = title
+        self.year = year
+        self.poster = poster
+
+    @classmethod
+    def from_script(cls, row: Sequence[Any]) -> "MovieCard":
+        """Krotka [href, tytuł, rok, plakat] zwracana przez EXTRACT_CARDS"""
+        return cls(*row)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MovieCard):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"MovieCard(href={self.href!r}, title={self.title!r}, year={self.year!r})"
@@ -0,0 +1,327 @@
+"""Skrypty JavaScript wykonywane w przeglądarce przez page objecty"""
+
+# Status selektora zwracany przez VISIBILITY_STATUSES dla selektorów,
+# których nie da się obsłużyć przez document.querySelector (np. :has-text)
+SELECTOR_UNSUPPORTED = -1
+SELECTOR_HIDDEN = 0
+SELECTOR_VISIBLE = 1
+
+# Widoczność elementu liczona tak jak w Playwright: niezerowy rozmiar
+# i brak visibility: hidden
+IS_VISIBLE = """
+(element) => {
+    const style = window.getComputedStyle(element);
+    if (style.visibility === 'hidden' || style.visibility === 'collapse') {
+        return false;
+    }
+    const rect = element.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+"""
+
+# Sprawdza całą listę selektorów w jednym wywołaniu evaluate.
+# Jak w Playwright liczy się pierwszy pasujący element.
+VISIBILITY_STATUSES = """
+(selectors) => {
+    const isVisible = %s;
+    return selectors.map((selector) => {
+        let element;
+        try {
+            element = document.querySelector(selector);
+        } catch (error) {
+            return -1;
+        }
+        return element && isVisible(element) ? 1 : 0;
+    });
+}
+""" % IS_VISIBLE.strip()
+
+# href pierwszego pasującego elementu każdego selektora: pusty napis, gdy
+# element jest niewidoczny albo nie ma href, null dla selektorów spoza CSS
+VISIBLE_HREFS = """
+(selectors) => {
+    const isVisible = %s;
+    return selectors.map((selector) => {
+        let element;
+        try {
+            element = document.querySelector(selector);
+        } catch (error) {
+            return null;
+        }
+        return element && isVisible(element) ? element.getAttribute('href') || '' : '';
+    });
+}
+""" % IS_VISIBLE.strip()
+
+# Śledzenie aktywności strony na potrzeby czekania na zdarzenia:
+# liczba trwających fetch/XHR, czas ostatniej zmiany DOM, sieci lub akcji
+# użytkownika oraz to, czy dokument jest właśnie opuszczany.
+# Instalowane jako init script (od początku dokumentu) i leniwie
+# w predykatach, jeśli dokument powstał wcześniej.
+INSTALL_WAIT_TRACKER = """
+() => {
+    if (window.__vodWaits) {
+        return;
+    }
+    const state = { inflight: 0, lastActivity: performance.now(), unloading: false };
+    window.__vodWaits = state;
+    const touch = () => { state.lastActivity = performance.now(); };
+    for (const type of ['click', 'keydown', 'input', 'submit']) {
+        window.addEventListener(type, touch, true);
+    }
+    window.addEventListener('beforeunload', () => { state.unloading = true; });
+    const start = () => { state.inflight += 1; touch(); };
+    const end = () => { state.inflight = Math.max(0, state.inflight - 1); touch(); };
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function (...args) {
+            start();
+            return originalFetch.apply(this, args).finally(end);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        start();
+        this.addEventListener('loadend', end, { once: true });
+        return originalSend.apply(this, args);
+    };
+    const observe = () => new MutationObserver(touch).observe(
+        document.documentElement, { childList: true, subtree: true, characterData: true }
+    );
+    if (document.documentElement) {
+        observe();
+    } else {
+        document.addEventListener('DOMContentLoaded', observe, { once: true });
+    }
+}
+"""
+
+# Strona "uspokojona": któryś z selektorów już pasuje albo dokument jest
+# załadowany, nie ma trwających fetch/XHR i DOM nie zmienia się od quietMs.
+# Opuszczany dokument nigdy się nie liczy (np. wyniki sprzed nawigacji).
+PAGE_SETTLED = """
+({ selectors, quietMs }) => {
+    (%s)();
+    const state = window.__vodWaits;
+    if (state.unloading) {
+        return false;
+    }
+    for (const selector of selectors) {
+        try {
+            if (document.querySelector(selector)) {
+                return true;
+            }
+        } catch (error) {
+            // selektor spoza CSS - pomijamy
+        }
+    }
+    if (document.readyState !== 'complete') {
+        return false;
+    }
+    return state.inflight === 0 && performance.now() - state.lastActivity >= quietMs;
+}
+""" % INSTALL_WAIT_TRACKER.strip()
+
+# Czy którykolwiek z selektorów CSS wskazuje widoczny element
+ANY_VISIBLE = """
+(selectors) => (%s)(selectors).includes(1)
+""" % VISIBILITY_STATUSES.strip()
+
+# Zbiera LCP i CLS od początku dokumentu. Obserwatory z buffered: true
+# dostarczają też wpisy sprzed instalacji, więc skrypt działa zarówno jako
+# init script, jak i wstrzyknięty później.
+INSTALL_PERF_OBSERVER = """
+() => {
+    if (window.__vodPerf || typeof PerformanceObserver === 'undefined') {
+        return;
+    }
+    const state = { lcp: null, cls: 0 };
+    window.__vodPerf = state;
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback))
+                .observe({ type, buffered: true });
+        } catch (error) {
+            // typ wpisu nieobsługiwany przez przeglądarkę
+        }
+    };
+    observe('largest-contentful-paint', (entry) => { state.lcp = entry.startTime; });
+    observe('layout-shift', (entry) => {
+        if (!entry.hadRecentInput) {
+            state.cls += entry.value;
+        }
+    });
+}
+"""
+
+# Metryki bieżącego dokumentu: Navigation Timing (czasy w ms od startu
+# nawigacji), LCP/CLS z obserwatora oraz rozmiar i liczba żądań
+# (dokument + zasoby z Resource Timing)
+COLLECT_PERF_METRICS = """
+() => {
+    (%s)();
+    const [nav] = performance.getEntriesByType('navigation');
+    const resources = performance.getEntriesByType('resource');
+    const perf = window.__vodPerf || { lcp: null, cls: null };
+    const round = (value) => (value === null || value === undefined ? null : Math.round(value * 10) / 10);
+    const transfer = resources.reduce((sum, entry) => sum + (entry.transferSize || 0), nav ? nav.transferSize || 0 : 0);
+    return {
+        url: location.href,
+        ttfb_ms: nav ? round(nav.responseStart - nav.startTime) : null,
+        dom_content_loaded_ms: nav && nav.domContentLoadedEventEnd ? round(nav.domContentLoadedEventEnd) : null,
+        load_ms: nav && nav.loadEventEnd ? round(nav.loadEventEnd) : null,
+        lcp_ms: round(perf.lcp),
+        cls: perf.cls === null ? null : Math.round(perf.cls * 1000) / 1000,
+        transfer_kb: round(transfer / 1024),
+        requests: resources.length + (nav ? 1 : 0),
+    };
+}
+""" % INSTALL_PERF_OBSERVER.strip()
+
+# Obserwator popupa: MutationObserver sprawdza selektory przy każdej zmianie
+# DOM (wstawienie elementu, zmiana class/style) i zapisuje dokładny moment
+# (performance.now), w którym popup stał się widoczny. Czas kliknięcia
+# zapisuje nasłuch pointerdown/click w fazie capture (event.timeStamp
+# w tej samej skali). Zadanie "safety net" co 250 ms łapie zmiany widoczności
+# bez mutacji DOM (np. doładowany obrazek). reset: true uzbraja obserwator
+# od nowa (przed kliknięciem play), bez niego istniejący zostaje.
+ARM_POPUP_OBSERVER = """
+({ selectors, reset }) => {
+    const previous = window.__vodPopup;
+    if (previous && !reset) {
+        return;
+    }
+    if (previous) {
+        previous.stop();
+    }
+    const isVisible = %s;
+    const state = {
+        armedAt: performance.now(), clickedAt: null, seenAt: null,
+        selector: null, href: null, alreadyVisible: false,
+    };
+    let resolve;
+    state.done = new Promise((callback) => { resolve = callback; });
+    const onClick = (event) => {
+        if (state.clickedAt === null) {
+            state.clickedAt = event.timeStamp;
+        }
+    };
+    const check = () => {
+        if (state.seenAt !== null) {
+            return;
+        }
+        // Pierwszy widoczny element (ukryty szablon popupa może stać wcześniej
+        // w DOM) - z niego bierzemy też link przekierowania
+        let selector = null;
+        let element;
+        for (const candidate of selectors) {
+            try {
+                element = Array.from(document.querySelectorAll(candidate)).find(isVisible);
+            } catch (error) {
+                continue;
+            }
+            if (element) {
+                selector = candidate;
+                break;
+            }
+        }
+        if (selector === null) {
+            return;
+        }
+        state.seenAt = performance.now();
+        state.selector = selector;
+        const link = element.matches('a[href]') ? element : element.querySelector('a[href]');
+        state.href = link ? link.href : null;
+        state.stop();
+        resolve();
+    };
+    const observer = new MutationObserver(check);
+    const interval = setInterval(check, 250);
+    state.stop = () => {
+        observer.disconnect();
+        clearInterval(interval);
+        document.removeEventListener('pointerdown', onClick, true);
+        document.removeEventListener('click', onClick, true);
+    };
+    document.addEventListener('pointerdown', onClick, true);
+    document.addEventListener('click', onClick, true);
+    observer.observe(document.documentElement, { childList: true, subtree: true, attributes: true });
+    window.__vodPopup = state;
+    check();
+    state.alreadyVisible = state.seenAt !== null;
+}
+""" % IS_VISIBLE.strip()
+
+# Czeka (jednym evaluate, bez odpytywania z Pythona) aż obserwator zgłosi
+# popup albo minie timeout ms. Zwraca null po timeoucie.
+AWAIT_POPUP = """
+(timeout) => {
+    const state = window.__vodPopup;
+    if (!state) {
+        return null;
+    }
+    const result = () => ({
+        armed_at: state.armedAt, clicked_at: state.clickedAt, seen_at: state.seenAt,
+        selector: state.selector, href: state.href, already_visible: state.alreadyVisible,
+    });
+    const timer = new Promise((callback) => setTimeout(() => callback(null), timeout));
+    return Promise.race([state.done.then(result), timer]);
+}
+"""
+
+# Wyciąga dane wszystkich kart (wyników wyszukiwania, filmów z listy)
+# jednym wywołaniem: bierze pierwszy selektor, który coś wskazuje, i dla
+# każdego elementu zwraca zwartą krotkę [href, tytuł, rok, plakat].
+# Element może być samym linkiem albo kartą z linkiem w środku.
+EXTRACT_CARDS = """
+(selectors) => {
+    const yearPattern = /\\b(19|20)\\d{2}\\b/;
+    const text = (element) => (element ? element.textContent.trim() : '');
+    const card = (element) => {
+        const link = element.matches('a[href]') ? element : element.querySelector('a[href]');
+        const image = element.querySelector('img');
+        const titleElement = element.querySelector('.title, h2, h3, [class*="title"]');
+        let title = text(titleElement)
+            || (link && link.getAttribute('title'))
+            || (image && image.getAttribute('alt'))
+            || text(link || element).replace(/\\s*\\((19|20)\\d{2}\\)\\s*$/, '');
+        const yearSource = text(element.querySelector('.year, [class*="year"]')) || text(element);
+        const year = yearSource.match(yearPattern);
+        return [
+            link ? link.getAttribute('href') : null,
+            title || null,
+            year ? Number(year[0]) : null,
+            image ? image.getAttribute('src') || image.getAttribute('data-src') : null,
+        ];
+    };
+    for (const selector of selectors) {
+        let elements;
+        try {
+            elements = document.querySelectorAll(selector);
+        } catch (error) {
+            continue;
+        }
+        if (elements.length) {
+            return Array.from(elements, card);
+        }
+    }
+    return [];
+}
+"""
+
+# Liczba elementów pierwszego selektora, który cokolwiek wskazuje
+COUNT_FIRST_MATCH = """
+(selectors) => {
+    for (const selector of selectors) {
+        try {
+            const count = document.querySelectorAll(selector).length;
+            if (count) {
+                return count;
+            }
+        } catch (error) {
+            // selektor spoza CSS
+        }
+    }
+    return 0;
+}
+"""
@@ -0,0 +1,46 @@
+from utils.api_benchmark import SearchBenchmark
+from utils.helpers import percentile
+from utils.search_corpus import CorpusQuery
+from utils.stub_server import StubConfig, StubServer
+
+
+class TestSearchBenchmark:
+    """Testy benchmarku /api/search"""
+
+    def test_percentile_nearest_rank(self):
+        """Percentyle liczone metodą najbliższej rangi"""
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([7.0], 90) == 7.0
+        assert percentile([], 50) == 0.0
+
+    def test_reports_latency_and_errors_per_query_class(self):
+        """Raport rozdziela klasy zapytań i liczy błędy"""
+        queries = [CorpusQuery("the pickup", "positive"), CorpusQuery("abcxyz123", "negative")]
+        with StubServer(config=StubConfig(latency_ms=20)) as server:
+            benchmark = SearchBenchmark(server.url, queries, concurrency=4, rate=200)
+            report = benchmark.run(20)
+            server.config.update({"fail_paths": ["/api/search"]})
+            failing = benchmark.run(4)
+
+        assert report["overall"]["requests"] == 20
+        assert set(report["classes"]) == {"negative", "positive"}
+        assert report["classes"]["positive"]["requests"] == 10
+        assert report["overall"]["error_rate"] == 0.0
+        assert report["overall"]["latency_ms"]["p50"] >= 20
+        assert failing["overall"]["error_rate"] == 1.0
+        assert failing["overall"]["status_codes"] == {"503": 4}
+
+    def test_latency_counts_from_schedule_when_sends_fall_behind(self):
+        """Zapytania czekające na miejsce w locie liczą czas od planowanego startu"""
+        with StubServer(config=StubConfig(latency_ms=100)) as server:
+            benchmark = SearchBenchmark(server.url, [CorpusQuery("the pickup", "positive")], concurrency=1, rate=50)
+            report = benchmark.run(5)
+
+        latency = report["overall"]["latency_ms"]
+        send_lag = report["overall"]["send_lag_ms"]
+        # Piąte zapytanie planowane po 80 ms wychodzi dopiero po ~400 ms
+        assert send_lag["max"] >= 250
+        assert latency["max"] >= send_lag["max"] + 100
@@ -0,0 +1,54 @@
+import json
+import socket
+import time
+
+from utils.api_discovery import ApiDiscovery
+from utils.http_session import PooledSession, RetryPolicy
+from utils.stub_server import StubServer
+
+
+class TestApiDiscovery:
+    """Testy wyszukiwania endpointu API"""
+
+    def test_ignores_html_and_missing_endpoints(self):
+        """Wygrywa endpoint JSON, a nie strona HTML /search ani 404"""
+        with StubServer() as server:
+            discovery = ApiDiscovery(server.url, ["/search", "/api/v1/search", "/api/search"],
+                                     cache_path=None)
+            endpoint = discovery.discover()
+
+        assert endpoint is not None
+        assert endpoint.path == "/api/search"
+        assert endpoint.status_code == 200
+
+    def test_cached_endpoint_skips_discovery(self, tmp_path):
+        """Zapamiętany endpoint jest używany do wygaśnięcia TTL"""
+        cache_path = str(tmp_path / "api_endpoint.json")
+        with StubServer() as server:
+            first = ApiDiscovery(server.url, cache_path=cache_path, ttl=60).find()
+            base_url = server.url
+
+        # Serwer już nie działa - wynik musi pochodzić z pliku
+        cached = ApiDiscovery(base_url, cache_path=cache_path, ttl=60).find()
+        expired = ApiDiscovery(base_url, cache_path=cache_path, ttl=0, timeout=1).find()
+
+        assert cached is not None and cached.url == first.url
+        with open(cache_path, encoding="utf-8") as handle:
+            assert json.load(handle)[base_url]["latency_ms"] == first.latency_ms
+        assert expired is None
+
+    def test_hung_host_costs_one_timeout_without_retries(self):
+        """Kandydaci, którzy nie odpowiadają, kosztują jeden timeout - sesja discovery nie ponawia"""
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen(16)
+            base_url = f"http://127.0.0.1:{listener.getsockname()[1]}"
+            with PooledSession(RetryPolicy(retries=0)) as session:
+                discovery = ApiDiscovery(base_url, ["/api/search", "/search"], cache_path=None,
+                                         timeout=0.3, session=session)
+                started = time.perf_counter()
+                endpoint = discovery.discover()
+                elapsed = time.perf_counter() - started
+
+        assert endpoint is None
+        assert elapsed < 1.5
@@ -1,40 +1,27 @@
 import pytest
 import requests
-import json
-from typing import Dict, Any
+from typing import Optional
+
+from utils.api_discovery import ApiEndpoint
+from utils.paginated_validation import PaginatedSearchValidator
+from utils.search_validation import check_search_response, extract_movies, movie_title
 
 
 class TestAPISearch:
     """Testy API wyszukiwarki filmów"""
     
-    # Możliwe endpointy API do przetestowania
-    POSSIBLE_API_ENDPOINTS = [
-        "/api/search",
-        "/search/api",
-        "/api/movies/search", 
-        "/api/films/search",
-        "/search",
-        "/api/v1/search",
-        "/wp-json/wp/v2/search"  # WordPress API
-    ]
-    
-    def get_api_endpoint(self, base_url: str) -> str:
+    def get_api_endpoint(self, api_endpoint: Optional[ApiEndpoint], base_url: str) -> str:
         """
-        Próbuje znaleźć działający endpoint API
+        Zwraca endpoint znaleziony przez fixture api_endpoint
         W rzeczywistym scenariuszu byłby zidentyfikowany przez DevTools
         """
-        for endpoint in self.POSSIBLE_API_ENDPOINTS:
-            try:
-                url = f"{base_url}{endpoint}"
-                response = requests.get(url, params={"q": "test"}, timeout=5)
-                if response.status_code in [200, 400]:  # 400 może oznaczać że endpoint istnieje ale brakuje parametrów
-                    return url
-            except:
-                continue
+        if api_endpoint is not None:
+            return api_endpoint.url
         return f"{base_url}/api/search"  # Fallback
     
     @pytest.mark.api
-    def test_search_api_the_pickup(self, base_url: str):
+    def test_search_api_the_pickup(self, base_url: str, api_endpoint: Optional[ApiEndpoint],
+                                   http_session: requests.Session):
         """
         Test API wyszukiwania filmu 'the pickup'
         
@@ -43,7 +30,7 @@ class TestAPISearch:
         """
         
         # Endpoint zidentyfikowany przez DevTools (symulacja)
-        api_endpoint = self.get_api_endpoint(base_url)
+        api_url = self.get_api_endpoint(api_endpoint, base_url)
         
         # Parametry wyszukiwania
         search_params = {
@@ -63,8 +50,8 @@ class TestAPISearch:
         # Próba różnych kombinacji parametrów
         for param_name, search_term in search_params.items():
             try:
-                response = requests.get(
-                    api_endpoint,
+                response = http_session.get(
+                    api_url,
                     params={param_name: search_term},
                     headers=headers,
                     timeout=10
@@ -80,7 +67,7 @@ class TestAPISearch:
         
         # Jeśli żaden endpoint nie zadziałał, sprawdź czy strona w ogóle odpowiada
         try:
-            response = requests.get(base_url, timeout=10)
+            response = http_session.get(base_url, timeout=10)
             assert response.status_code == 200, f"Strona główna nie odpowiada: {response.status_code}"
             
             # Raportuj, że nie znaleziono API endpoint
@@ -90,95 +77,48 @@ class TestAPISearch:
             pytest.fail("Strona nie jest dostępna")
     
     def _validate_api_response(self, response: requests.Response, search_term: str) -> None:
-        """Waliduje odpowiedź API"""
-        
-        # Sprawdź status code
-        assert response.status_code == 200, f"Niepoprawny status code: {response.status_code}"
+        """Waliduje odpowiedź API (status, Content-Type, JSON i dane o filmach)"""
         
-        # Sprawdź Content-Type
-        content_type = response.headers.get('content-type', '')
-        assert 'application/json' in content_type, f"Niepoprawny Content-Type: {content_type}"
+        problems = check_search_response(response, search_term)
+        assert not problems, "; ".join(problems)
         
-        try:
-            # Parsuj JSON
-            data = response.json()
-            assert isinstance(data, (dict, list)), "Odpowiedź nie jest prawidłowym JSON"
-            
-            # Sprawdź czy zawiera dane o filmach
-            self._validate_movie_data(data, search_term)
-            
-        except json.JSONDecodeError:
-            pytest.fail("Odpowiedź nie zawiera prawidłowego JSON")
+        movies = extract_movies(response.json())
+        print(f"✓ API zwróciło {len(movies)} filmów, pierwszy: '{movie_title(movies[0])}'")
     
-    def _validate_movie_data(self, data: Dict[str, Any] | list, search_term: str) -> None:
-        """Waliduje dane o filmach w odpowiedzi API"""
-        
-        movies = []
-        
-        # Różne struktury odpowiedzi API
-        if isinstance(data, dict):
-            # Struktura: {"results": [...], "movies": [...], "data": [...]}
-            movies = (data.get('results', []) or 
-                     data.get('movies', []) or 
-                     data.get('data', []) or
-                     data.get('items', []))
-            
-            # Jeśli nie ma zagnieżdżonych list, może cała odpowiedź to lista filmów
-            if not movies and 'title' in data:
-                movies = [data]
-                
-        elif isinstance(data, list):
-            movies = data
-        
-        # Sprawdź czy znaleziono filmy
-        assert len(movies) > 0, f"Brak filmów w odpowiedzi API dla '{search_term}'"
-        
-        # Sprawdź strukturę pierwszego filmu
-        first_movie = movies[0]
-        assert isinstance(first_movie, dict), "Film nie jest obiektem JSON"
+    @pytest.mark.api
+    def test_search_api_different_endpoints(self, api_endpoint: Optional[ApiEndpoint],
+                                            http_session: requests.Session):
+        """Test endpointu znalezionego wśród możliwych endpointów API"""
         
-        # Sprawdź wymagane pola
-        title_fields = ['title', 'name', 'original_title', 'display_name']
-        title_found = any(field in first_movie for field in title_fields)
-        assert title_found, f"Brak pola tytułu w filmie: {first_movie.keys()}"
+        search_term = "the pickup"
         
-        # Sprawdź czy tytuł zawiera wyszukiwaną frazę
-        movie_title = ""
-        for field in title_fields:
-            if field in first_movie:
-                movie_title = str(first_movie[field])
-                break
+        if api_endpoint is None:
+            pytest.skip("Nie znaleziono działającego API endpoint")
         
-        assert search_term.lower() in movie_title.lower(), \
-            f"Tytuł '{movie_title}' nie zawiera frazy '{search_term}'"
+        print(f"✓ Działający endpoint: {api_endpoint.url} "
+              f"(status {api_endpoint.status_code}, {api_endpoint.latency_ms:.0f} ms)")
         
-        print(f"✓ API zwróciło {len(movies)} filmów, pierwszy: '{movie_title}'")
+        try:
+            response = http_session.get(
+                api_endpoint.url,
+                params={"q": search_term},
+                timeout=5
+            )
+        except requests.exceptions.RequestException as e:
+            pytest.fail(f"Endpoint {api_endpoint.url} przestał odpowiadać: {e}")
+        
+        self._validate_api_response(response, search_term)
     
     @pytest.mark.api
-    def test_search_api_different_endpoints(self, base_url: str):
-        """Test różnych możliwych endpointów API"""
+    @pytest.mark.slow
+    def test_search_api_pagination(self, api_endpoint: Optional[ApiEndpoint],
+                                   http_session: requests.Session):
+        """Test wszystkich stron wyników: schemat rekordów, duplikaty i zgodność z total"""
         
-        search_term = "the pickup"
-        found_working_endpoint = False
+        if api_endpoint is None:
+            pytest.skip("Nie znaleziono działającego API endpoint")
         
-        for endpoint in self.POSSIBLE_API_ENDPOINTS:
-            api_url = f"{base_url}{endpoint}"
-            
-            try:
-                response = requests.get(
-                    api_url,
-                    params={"q": search_term},
-                    timeout=5
-                )
-                
-                if response.status_code == 200:
-                    print(f"✓ Działający endpoint: {api_url}")
-                    found_working_endpoint = True
-                    self._validate_api_response(response, search_term)
-                    break
-                    
-            except requests.exceptions.RequestException:
-                continue
+        report = PaginatedSearchValidator(http_session, api_endpoint.url, limit=20).validate("film")
         
-        if not found_working_endpoint:
-            pytest.skip("Nie znaleziono działającego API endpoint")
\ No newline at end of file
+        assert report.ok, f"Błędy stronicowania ({report.problem_count}): " + "; ".join(report.problems)
+        print(f"✓ {report.records} rekordów na {report.pages_fetched} stronach, total={report.total}")
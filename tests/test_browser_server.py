@@ -0,0 +1,87 @@
+import json
+import os
+import socket
+import subprocess
+import time
+
+import pytest
+
+from utils.browser_server import BrowserServer
+from utils.run_profiles import RunProfile
+
+OPTIONS = {"headless": True, "args": []}
+
+
+def write_state(path, **state):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(dict({"pid": os.getpid(), "options": OPTIONS, "started_at": time.time()}, **state), handle)
+
+
+class TestRunProfiles:
+    """Testy profili uruchomienia"""
+
+    def test_profiles_from_config(self):
+        """Profil debug spowalnia akcje i pokazuje przeglądarkę, fast nie"""
+        fast = RunProfile.from_file("fast")
+        debug = RunProfile.from_file("debug")
+
+        assert fast.launch_options()["headless"] and fast.slow_mo == 0
+        assert not debug.launch_options()["headless"] and debug.slow_mo > 0
+        assert "slow_mo" not in debug.server_options()
+        with pytest.raises(ValueError, match="dostępne: ci, debug, fast"):
+            RunProfile.from_file("turbo")
+
+
+class TestBrowserServer:
+    """Testy wykrywania nieaktualnego serwera przeglądarki"""
+
+    def test_running_server_is_reused(self, tmp_path):
+        """Działający serwer z tymi samymi opcjami jest używany bez startowania nowego"""
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen()
+            endpoint = f"ws://127.0.0.1:{listener.getsockname()[1]}/abc"
+            server = BrowserServer(OPTIONS, str(tmp_path / "browser_server.json"))
+            write_state(server.state_path, ws_endpoint=endpoint)
+
+            assert server.endpoint() == endpoint
+
+    def test_restart_keeps_server_already_replaced_by_another_worker(self, tmp_path):
+        """Nieudane połączenie ze starym endpointem nie zatrzymuje serwera, który już go zastąpił"""
+        process = subprocess.Popen(["sleep", "30"], start_new_session=True)
+        try:
+            with socket.socket() as listener:
+                listener.bind(("127.0.0.1", 0))
+                listener.listen()
+                endpoint = f"ws://127.0.0.1:{listener.getsockname()[1]}/new"
+                server = BrowserServer(OPTIONS, str(tmp_path / "browser_server.json"))
+                write_state(server.state_path, ws_endpoint=endpoint, pid=process.pid)
+
+                assert server.restart("ws://127.0.0.1:1/old") == endpoint
+                assert process.poll() is None
+        finally:
+            process.kill()
+            process.wait()
+
+    def test_each_option_set_has_its_own_server(self, tmp_path):
+        """Inny profil dostaje osobny plik stanu zamiast wymieniać cudzy serwer"""
+        base = str(tmp_path / "browser_server.json")
+        headed = BrowserServer({"headless": False, "args": []}, base)
+
+        assert BrowserServer(OPTIONS, base).state_path != headed.state_path
+        assert BrowserServer(dict(reversed(list(OPTIONS.items()))), base).state_path == \
+            BrowserServer(OPTIONS, base).state_path
+        assert os.path.basename(headed.state_path).startswith("browser_server-")
+
+    def test_stale_servers_are_detected(self, tmp_path):
+        """Martwy proces, zamknięty port i wiek oznaczają serwer do wymiany"""
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            free_port = listener.getsockname()[1]
+        server = BrowserServer(OPTIONS, str(tmp_path / "browser_server.json"), max_age_s=3600)
+        state = {"ws_endpoint": f"ws://127.0.0.1:{free_port}/abc", "pid": os.getpid(),
+                 "options": OPTIONS, "started_at": time.time()}
+
+        assert server.stale_reason(state) == "nie przyjmuje połączeń"
+        assert server.stale_reason(dict(state, pid=2 ** 22 + 1)) == "proces nie działa"
+        assert server.stale_reason(dict(state, started_at=time.time() - 7200)) == "serwer zbyt stary"
@@ -7,14 +7,14 @@ class TestManualBugVerification:
     """Testy weryfikujące błędy znalezione podczas analizy manualnej"""
     
     @pytest.mark.regression
-    def test_clear_button_bug_verification(self, page: Page):
+    def test_clear_button_bug_verification(self, page: Page, base_url: str):
         """
         Test weryfikujący błąd przycisku 'Wyczyść' na stronie Filmy
         
         Ten test dokumentuje istniejący błąd i służy jako test regresyjny
         po jego naprawie.
         """
-        movies_page = MoviesPage(page)
+        movies_page = MoviesPage(page, base_url)
         
         # Krok 1: Wejdź na stronę filmów
         movies_page.open_movies_page()
@@ -27,21 +27,17 @@ class TestManualBugVerification:
         initial_sort_value = movies_page.get_current_sort_value()
         
         # Krok 4: Zmień sortowanie na inne niż domyślne
+        # (page object sam czeka na przeładowanie listy)
         movies_page.select_sort_option("Data dodania")  # lub inna dostępna opcja
         
-        # Poczekaj na przeładowanie
-        page.wait_for_timeout(2000)
-        
         # Krok 5: Sprawdź czy sortowanie się zmieniło
         new_sort_value = movies_page.get_current_sort_value()
         assert new_sort_value != initial_sort_value, "Sortowanie nie zmieniło się po wybraniu opcji"
         
         # Krok 6: Kliknij przycisk 'Wyczyść' 
+        # (page object czeka na ewentualną reakcję strony)
         movies_page.click_clear_button()
         
-        # Poczekaj na ewentualną reakcję
-        page.wait_for_timeout(2000)
-        
         # Krok 7: Sprawdź czy sortowanie zostało zresetowane
         final_sort_value = movies_page.get_current_sort_value()
         
@@ -64,7 +60,7 @@ class TestManualBugVerification:
         """
         from pages import HomePage
         
-        home_page = HomePage(page)
+        home_page = HomePage(page, base_url)
         
         # Wejdź na stronę główną  
         home_page.open_homepage()
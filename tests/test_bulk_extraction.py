@@ -0,0 +1,54 @@
+from pages import HomePage, MovieCard, MoviePage, MoviesPage
+from pages.scripts import COUNT_FIRST_MATCH, EXTRACT_CARDS, VISIBILITY_STATUSES, VISIBLE_HREFS
+
+
+class FakePage:
+    """Strona Playwright zwracająca przygotowane wyniki evaluate i liczącą wywołania"""
+
+    url = "http://localhost/szukaj?q=the+pickup"
+
+    def __init__(self, results):
+        self.results = results
+        self.evaluate_calls = []
+
+    def add_init_script(self, script):
+        pass
+
+    def wait_for_function(self, expression, arg=None, timeout=None):
+        pass
+
+    def evaluate(self, expression, arg=None):
+        self.evaluate_calls.append(expression)
+        return self.results[expression]
+
+
+class TestBulkExtraction:
+    """Testy wyciągania danych kart jednym wywołaniem"""
+
+    def test_search_results_are_records_from_one_call(self):
+        """Wszystkie wyniki to rekordy MovieCard z jednego evaluate"""
+        page = FakePage({EXTRACT_CARDS: [["/film/the-pickup-2023", "The Pickup", 2023, "/p/1.svg"],
+                                         ["/film/the-pickup-artist-2007", "The Pickup Artist", 2007, None]]})
+
+        results = HomePage(page, "http://localhost").get_search_results()
+
+        assert results == [MovieCard("/film/the-pickup-2023", "The Pickup", 2023, "/p/1.svg"),
+                           MovieCard("/film/the-pickup-artist-2007", "The Pickup Artist", 2007)]
+        assert page.evaluate_calls == [EXTRACT_CARDS]
+        assert not hasattr(results[0], "__dict__")
+
+    def test_movies_count_is_one_call(self):
+        """Liczba filmów bez pobierania uchwytów elementów"""
+        page = FakePage({COUNT_FIRST_MATCH: 24})
+
+        assert MoviesPage(page, "http://localhost").get_movies_count() == 24
+        assert page.evaluate_calls == [COUNT_FIRST_MATCH]
+
+    def test_popup_redirect_skips_visible_links_without_href(self):
+        """Widoczny link z pustym href (np. zamknięcie popupa) nie wygrywa z prawdziwym linkiem"""
+        hrefs = [""] * len(MoviePage.POPUP_REDIRECT_LINK_SELECTORS)
+        hrefs[1] = "https://ads.example.com/offer"
+        page = FakePage({VISIBILITY_STATUSES: [1], VISIBLE_HREFS: hrefs})
+
+        assert MoviePage(page).get_popup_redirect_url() == "https://ads.example.com/offer"
+        assert page.evaluate_calls == [VISIBILITY_STATUSES, VISIBLE_HREFS]
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from utils.bulk_validation import BulkSearchValidator
+from utils.search_corpus import iter_corpus
+from utils.stub_server import StubServer
+
+
+class TestBulkSearchValidator:
+    """Testy masowej walidacji wyszukiwarki"""
+
+    @pytest.fixture
+    def corpus_path(self, tmp_path):
+        lines = []
+        for number in range(30):
+            if number % 3 == 0:
+                lines.append({"query": f"abcxyz{number}", "class": "negative"})
+            else:
+                lines.append({"query": "the pickup", "class": "positive"})
+        path = tmp_path / "corpus.jsonl"
+        path.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+        return str(path)
+
+    def read_results(self, path):
+        with open(path, encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_validates_each_query_class(self, corpus_path, tmp_path):
+        """Zapytania pozytywne muszą znaleźć tytuł, negatywne - nic"""
+        results_path = str(tmp_path / "results.jsonl")
+        with StubServer() as server:
+            summary = BulkSearchValidator(server.url, results_path, concurrency=4).run(iter_corpus(corpus_path))
+
+        assert summary == {"negative": {"passed": 10, "failed": 0}, "positive": {"passed": 20, "failed": 0}}
+        assert len(self.read_results(results_path)) == 30
+
+    def test_resumes_after_interruption_without_duplicates(self, corpus_path, tmp_path):
+        """Po przerwaniu kolejne uruchomienie kończy korpus bez dublowania wyników"""
+        results_path = str(tmp_path / "results.jsonl")
+
+        def interrupted(queries, after):
+            for index, query in enumerate(queries):
+                if index == after:
+                    raise KeyboardInterrupt
+                yield query
+
+        with StubServer() as server:
+            with pytest.raises(KeyboardInterrupt):
+                BulkSearchValidator(server.url, results_path, concurrency=3,
+                                    checkpoint_every=5).run(interrupted(iter_corpus(corpus_path), 17))
+            partial = len(self.read_results(results_path))
+            BulkSearchValidator(server.url, results_path, concurrency=3).run(iter_corpus(corpus_path))
+
+        lines = [result["line"] for result in self.read_results(results_path)]
+        assert 0 < partial < 30
+        assert sorted(lines) == list(range(30))
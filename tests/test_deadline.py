@@ -0,0 +1,98 @@
+import time
+
+import pytest
+import requests
+
+from pages import BasePage
+from utils import deadline as deadline_module
+from utils.deadline import DeadlineExceeded, bound_deadline, timeout_ms, timeout_s
+from utils.http_session import PooledSession
+
+
+class FakePage:
+    """Strona Playwright bez przeglądarki"""
+
+    url = "http://localhost/"
+
+    def __init__(self):
+        self.goto_timeouts = []
+
+    def add_init_script(self, script):
+        pass
+
+    def goto(self, url, timeout=None):
+        self.goto_timeouts.append(timeout)
+
+
+class SlowPage(BasePage):
+    def wait_for_results(self, seconds):
+        time.sleep(seconds)
+        return True
+
+
+class TestDeadline:
+    """Testy budżetu czasu testu"""
+
+    def test_timeouts_are_capped_by_remaining_budget(self):
+        """Limity oczekiwań i zapytań nie przekraczają pozostałego budżetu"""
+        with bound_deadline(2):
+            assert timeout_ms(10000) <= 2000
+            assert timeout_ms() <= 2000
+            assert timeout_ms(500) == 500
+            connect, read = timeout_s((5, None))
+            assert connect <= 2 and read <= 2
+        with bound_deadline(None):
+            assert timeout_ms(10000) == 10000
+            assert timeout_s(10) == 10
+
+    def test_step_that_exhausts_budget_fails_test(self):
+        """Krok, po którym budżet jest wyczerpany, oblewa test z nazwą kroku - mimo except Exception"""
+        page = SlowPage(FakePage())
+
+        with bound_deadline(0.2):
+            assert page.wait_for_results(0.05)
+            with pytest.raises(DeadlineExceeded, match=r"w kroku SlowPage.wait_for_results; najdłuższe"):
+                try:
+                    page.wait_for_results(0.2)
+                except Exception:
+                    pytest.fail("DeadlineExceeded nie może być połknięty przez except Exception")
+
+    def test_http_request_draws_from_budget(self, monkeypatch: pytest.MonkeyPatch):
+        """Zapytanie API dostaje timeout przycięty do budżetu i jest doliczane do budżetu"""
+        timeouts = []
+
+        def slow_request(session, method, url, **kwargs):
+            timeouts.append(kwargs["timeout"])
+            time.sleep(0.15)
+            return requests.Response()
+
+        monkeypatch.setattr(requests.Session, "request", slow_request)
+        session = PooledSession()
+
+        with bound_deadline(0.2) as deadline:
+            session.get("http://localhost/api/search", params={"q": "film"}, timeout=10)
+            with pytest.raises(DeadlineExceeded, match=r"najdłuższe kroki: HTTP GET /api/search"):
+                session.get("http://localhost/api/search", params={"q": "film"}, timeout=10)
+
+        assert timeouts[0] <= 0.2
+        assert deadline.steps["HTTP GET /api/search"] >= 0.3
+        session.close()
+
+    def test_navigation_uses_profile_navigation_timeout(self, monkeypatch: pytest.MonkeyPatch):
+        """goto z aktywnym budżetem dostaje limit nawigacji profilu, a nie limit akcji"""
+        monkeypatch.setenv("PERF_METRICS", "0")
+        monkeypatch.setattr(deadline_module, "_action_timeout_ms", 15000)
+        monkeypatch.setattr(deadline_module, "_navigation_timeout_ms", 30000)
+        page = FakePage()
+
+        with bound_deadline(180):
+            BasePage(page).navigate_to("http://localhost/film/the-pickup")
+        with bound_deadline(10):
+            BasePage(page).navigate_to("http://localhost/film/the-pickup")
+        with bound_deadline(None):
+            BasePage(page).navigate_to("http://localhost/film/the-pickup")
+
+        assert 29000 < page.goto_timeouts[0] <= 30000
+        assert page.goto_timeouts[1] <= 10000
+        # Bez budżetu obowiązuje domyślny limit nawigacji kontekstu
+        assert page.goto_timeouts[2] is None
@@ -1,13 +1,18 @@
+import asyncio
+
 import pytest
-import time
+from playwright.async_api import BrowserContext as AsyncBrowserContext
 from playwright.sync_api import Page
-from pages import HomePage, MoviePage
+from pages import AsyncHomePage, HomePage, MoviePage
+from utils.journey_runner import JourneyRunner
 
 
 class TestE2ESearch:
     """Testy End-to-End wyszukiwarki filmów"""
     
     @pytest.mark.e2e
+    # Odtwarzanie potrzebuje plików wideo, a popup z reklamą - domen reklamowych
+    @pytest.mark.allow_resources("ads", "media")
     @pytest.mark.parametrize("search_term,expected_result", [
         ("the pickup", "positive"),
         ("abcxyz123", "negative")
@@ -24,7 +29,7 @@ class TestE2ESearch:
         5. Wejście na stronę filmu (tylko pozytywny przypadek)
         6. Weryfikacja H1, odtwarzacza i popupa
         """
-        home_page = HomePage(page)
+        home_page = HomePage(page, base_url)
         movie_page = MoviePage(page)
         
         # Krok 1: Wejście na stronę główną
@@ -48,7 +53,7 @@ class TestE2ESearch:
             assert movie_url, "Nie znaleziono linku do filmu"
             
             # Poczekaj na załadowanie strony filmu
-            time.sleep(2)
+            movie_page.wait_for_movie_page()
             
             # Krok 6: Sprawdzenie nagłówka H1
             movie_title = movie_page.get_movie_title()
@@ -61,21 +66,22 @@ class TestE2ESearch:
             # Krok 8: Uruchomienie odtwarzania
             movie_page.play_video()
             
-            # Krok 9: Weryfikacja popupa (1-60 sekund)
-            popup_appeared = movie_page.wait_for_popup(timeout=60)
-            assert popup_appeared, "Popup nie pojawił się w ciągu 60 sekund"
+            # Krok 9: Weryfikacja popupa (1-60 sekund) i czasu od kliknięcia
+            popup = movie_page.measure_popup(timeout=60)
+            assert popup, "Popup nie pojawił się w ciągu 60 sekund"
             
             # Krok 10: Sprawdzenie URL przekierowania z popupa
-            redirect_url = movie_page.get_popup_redirect_url()
+            redirect_url = popup.redirect_url or movie_page.get_popup_redirect_url()
             assert redirect_url, "Nie znaleziono URL przekierowania w popupie"
             
-            print(f"URL przekierowania z popupa: {redirect_url}")
+            print(f"Popup po {popup.latency_ms} ms, URL przekierowania: {redirect_url}")
             
         else:
             # Przypadek negatywny - brak wyników
             assert len(search_results) == 0, f"Znaleziono nieoczekiwane wyniki dla '{search_term}'"
             
     @pytest.mark.e2e
+    @pytest.mark.allow_resources("ads", "media")
     def test_search_positive_the_pickup(self, page: Page, base_url: str):
         """Test pozytywny wyszukiwania 'the pickup'"""
         self.test_movie_search_and_playback(page, base_url, "the pickup", "positive")
@@ -83,4 +89,41 @@ class TestE2ESearch:
     @pytest.mark.e2e  
     def test_search_negative_nonexistent(self, page: Page, base_url: str):
         """Test negatywny wyszukiwania nieistniejącego filmu"""
-        self.test_movie_search_and_playback(page, base_url, "abcxyz123", "negative")
\ No newline at end of file
+        self.test_movie_search_and_playback(page, base_url, "abcxyz123", "negative")
+
+
+class TestE2ESearchAsync:
+    """Testy wyszukiwarki na asynchronicznych page objectach"""
+    
+    @pytest.mark.e2e
+    @pytest.mark.asyncio
+    async def test_concurrent_searches(self, async_context: AsyncBrowserContext, base_url: str):
+        """Kilka wyszukiwań naraz - każde na osobnej stronie, w jednej pętli zdarzeń"""
+        cases = {"the pickup": True, "abcxyz123": False}
+        
+        async def search(term: str) -> list:
+            home_page = AsyncHomePage(await async_context.new_page(), base_url)
+            await home_page.open_homepage()
+            await home_page.click_search_icon()
+            await home_page.search_for_movie(term)
+            return await home_page.get_search_results()
+            
+        results = await asyncio.gather(*(search(term) for term in cases))
+        
+        for (term, expect_results), found in zip(cases.items(), results):
+            assert bool(found) == expect_results, f"Nieoczekiwane wyniki dla '{term}': {found}"
+
+    @pytest.mark.e2e
+    @pytest.mark.asyncio
+    async def test_all_search_results_open_at_once(self, async_context: AsyncBrowserContext, base_url: str):
+        """Wszystkie wyniki jednego wyszukiwania otwarte naraz - każda strona filmu ma H1 i odtwarzacz"""
+        runner = JourneyRunner(async_context, base_url)
+        
+        search, *movies = await runner.open_all_results("the pickup")
+        
+        assert search.ok, search.error
+        assert movies, "Brak wyników wyszukiwania dla 'the pickup'"
+        for journey in movies:
+            assert journey.ok, f"{journey.name}: {journey.error}"
+            assert journey.data["title"], f"Brak tytułu filmu (H1) na {journey.name}"
+            assert journey.data["player_visible"], f"Odtwarzacz wideo nie jest widoczny na {journey.name}"
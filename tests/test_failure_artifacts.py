@@ -0,0 +1,37 @@
+import os
+import time
+
+from utils.failure_artifacts import ArtifactWriter, Retention
+
+
+class TestFailureArtifacts:
+    """Testy zapisu artefaktów i limitów katalogu"""
+
+    def make_file(self, directory, name, size, age_s):
+        path = directory / name
+        path.write_bytes(b"x" * size)
+        mtime = time.time() - age_s
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_retention_removes_old_then_oldest_over_size(self, tmp_path):
+        """Najpierw znikają pliki za stare, potem najstarsze ponad limit rozmiaru"""
+        expired = self.make_file(tmp_path, "expired.png", 10, age_s=10 * 86400)
+        oldest = self.make_file(tmp_path, "oldest.png", 600, age_s=300)
+        newest = self.make_file(tmp_path, "newest.zip", 600, age_s=10)
+
+        removed = Retention(max_bytes=1000, max_age_s=86400).apply(str(tmp_path))
+
+        assert sorted(removed) == sorted([str(expired), str(oldest)])
+        assert newest.exists()
+
+    def test_writer_flushes_on_close(self, tmp_path):
+        """close() czeka na zapis wszystkich zleconych plików"""
+        writer = ArtifactWriter(str(tmp_path), Retention(max_bytes=10 ** 6, max_age_s=86400))
+        writer.write(str(tmp_path / "test.png"), b"\x89PNG")
+        writer.write(str(tmp_path / "test.html"), "<html></html>")
+        writer.close()
+
+        assert (tmp_path / "test.png").read_bytes() == b"\x89PNG"
+        assert (tmp_path / "test.html").read_text(encoding="utf-8") == "<html></html>"
+        assert sorted(os.listdir(tmp_path)) == ["test.html", "test.png"]
@@ -0,0 +1,31 @@
+import time
+
+from utils.http_session import PooledSession, RetryPolicy
+from utils.stub_server import StubConfig, StubServer
+
+
+class TestPooledSession:
+    """Testy wspólnej sesji HTTP dla testów API"""
+
+    def test_reuses_keep_alive_connection(self):
+        """Kolejne zapytania idą tym samym połączeniem"""
+        with StubServer() as server, PooledSession() as session:
+            for query in ("the pickup", "abc", "film"):
+                assert session.get(f"{server.url}/api/search", params={"q": query}, timeout=5).ok
+            stats = session.connection_stats()
+
+        assert stats == {"requests": 3, "connections_opened": 1, "connections_reused": 2}
+
+    def test_retries_server_errors_honouring_retry_after(self):
+        """503 jest ponawiane po czasie z Retry-After, a ostatnia odpowiedź wraca do testu"""
+        config = StubConfig(failure_rate=1.0, retry_after_s=1)
+        policy = RetryPolicy(retries=1, backoff_factor=0, max_retry_after=5)
+        with StubServer(config=config) as server, PooledSession(policy) as session:
+            started = time.monotonic()
+            response = session.get(f"{server.url}/api/search", params={"q": "x"}, timeout=5)
+            elapsed = time.monotonic() - started
+            stats = session.connection_stats()
+
+        assert response.status_code == 503
+        assert stats["requests"] == 2
+        assert elapsed >= 1
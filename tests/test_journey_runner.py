@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+from utils.journey_runner import JourneyRunner
+from utils.step_timing import step_log
+
+
+class FakePage:
+    """Strona Playwright - ścieżki w testach jej nie używają"""
+
+
+class FakeContext:
+    """Kontekst przeglądarki liczący otwarte strony"""
+
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        await asyncio.sleep(0)
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+def waiting_journey(seconds, fail=False):
+    async def journey(page):
+        step_log.record(page, "FakePage.wait", seconds)
+        await asyncio.sleep(seconds)
+        if fail:
+            raise AssertionError("brak odtwarzacza")
+        return {"page": id(page)}
+
+    return journey
+
+
+class TestJourneyRunner:
+    """Testy równoległych ścieżek na wielu stronach jednego kontekstu"""
+
+    @pytest.mark.asyncio
+    async def test_journeys_run_concurrently_on_limited_pages(self):
+        """Osiem ścieżek na czterech stronach trwa tyle co dwie po kolei, nie osiem"""
+        context = FakeContext()
+        runner = JourneyRunner(context, "http://localhost", pages=4)
+
+        started = time.perf_counter()
+        results = await runner.run({f"j{i}": waiting_journey(0.1) for i in range(8)})
+        elapsed = time.perf_counter() - started
+
+        assert [result.name for result in results] == [f"j{i}" for i in range(8)]
+        assert all(result.ok for result in results)
+        assert len(context.pages) == 4
+        assert elapsed < 0.5
+        assert results[0].steps == {"FakePage.wait": {"calls": 1, "duration_s": 0.1}}
+        # Test dostaje sumę kroków ze wszystkich ścieżek na stronie
+        assert sum(step_log.pop(page)["FakePage.wait"]["calls"] for page in context.pages) == 8
+
+    @pytest.mark.asyncio
+    async def test_failed_journey_does_not_stop_others(self):
+        """Błąd jednej ścieżki trafia do jej wyniku, pozostałe kończą się normalnie"""
+        runner = JourneyRunner(FakeContext(), "http://localhost", pages=2)
+
+        ok, failed = await runner.run({"ok": waiting_journey(0.01), "failed": waiting_journey(0.01, fail=True)})
+
+        assert ok.ok and ok.data
+        assert not failed.ok
+        assert failed.error == "AssertionError: brak odtwarzacza"
+        assert failed.duration_s >= 0.01
@@ -0,0 +1,36 @@
+from utils.network_blocking import BlockingProfile
+
+
+class TestBlockingProfile:
+    """Testy profilu blokowania zasobów"""
+
+    def make_profile(self) -> BlockingProfile:
+        return BlockingProfile(
+            ["image", "font"],
+            {"ads": ["doubleclick.net"], "analytics": ["google-analytics.com"]},
+            {"image": 100, "other": 10},
+        )
+
+    def test_blocks_domain_groups_with_subdomains(self):
+        """Domena z grupy jest blokowana razem z subdomenami"""
+        profile = self.make_profile()
+
+        assert profile.block_reason("https://doubleclick.net/ad.js", "script") == "domain:ads"
+        assert profile.block_reason("https://stats.g.doubleclick.net/x", "xhr") == "domain:ads"
+        assert profile.block_reason("https://notdoubleclick.net/x", "script") is None
+
+    def test_blocks_resource_types_on_first_party(self):
+        """Typ zasobu jest blokowany niezależnie od domeny"""
+        profile = self.make_profile()
+
+        assert profile.block_reason("https://vod.film/poster.jpg", "image") == "type:image"
+        assert profile.block_reason("https://vod.film/", "document") is None
+
+    def test_without_unblocks_groups_and_types(self):
+        """allow_resources zdejmuje grupy domen i typy zasobów"""
+        profile = self.make_profile().without(["ads", "image"])
+
+        assert profile.block_reason("https://doubleclick.net/ad.js", "script") is None
+        assert profile.block_reason("https://vod.film/poster.jpg", "image") is None
+        assert profile.block_reason("https://google-analytics.com/c", "xhr") == "domain:analytics"
+        assert profile.estimate_bytes("media") == 10
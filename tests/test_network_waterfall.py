@@ -0,0 +1,112 @@
+import json
+
+from utils.network_waterfall import USER_PROPERTY, NetworkRecorder, WaterfallReport, waterfall_html
+
+
+class FakeContext:
+    """Kontekst przeglądarki, który emituje zdarzenia sieci na żądanie testu"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.handlers[event].remove(handler)
+
+    def emit(self, event, value):
+        for handler in list(self.handlers.get(event, [])):
+            handler(value)
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type, start, response_end, body_size=0, failure=None):
+        self.url = url
+        self.resource_type = resource_type
+        self.timing = {"startTime": start, "responseStart": response_end / 2, "responseEnd": response_end}
+        self.failure = failure
+        self.body_size = body_size
+
+    def sizes(self):
+        return {"responseHeadersSize": 200 if self.body_size else 0, "responseBodySize": self.body_size}
+
+
+class FakeResponse:
+    from_service_worker = False
+
+    def __init__(self, request, status):
+        self.request = request
+        self.status = status
+
+
+def load(context, request, status=200):
+    context.emit("response", FakeResponse(request, status))
+    context.emit("requestfinished", request)
+
+
+class FakeReport:
+    when = "teardown"
+
+    def __init__(self, nodeid, waterfall):
+        self.nodeid = nodeid
+        self.user_properties = [(USER_PROPERTY, waterfall)]
+
+
+class TestNetworkWaterfall:
+    """Testy nagrywania waterfallu sieci"""
+
+    def test_requests_are_classified_and_summed(self):
+        """Żądania mają czasy względem pierwszego, podział własne/zewnętrzne, cache, nieudane i zablokowane"""
+        context = FakeContext()
+        recorder = NetworkRecorder("https://www.vod.film")
+        recorder.attach(context)
+
+        load(context, FakeRequest("https://vod.film/film/the-pickup", "document", 1000.0, 120, 30000))
+        load(context, FakeRequest("https://cdn.vod.film/app.js", "script", 1100.0, 80, 0), status=304)
+        load(context, FakeRequest("https://ads.example.com/popup.js", "script", 1150.0, 900, 50000))
+        context.emit("requestfailed", FakeRequest("https://tracker.example.net/t", "xhr", 1200.0, -1,
+                                                  failure="net::ERR_BLOCKED_BY_CLIENT"))
+        context.emit("requestfailed", FakeRequest("https://cdn.example.org/lib.js", "script", 1250.0, -1,
+                                                  failure="net::ERR_CONNECTION_REFUSED"))
+        recorder.detach(context)
+        waterfall = recorder.finalize()
+
+        requests = waterfall["requests"]
+        assert [entry["start_ms"] for entry in requests] == [0.0, 100.0, 150.0, 200.0, 250.0]
+        assert [entry["third_party"] for entry in requests] == [False, False, True, True, True]
+        assert requests[1]["cached"] and not requests[0]["cached"]
+        assert requests[3]["blocked"] and requests[3]["duration_ms"] is None
+        assert not requests[4]["blocked"]
+        summary = waterfall["summary"]
+        assert summary["requests"] == 4
+        assert summary["transfer_bytes"] == 30200 + 50200
+        assert summary["third_party"] == {"requests": 2, "bytes": 50200}
+        # Zablokowane przez NetworkBlocker nie zasłaniają prawdziwych awarii
+        assert summary["failed"] == 1 and summary["blocked"] == 1 and summary["cached"] == 1
+        assert summary["duration_ms"] == 1050.0
+        assert summary["slowest_hosts"][0]["host"] == "ads.example.com"
+        assert context.handlers == {"response": [], "requestfinished": [], "requestfailed": []}
+        html = waterfall_html(waterfall)
+        assert "ads.example.com" in html and "tracker.example.net" not in html
+
+    def test_report_writes_json_and_page_weight_history(self, tmp_path):
+        """Raport zapisuje waterfalle do JSON i dopisuje wagę stron do historii przy każdym uruchomieniu"""
+        context = FakeContext()
+        recorder = NetworkRecorder("https://vod.film")
+        recorder.attach(context)
+        load(context, FakeRequest("https://vod.film/", "document", 1000.0, 100, 1000))
+        waterfall = recorder.finalize()
+        path, history = tmp_path / "network_waterfall.json", tmp_path / "page_weight.jsonl"
+
+        for _ in range(2):
+            report = WaterfallReport(str(path), str(history), environment="stub")
+            report.pytest_runtest_logreport(FakeReport("tests/test_home.py::test_home", waterfall))
+            report.pytest_sessionfinish(None)
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["totals"]["requests"] == 1 and data["totals"]["transfer_bytes"] == 1200
+        runs = [json.loads(line) for line in history.read_text(encoding="utf-8").splitlines()]
+        assert len(runs) == 2
+        assert runs[1]["tests"]["tests/test_home.py::test_home"] == {"requests": 1, "transfer_bytes": 1200,
+                                                                   "duration_ms": 100.0}
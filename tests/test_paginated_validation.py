@@ -0,0 +1,42 @@
+import json
+
+from utils.http_session import PooledSession
+from utils.json_stream import iter_json_array
+from utils.paginated_validation import PaginatedSearchValidator
+from utils.stub_server import StubServer, build_catalog
+
+
+class TestPaginatedValidation:
+    """Testy walidacji stronicowanych wyników wyszukiwania"""
+
+    def test_stream_parser_handles_any_chunking(self):
+        """Parser przyrostowy daje ten sam wynik niezależnie od podziału na kawałki"""
+        document = {"results": [{"id": 1, "title": "Zażółć"}, {"id": 22, "year": 2023}], "total": 120, "page": 1}
+        raw = json.dumps(document, ensure_ascii=False).encode("utf-8")
+        for size in (1, 3, 7, len(raw)):
+            fields = {}
+            chunks = [raw[start:start + size] for start in range(0, len(raw), size)]
+
+            assert list(iter_json_array(chunks, "results", fields)) == document["results"]
+            assert fields == {"total": 120, "page": 1}
+
+    def test_walks_all_pages_consistently(self):
+        """Wszystkie strony razem dają total rekordów bez duplikatów"""
+        with StubServer() as server, PooledSession() as session:
+            validator = PaginatedSearchValidator(session, f"{server.url}/api/search", limit=20, chunk_size=256)
+            report = validator.validate("film testowy")
+
+        assert report.ok, report.problems
+        assert report.total == 118
+        assert report.records == 118
+        assert report.pages_fetched == 7
+
+    def test_detects_duplicate_ids_across_pages(self):
+        """Ten sam id na różnych stronach jest zgłaszany"""
+        catalog = build_catalog(50)
+        catalog[30]["id"] = catalog[5]["id"]
+        with StubServer(catalog=catalog) as server, PooledSession() as session:
+            report = PaginatedSearchValidator(session, f"{server.url}/api/search", limit=10).validate("film")
+
+        assert not report.ok
+        assert report.duplicate_ids == 1
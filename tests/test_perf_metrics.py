@@ -0,0 +1,36 @@
+import pytest
+
+from utils.perf_metrics import DEFAULT_PERF_BUDGETS, PerfBudgets
+
+
+class TestPerfBudgets:
+    """Testy budżetów wydajności"""
+
+    def make_budgets(self, mode: str = "warn") -> PerfBudgets:
+        return PerfBudgets({
+            "default": {"ttfb_ms": 1000, "cls": 0.25},
+            "home": {"ttfb_ms": 500, "mode": "fail"},
+        }, mode)
+
+    def test_page_type_overrides_default_budget(self):
+        """Budżet typu strony nadpisuje domyślny, a reszta limitów zostaje"""
+        budgets = self.make_budgets()
+        home = {"page_type": "home", "url": "/", "ttfb_ms": 700, "cls": 0.3}
+        movie = {"page_type": "movie", "url": "/film/x", "ttfb_ms": 700, "cls": None}
+
+        assert [mode for mode, _ in budgets.check(home)] == ["fail", "fail"]
+        assert budgets.check(movie) == []
+
+    def test_off_mode_disables_checks(self):
+        """Tryb 'off' tylko zbiera metryki"""
+        budgets = self.make_budgets("off")
+
+        assert budgets.check({"page_type": "home", "url": "/", "ttfb_ms": 5000}) == []
+
+    def test_bundled_config_is_valid(self):
+        """Plik config/perf_budgets.json wczytuje się, a nieznany tryb jest odrzucany"""
+        budgets = PerfBudgets.from_file(DEFAULT_PERF_BUDGETS)
+
+        assert budgets.budget_for("home")[0]["lcp_ms"] > 0
+        with pytest.raises(ValueError):
+            PerfBudgets.from_file(DEFAULT_PERF_BUDGETS, "loud")
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+from utils.popup_timing import PopupTiming
+from utils.timing_store import TimingStore, connect, popup_distribution
+
+
+class TestPopupTiming:
+    """Testy pomiaru czasu do popupa"""
+
+    def test_latency_counts_from_click_or_arming(self):
+        """Czas liczony od kliknięcia, a bez kliknięcia - od uzbrojenia obserwatora"""
+        clicked = PopupTiming.from_script({"armed_at": 100.0, "clicked_at": 120.5, "seen_at": 1620.55,
+                                           "selector": ".modal", "href": "https://ads.example.com/r"})
+        armed = PopupTiming.from_script({"armed_at": 100.0, "clicked_at": None, "seen_at": 400.0,
+                                         "selector": ".popup", "href": None})
+
+        assert (clicked.latency_ms, clicked.since_click, clicked.redirect_url) == (1500.0, True,
+                                                                                   "https://ads.example.com/r")
+        assert (armed.latency_ms, armed.since_click) == (300.0, False)
+
+    def test_distribution_across_runs(self, tmp_path):
+        """Czasy z kolejnych uruchomień składają się na rozkład per test"""
+        path = str(tmp_path / "timings.db")
+        for latency_ms in (1500.0, 1600.0, 1700.0, 3000.0):
+            store = TimingStore(path, "local")
+            popups = [PopupTiming(latency_ms, True, ".modal", None).as_dict(),
+                      PopupTiming(5.0, False, ".modal", None, already_visible=True).as_dict()]
+            store.pytest_runtest_logreport(SimpleNamespace(
+                when="call", nodeid="test_movie", duration=5.0, outcome="passed",
+                user_properties=[("popup_timings", popups)]))
+            store.pytest_sessionfinish(None)
+
+        connection = connect(path)
+        distribution = popup_distribution(connection)
+        connection.close()
+
+        assert distribution["test_movie"]["count"] == 4
+        assert distribution["test_movie"]["p50_ms"] == 1600.0
+        assert distribution["test_movie"]["max_ms"] == 3000.0
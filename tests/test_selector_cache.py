@@ -0,0 +1,39 @@
+from utils.selector_cache import SelectorCache
+
+
+class TestSelectorCache:
+    """Testy cache zwycięskich selektorów"""
+
+    SELECTORS = ("button[title='Szukaj']", ".search-icon", ".fa-search")
+
+    def test_key_depends_on_page_type_and_chain(self):
+        """Klucz rozróżnia typ strony i zawartość łańcucha"""
+        key = SelectorCache.make_key("home", self.SELECTORS)
+
+        assert key == SelectorCache.make_key("home", list(self.SELECTORS))
+        assert key != SelectorCache.make_key("movie", self.SELECTORS)
+        assert key != SelectorCache.make_key("home", self.SELECTORS[:2])
+
+    def test_persists_and_invalidates_on_disk(self, tmp_path):
+        """Wpis trafia do pliku i znika z niego po unieważnieniu"""
+        path = str(tmp_path / "selectors.json")
+        key = SelectorCache.make_key("home", self.SELECTORS)
+
+        SelectorCache(path).set(key, ".search-icon")
+        cache = SelectorCache(path)
+        assert cache.get(key) == ".search-icon"
+
+        cache.invalidate(key)
+        assert SelectorCache(path).get(key) is None
+
+    def test_merges_entries_written_by_other_processes(self, tmp_path):
+        """Zapis nie nadpisuje wpisów dodanych przez inny proces"""
+        path = str(tmp_path / "selectors.json")
+        first, second = SelectorCache(path), SelectorCache(path)
+
+        first.set("home:a", ".search-icon")
+        second.set("movie:b", "video")
+
+        merged = SelectorCache(path)
+        assert merged.get("home:a") == ".search-icon"
+        assert merged.get("movie:b") == "video"
@@ -0,0 +1,42 @@
+import json
+import logging
+
+from utils.helpers import setup_logger
+from utils.structured_logging import LogPipeline, bound_test, reset_step, set_step
+
+
+class TestStructuredLogging:
+    """Testy logowania testów do JSON lines"""
+
+    def test_records_are_tagged_and_level_is_overridden_per_test(self, tmp_path, request):
+        """Rekordy mają test i krok, a poziom DEBUG obowiązuje tylko w oznaczonym teście"""
+        pipeline = LogPipeline("vod_test", level="INFO", console_level=None)
+        path = tmp_path / "log.jsonl"
+        pipeline.add_file(str(path))
+        pipeline.add_file(str(path))
+        logger = logging.getLogger("vod_test.pages")
+
+        with bound_test("tests/test_x.py::test_a", level="DEBUG", logger_name="vod_test"):
+            token = set_step("HomePage.search_for_movie")
+            logger.debug("wpisano %s", "the pickup", extra={"duration_s": 0.25})
+            reset_step(token)
+        logger.debug("poza testem - pominięte")
+        logger.info("po teście")
+        pipeline.stop()
+
+        records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert len(records) == 2
+        assert records[0]["test_id"] == "tests/test_x.py::test_a"
+        assert records[0]["step"] == "HomePage.search_for_movie"
+        assert records[0]["msg"] == "wpisano the pickup"
+        assert records[0]["duration_s"] == 0.25
+        # Po wyjściu z bound_test wraca identyfikator bieżącego testu pytest
+        assert (records[1]["test_id"], records[1]["step"]) == (request.node.nodeid, None)
+
+    def test_setup_logger_does_not_duplicate_handlers(self):
+        """Kolejne wywołania setup_logger nie dodają handlerów"""
+        first = setup_logger("search")
+        second = setup_logger("search")
+
+        assert first is second
+        assert len(logging.getLogger("vod").handlers) == 1
@@ -0,0 +1,33 @@
+import time
+
+import requests
+
+from utils.stub_server import StubConfig, StubServer
+
+
+class TestStubServer:
+    """Testy lokalnego zamiennika VOD.Film"""
+
+    def test_api_search_paginates_catalog(self):
+        """API zwraca stronicowane wyniki z polem total"""
+        with StubServer() as server:
+            response = requests.get(f"{server.url}/api/search",
+                                    params={"q": "the pickup", "limit": 1, "page": 2}, timeout=5)
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data["total"] == 2
+        assert data["page"] == 2
+        assert len(data["results"]) == 1
+
+    def test_injects_latency_and_failures(self):
+        """Opóźnienie i awarie można włączyć w trakcie działania serwera"""
+        with StubServer(config=StubConfig()) as server:
+            server.config.update({"latency_ms": 200})
+            started = time.monotonic()
+            requests.get(f"{server.url}/api/search", params={"q": "x"}, timeout=5)
+            assert time.monotonic() - started >= 0.2
+
+            server.config.update({"latency_ms": 0, "failure_rate": 1.0})
+            response = requests.get(f"{server.url}/api/search", params={"q": "x"}, timeout=5)
+            assert response.status_code == 503
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+
+from playwright._impl._sync_base import SyncBase
+
+from utils import step_instrumentation
+from utils.step_timing import instrument_public_methods, step_log
+from utils.timing_store import compare, connect
+
+
+class FakePage:
+    """Zamiennik strony Playwright - wystarczy jako klucz logu kroków"""
+
+
+@instrument_public_methods
+class FakePageObject:
+    def __init__(self, page):
+        self.page = page
+
+    def search(self):
+        self.type_text()
+        self.type_text()
+
+    def type_text(self):
+        pass
+
+    def _helper(self):
+        pass
+
+
+class TestStepTiming:
+    """Testy pomiaru kroków page objectów"""
+
+    def test_records_only_top_level_steps(self):
+        """Metody wywołane wewnątrz kroku nie są osobnymi krokami"""
+        page = FakePage()
+        page_object = FakePageObject(page)
+
+        page_object.search()
+        page_object.type_text()
+        page_object._helper()
+        steps = step_log.pop(page)
+
+        assert set(steps) == {"FakePageObject.search", "FakePageObject.type_text"}
+        assert steps["FakePageObject.type_text"]["calls"] == 1
+        assert step_log.pop(page) == {}
+
+
+    def test_async_steps_are_timed_per_task(self):
+        """Kroki async trwają do końca await, a równoległe ścieżki nie mieszają zagnieżdżenia"""
+
+        @instrument_public_methods
+        class AsyncPageObject:
+            def __init__(self, page):
+                self.page = page
+
+            async def search(self):
+                await self.type_text()
+
+            async def type_text(self):
+                await asyncio.sleep(0.05)
+
+        pages = [FakePage(), FakePage()]
+
+        async def journeys():
+            await asyncio.gather(*(AsyncPageObject(page).search() for page in pages))
+
+        asyncio.run(journeys())
+
+        for page in pages:
+            steps = step_log.pop(page)
+            assert set(steps) == {"AsyncPageObject.search"}
+            assert steps["AsyncPageObject.search"]["duration_s"] >= 0.05
+
+
+class TestTimingStore:
+    """Testy wykrywania regresji czasów"""
+
+    def add_run(self, connection, environment, durations):
+        run_id = connection.execute(
+            "INSERT INTO runs (commit_sha, started_at, environment) VALUES ('abc', '2026-01-01', ?)",
+            (environment,),
+        ).lastrowid
+        connection.executemany(
+            "INSERT INTO timings (run_id, kind, name, duration_s, outcome) VALUES (?, 'test', ?, ?, 'passed')",
+            [(run_id, name, duration) for name, duration in durations.items()],
+        )
+        return run_id
+
+    def test_flags_only_significant_slowdowns(self, tmp_path):
+        """Regresja to wyraźny wzrost względem mediany, a nie zwykły szum"""
+        connection = connect(str(tmp_path / "timings.db"))
+        for noise in (0.0, 0.2, -0.1, 0.1, -0.2):
+            self.add_run(connection, "local", {"slow": 10 + noise, "stable": 10 + noise})
+        self.add_run(connection, "ci", {"slow": 1.0, "stable": 1.0})
+        run_id = self.add_run(connection, "local", {"slow": 14.0, "stable": 10.3})
+
+        regressions = compare(connection, run_id)
+        connection.close()
+
+        assert [item["name"] for item in regressions] == ["slow"]
+        assert regressions[0]["baseline_median_s"] == 10.0
+        assert regressions[0]["samples"] == 5
+
+
+class TestStepInstrumentation:
+    """Testy szczegółowego profilu kroków"""
+
+    def test_profile_nests_calls_and_sums_counters(self, monkeypatch):
+        """Kroki zagnieżdżone są dziećmi kroku nadrzędnego, a liczniki się sumują"""
+        monkeypatch.setattr(step_instrumentation, "_enabled", True)
+        page = FakePage()
+
+        @instrument_public_methods
+        class SelectorPageObject(FakePageObject):
+            def type_text(self):
+                step_instrumentation.record_selectors(3, matched=True)
+
+        SelectorPageObject(page).search()
+        profile = step_instrumentation.profile_log.pop(page)
+        step_log.pop(page)
+
+        assert [frame["name"] for frame in profile] == ["SelectorPageObject.search"]
+        assert [child["name"] for child in profile[0]["children"]] == ["SelectorPageObject.type_text"] * 2
+        assert profile[0]["selectors_tried"] == 6
+        assert profile[0]["selectors_matched"] == 2
+
+    def test_round_trip_hook_targets_existing_playwright_internal(self, monkeypatch):
+        """Przy aktualizacji Playwright ten test pada, jeśli zniknęło SyncBase._sync"""
+        assert callable(getattr(SyncBase, "_sync", None)), \
+            "Playwright nie ma już SyncBase._sync - round trips w --instrument-steps nie będą liczone"
+        monkeypatch.setattr(SyncBase, "_sync", SyncBase._sync)
+        monkeypatch.setattr(step_instrumentation, "_enabled", False)
+
+        step_instrumentation.enable()
+
+        assert SyncBase._sync.__step_hook__
+
+    def test_missing_playwright_internal_falls_back_to_step_timing(self, monkeypatch, caplog):
+        """Bez SyncBase._sync profilowanie działa dalej, a brak jest zalogowany"""
+        monkeypatch.delattr(SyncBase, "_sync")
+        monkeypatch.setattr(step_instrumentation, "_enabled", False)
+        monkeypatch.setattr(logging.getLogger("vod"), "propagate", True)
+
+        with caplog.at_level(logging.WARNING):
+            step_instrumentation.enable()
+
+        assert step_instrumentation.is_enabled()
+        assert "SyncBase._sync" in caplog.text
@@ -0,0 +1,225 @@
+"""
+Benchmark obciążeniowy GET /api/search.
+
+Odtwarza korpus zapytań z zadaną współbieżnością i tempem, mierzy czasy
+odpowiedzi i zapisuje wyniki per klasa zapytania do JSON:
+
+    python -m utils.api_benchmark --base-url https://vod.film --concurrency 10 --rate 20 --requests 500
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.helpers import get_base_url, percentile
+from utils.http_session import PooledSession, RetryPolicy
+from utils.search_corpus import DEFAULT_SEARCH_CORPUS, CorpusQuery, iter_corpus
+
+DEFAULT_BENCHMARK_DIR = "reports/benchmarks"
+API_SEARCH_PATH = "/api/search"
+
+
+class LatencyStats:
+    """Czasy odpowiedzi i błędy jednej klasy zapytań"""
+
+    def __init__(self) -> None:
+        self.latencies_ms: List[float] = []
+        self.send_lags_ms: List[float] = []
+        self.errors = 0
+        self.status_codes: Dict[str, int] = {}
+
+    def record(self, latency_ms: float, status: str, ok: bool, send_lag_ms: float = 0.0) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.send_lags_ms.append(send_lag_ms)
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def merge(self, other: "LatencyStats") -> None:
+        self.latencies_ms.extend(other.latencies_ms)
+        self.send_lags_ms.extend(other.send_lags_ms)
+        self.errors += other.errors
+        for status, count in other.status_codes.items():
+            self.status_codes[status] = self.status_codes.get(status, 0) + count
+
+    def summary(self, duration_s: float) -> Dict[str, Any]:
+        """p50/p90/p99/max, spóźnienie wysłania, przepustowość i odsetek błędów"""
+        values = sorted(self.latencies_ms)
+        lags = sorted(self.send_lags_ms)
+        count = len(values)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "throughput_rps": round(count / duration_s, 2) if duration_s > 0 else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(values, 50), 1),
+                "p90": round(percentile(values, 90), 1),
+                "p99": round(percentile(values, 99), 1),
+                "max": round(values[-1], 1) if values else 0.0,
+            },
+            # O ile wysłanie spóźniło się względem harmonogramu (semafor, pula wątków)
+            "send_lag_ms": {
+                "p50": round(percentile(lags, 50), 1),
+                "p99": round(percentile(lags, 99), 1),
+                "max": round(lags[-1], 1) if lags else 0.0,
+            },
+            "status_codes": dict(sorted(self.status_codes.items())),
+        }
+
+
+class SearchBenchmark:
+    """
+    Odtwarza zapytania do /api/search przez asyncio: semafor ogranicza
+    liczbę zapytań w locie, a opcjonalne tempo (zapytań na sekundę) wyznacza
+    harmonogram - planowany start i-tego zapytania to start + i / tempo.
+    Gdy serwer zwalnia, wysłania spóźniają się względem harmonogramu, więc
+    czas odpowiedzi liczony jest od planowanego startu (razem z czekaniem na
+    semafor i pulę wątków), a spóźnienie wysłania zapisywane osobno - bez
+    tego p90/p99 pod obciążeniem wychodziłyby zaniżone (coordinated omission).
+    Zapytania HTTP idą przez wspólną sesję keep-alive w puli wątków, bez
+    ponawiania - ponowienia zafałszowałyby czasy odpowiedzi.
+    """
+
+    def __init__(self, base_url: str, queries: Sequence[CorpusQuery], concurrency: int = 10,
+                 rate: Optional[float] = None, limit: Optional[int] = None, timeout: float = 10):
+        if not queries:
+            raise ValueError("Korpus zapytań jest pusty")
+        self.url = f"{base_url.rstrip('/')}{API_SEARCH_PATH}"
+        self.queries = list(queries)
+        self.concurrency = max(concurrency, 1)
+        self.rate = rate if rate and rate > 0 else None
+        self.limit = limit
+        self.timeout = timeout
+        self.stats: Dict[str, LatencyStats] = {}
+
+    def run(self, total_requests: int) -> Dict[str, Any]:
+        """Wykonuje total_requests zapytań i zwraca raport"""
+        return asyncio.run(self._run(total_requests))
+
+    async def _run(self, total_requests: int) -> Dict[str, Any]:
+        self.stats = {query.query_class: LatencyStats() for query in self.queries}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started_at = datetime.now(timezone.utc).isoformat()
+        with PooledSession(RetryPolicy(retries=0), pool_maxsize=self.concurrency) as session, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="api-benchmark") as executor:
+            loop = asyncio.get_running_loop()
+            started = time.perf_counter()
+            tasks = []
+            queries = itertools.cycle(self.queries)
+            for index in range(total_requests):
+                if self.rate:
+                    scheduled = started + index / self.rate
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await semaphore.acquire()
+                if not self.rate:
+                    # Bez tempa nie ma harmonogramu - liczymy od chwili, gdy zapytanie dostało miejsce w locie
+                    scheduled = time.perf_counter()
+                tasks.append(loop.create_task(
+                    self._request(loop, executor, session, next(queries), semaphore, scheduled)
+                ))
+            await asyncio.gather(*tasks)
+            duration_s = time.perf_counter() - started
+        return self.report(started_at, duration_s)
+
+    async def _request(self, loop: asyncio.AbstractEventLoop, executor: ThreadPoolExecutor,
+                       session: PooledSession, query: CorpusQuery, semaphore: asyncio.Semaphore,
+                       scheduled: float) -> None:
+        try:
+            latency_ms, status, ok, send_lag_ms = await loop.run_in_executor(
+                executor, self._send, session, query, scheduled
+            )
+            self.stats[query.query_class].record(latency_ms, status, ok, send_lag_ms)
+        finally:
+            semaphore.release()
+
+    def _send(self, session: PooledSession, query: CorpusQuery,
+              scheduled: float) -> Tuple[float, str, bool, float]:
+        """Czas odpowiedzi od planowanego startu, status, ok i spóźnienie wysłania (ms)"""
+        params = {"q": query.query}
+        if self.limit:
+            params["limit"] = self.limit
+        send_lag_ms = max(time.perf_counter() - scheduled, 0.0) * 1000
+        try:
+            response = session.get(self.url, params=params, timeout=self.timeout,
+                                   headers={"Accept": "application/json"})
+            # Czas do pełnej odpowiedzi - także treść musi dojść
+            response.content
+        except Exception as e:
+            return (time.perf_counter() - scheduled) * 1000, type(e).__name__, False, send_lag_ms
+        return (time.perf_counter() - scheduled) * 1000, str(response.status_code), response.ok, send_lag_ms
+
+    def report(self, started_at: str, duration_s: float) -> Dict[str, Any]:
+        """Raport: parametry przebiegu, wynik całościowy i per klasa zapytania"""
+        overall = LatencyStats()
+        for stats in self.stats.values():
+            overall.merge(stats)
+        return {
+            "started_at": started_at,
+            "url": self.url,
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "duration_s": round(duration_s, 3),
+            "overall": overall.summary(duration_s),
+            "classes": {name: stats.summary(duration_s) for name, stats in sorted(self.stats.items())},
+        }
+
+
+def write_report(report: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Zapisuje raport do JSON (domyślnie reports/benchmarks/api_search-<czas>.json)"""
+    if path is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = os.path.join(DEFAULT_BENCHMARK_DIR, f"api_search-{stamp}.json")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    return path
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Tabela wyników do terminala"""
+    lines = [f"{report['url']} - współbieżność {report['concurrency']}, "
+             f"tempo {report['rate'] or 'bez limitu'} req/s, {report['duration_s']} s"]
+    header = (f"{'klasa':<12}{'req':>7}{'błędy':>8}{'req/s':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+              f"{'spóźn. p99':>12}")
+    lines.append(header)
+    rows = list(report["classes"].items()) + [("razem", report["overall"])]
+    for name, summary in rows:
+        latency = summary["latency_ms"]
+        lines.append(
+            f"{name:<12}{summary['requests']:>7}{summary['error_rate']:>8.1%}"
+            f"{summary['throughput_rps']:>9.1f}{latency['p50']:>9.1f}{latency['p90']:>9.1f}"
+            f"{latency['p99']:>9.1f}{latency['max']:>9.1f}{summary['send_lag_ms']['p99']:>12.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark obciążeniowy /api/search")
+    parser.add_argument("--base-url", default=None, help="Adres strony (domyślnie VOD_BASE_URL)")
+    parser.add_argument("--corpus", default=DEFAULT_SEARCH_CORPUS, help="Korpus zapytań (JSONL albo CSV)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Maksymalna liczba zapytań w locie")
+    parser.add_argument("--rate", type=float, default=None, help="Zapytań na sekundę (domyślnie bez limitu)")
+    parser.add_argument("--requests", type=int, default=200, help="Łączna liczba zapytań")
+    parser.add_argument("--limit", type=int, default=None, help="Parametr limit zapytania")
+    parser.add_argument("--output", default=None, help="Plik wynikowy JSON")
+    args = parser.parse_args(argv)
+
+    benchmark = SearchBenchmark(args.base_url or get_base_url(), list(iter_corpus(args.corpus)),
+                                concurrency=args.concurrency, rate=args.rate, limit=args.limit)
+    report = benchmark.run(args.requests)
+    print(format_report(report))
+    print(f"Wyniki zapisane w {write_report(report, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
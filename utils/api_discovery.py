@@ -0,0 +1,161 @@
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional, Sequence
+
+import requests
+
+DEFAULT_DISCOVERY_CACHE = "reports/api_endpoint.json"
+
+# Możliwe endpointy API wyszukiwarki (w kolejności od najbardziej prawdopodobnego)
+POSSIBLE_API_ENDPOINTS = (
+    "/api/search",
+    "/search/api",
+    "/api/movies/search",
+    "/api/films/search",
+    "/search",
+    "/api/v1/search",
+    "/wp-json/wp/v2/search",  # WordPress API
+)
+
+
+def get_discovery_ttl() -> int:
+    """
+    Czas życia zapamiętanego endpointu w sekundach (zmienna API_DISCOVERY_TTL,
+    domyślnie 24 h). 0 wyłącza cache - endpoint jest szukany przy każdej sesji.
+    """
+    return int(os.getenv('API_DISCOVERY_TTL', '86400'))
+
+
+class ApiEndpoint:
+    """Znaleziony endpoint API wraz z odpowiedzią, która go potwierdziła"""
+
+    def __init__(self, url: str, path: str, status_code: int, latency_ms: float,
+                 discovered_at: float):
+        self.url = url
+        self.path = path
+        self.status_code = status_code
+        self.latency_ms = latency_ms
+        self.discovered_at = discovered_at
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Słownik do zapisania w pliku cache"""
+        return {
+            "url": self.url,
+            "path": self.path,
+            "status_code": self.status_code,
+            "latency_ms": self.latency_ms,
+            "discovered_at": self.discovered_at,
+        }
+
+
+class ApiDiscovery:
+    """
+    Szuka działającego endpointu API wyszukiwarki.
+
+    Wszyscy kandydaci są odpytywani równolegle, a wygrywa pierwszy, który
+    odpowie JSON-em ze statusem 200 lub 400 (400 oznacza zwykle, że endpoint
+    istnieje, ale brakuje mu parametrów). Strona HTML ze statusem 200 nie jest
+    API. Wynik jest zapisywany do pliku razem ze statusem i czasem odpowiedzi,
+    więc kolejne uruchomienia do wygaśnięcia TTL nie szukają od nowa.
+    """
+
+    VALID_STATUS_CODES = (200, 400)
+
+    def __init__(self, base_url: str, candidates: Sequence[str] = POSSIBLE_API_ENDPOINTS,
+                 cache_path: Optional[str] = DEFAULT_DISCOVERY_CACHE, ttl: Optional[int] = None,
+                 timeout: float = 5, session: Optional[requests.Session] = None):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.candidates = tuple(candidates)
+        self.cache_path = cache_path
+        self.ttl = get_discovery_ttl() if ttl is None else ttl
+        self.timeout = timeout
+
+    def find(self) -> Optional[ApiEndpoint]:
+        """Endpoint z cache albo z nowego wyszukiwania (None gdy żaden nie działa)"""
+        cached = self._read_cached()
+        if cached is not None:
+            return cached
+        endpoint = self.discover()
+        if endpoint is not None:
+            self._write_cached(endpoint)
+        return endpoint
+
+    def discover(self) -> Optional[ApiEndpoint]:
+        """Odpytuje równolegle wszystkich kandydatów i zwraca pierwszego poprawnego"""
+        if not self.candidates:
+            return None
+        executor = ThreadPoolExecutor(max_workers=len(self.candidates),
+                                      thread_name_prefix="api-discovery")
+        try:
+            pending = {executor.submit(self._probe, path) for path in self.candidates}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    endpoint = _result(future)
+                    if endpoint is not None:
+                        return endpoint
+            return None
+        finally:
+            # Nie czekamy na wolniejszych kandydatów - ich wątki skończą się same
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _probe(self, path: str) -> Optional[ApiEndpoint]:
+        url = f"{self.base_url}{path}"
+        started = time.perf_counter()
+        response = (self.session or requests).get(url, params={"q": "test"}, timeout=self.timeout,
+                                headers={"Accept": "application/json, */*"})
+        latency_ms = (time.perf_counter() - started) * 1000
+        content_type = response.headers.get('content-type', '')
+        if response.status_code not in self.VALID_STATUS_CODES or 'json' not in content_type:
+            return None
+        return ApiEndpoint(url, path, response.status_code, round(latency_ms, 1), time.time())
+
+    def _read_cache_file(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _read_cached(self) -> Optional[ApiEndpoint]:
+        if not self.cache_path or self.ttl <= 0:
+            return None
+        entry = self._read_cache_file().get(self.base_url)
+        try:
+            endpoint = ApiEndpoint(**entry)
+        except TypeError:
+            # Brak wpisu albo wpis w starym formacie
+            return None
+        if time.time() - endpoint.discovered_at >= self.ttl:
+            return None
+        return endpoint
+
+    def _write_cached(self, endpoint: ApiEndpoint) -> None:
+        if not self.cache_path or self.ttl <= 0:
+            return
+        # Plik jest wspólny dla wszystkich adresów i workerów xdist -
+        # scalamy wpisy (bez wygasłych) i zapisujemy atomowo przez os.replace
+        now = time.time()
+        data = {
+            base_url: entry for base_url, entry in self._read_cache_file().items()
+            if isinstance(entry, dict) and now - entry.get("discovered_at", 0) < self.ttl
+        }
+        data[self.base_url] = endpoint.as_dict()
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.cache_path)
+
+
+def _result(future: Future) -> Optional[ApiEndpoint]:
+    try:
+        return future.result()
+    except requests.exceptions.RequestException:
+        return None
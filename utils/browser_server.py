@@ -0,0 +1,232 @@
+"""
+Serwer przeglądarki współdzielony przez kolejne uruchomienia pytest.
+
+Pierwsze uruchomienie z --reuse-browser startuje Chromium przez
+`playwright launch-server` (proces w tle, niezależny od sesji pytest)
+i zapisuje jego endpoint websocket w reports/browser_server-<opcje>.json -
+osobny plik stanu (i serwer) dla każdego zestawu opcji, więc profile nie
+wymieniają sobie nawzajem serwerów. Kolejne uruchomienia łączą się z nim
+(chromium.connect) zamiast startować przeglądarkę od zera. Serwer, który
+nie działa, nie przyjmuje połączeń albo jest zbyt stary, jest zatrzymywany
+i startowany od nowa.
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import socket
+import subprocess
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from playwright._impl._driver import compute_driver_executable, get_driver_env
+
+from utils.run_profiles import RunProfile
+from utils.storage_state import FileLock
+from utils.structured_logging import get_logger
+
+DEFAULT_STATE_FILE = "reports/browser_server.json"
+START_TIMEOUT_S = 30
+
+
+def get_max_age_s() -> float:
+    """Po jakim czasie serwer jest uruchamiany od nowa (BROWSER_SERVER_MAX_AGE_H, domyślnie 12 h)"""
+    return float(os.getenv('BROWSER_SERVER_MAX_AGE_H', '12')) * 3600
+
+
+class BrowserServer:
+    """
+    Długo żyjący serwer Chromium opisany plikiem stanu (endpoint, pid, opcje).
+    state_path to ścieżka bazowa - do nazwy dopisywany jest skrót opcji.
+    """
+
+    def __init__(self, options: Dict[str, Any], state_path: str = DEFAULT_STATE_FILE,
+                 max_age_s: Optional[float] = None):
+        self.options = options
+        self.state_path = options_state_path(state_path, options)
+        self.max_age_s = get_max_age_s() if max_age_s is None else max_age_s
+
+    def endpoint(self) -> str:
+        """Endpoint działającego serwera - startuje nowy, gdy brak aktualnego"""
+        with self._lock():
+            return self._endpoint()
+
+    def restart(self, failed_endpoint: str) -> str:
+        """
+        Wymienia serwer, z którym nie udało się połączyć. Inny worker albo
+        równoległe uruchomienie mogło go już wymienić - wtedy zwraca endpoint
+        nowego serwera i nie zatrzymuje go, bo inni właśnie z niego korzystają.
+        """
+        with self._lock():
+            state = self.read_state()
+            if state is not None and state["ws_endpoint"] == failed_endpoint:
+                get_logger(__name__).info("Serwer przeglądarki %s nie przyjął połączenia - uruchamiam nowy",
+                                          failed_endpoint)
+                _terminate(state["pid"])
+                _remove(self.state_path)
+            return self._endpoint()
+
+    def stop(self) -> bool:
+        """Zatrzymuje serwer z pliku stanu; False, gdy żadnego nie było"""
+        with self._lock():
+            state = self.read_state()
+            if state is None:
+                return False
+            _terminate(state["pid"])
+            _remove(self.state_path)
+            return True
+
+    def read_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.state_path, encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def stale_reason(self, state: Dict[str, Any]) -> Optional[str]:
+        """Dlaczego zapisany serwer nie nadaje się do użycia (None - nadaje się)"""
+        if time.time() - state.get("started_at", 0) > self.max_age_s:
+            return "serwer zbyt stary"
+        if not _is_running(state["pid"]):
+            return "proces nie działa"
+        if not _accepts_connections(state["ws_endpoint"]):
+            return "nie przyjmuje połączeń"
+        return None
+
+    def _endpoint(self) -> str:
+        state = self.read_state()
+        if state is not None:
+            reason = self.stale_reason(state)
+            if reason is None:
+                return state["ws_endpoint"]
+            get_logger(__name__).info("Serwer przeglądarki %s nieaktualny (%s) - uruchamiam nowy",
+                                      state["ws_endpoint"], reason)
+            _terminate(state["pid"])
+        return self._start()["ws_endpoint"]
+
+    def _lock(self) -> FileLock:
+        # Start i zatrzymanie serwera po jednym procesie naraz (workery xdist, kolejne uruchomienia)
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        return FileLock(f"{self.state_path}.lock", timeout=START_TIMEOUT_S * 2)
+
+    def _start(self) -> Dict[str, Any]:
+        base = os.path.splitext(self.state_path)[0]
+        config_path = f"{base}.config.json"
+        log_path = f"{base}.log"
+        with open(config_path, "w", encoding="utf-8") as handle:
+            json.dump(self.options, handle)
+        with open(log_path, "wb") as log:
+            # Osobna sesja procesów - serwer przeżywa zakończenie pytest
+            process = subprocess.Popen(
+                _driver_command() + ["launch-server", "--browser", "chromium", "--config", config_path],
+                stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                env=get_driver_env(), start_new_session=True,
+            )
+        deadline = time.monotonic() + START_TIMEOUT_S
+        while True:
+            endpoint = _endpoint_from_log(log_path)
+            if endpoint:
+                break
+            if process.poll() is not None or time.monotonic() > deadline:
+                _terminate(process.pid)
+                raise RuntimeError(f"Serwer przeglądarki nie wystartował:\n{_tail(log_path)}")
+            time.sleep(0.1)
+        state = {"ws_endpoint": endpoint, "pid": process.pid, "options": self.options, "started_at": time.time()}
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle, indent=2)
+        os.replace(tmp_path, self.state_path)
+        return state
+
+
+def options_state_path(base_path: str, options: Dict[str, Any]) -> str:
+    """Plik stanu serwera dla zestawu opcji: browser_server.json -> browser_server-<skrót>.json"""
+    digest = hashlib.sha1(json.dumps(options, sort_keys=True).encode("utf-8")).hexdigest()
+    root, ext = os.path.splitext(base_path)
+    return f"{root}-{digest[:10]}{ext}"
+
+
+def _driver_command() -> List[str]:
+    driver = compute_driver_executable()
+    # Nowsze wersje Playwright zwracają parę (node, cli.js)
+    return [str(part) for part in driver] if isinstance(driver, tuple) else [str(driver)]
+
+
+def _endpoint_from_log(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                if line.startswith("ws://"):
+                    return line.strip()
+    except OSError:
+        pass
+    return None
+
+
+def _tail(path: str, lines: int = 20) -> str:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            return "".join(handle.readlines()[-lines:])
+    except OSError:
+        return ""
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _accepts_connections(endpoint: str) -> bool:
+    parts = urlsplit(endpoint)
+    try:
+        with socket.create_connection((parts.hostname, parts.port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+def _terminate(pid: int) -> None:
+    """Zamyka serwer razem z przeglądarką (cała grupa procesów)"""
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except OSError:
+        pass
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serwer przeglądarki współdzielony przez uruchomienia pytest")
+    parser.add_argument("--state", default=DEFAULT_STATE_FILE, help="Plik stanu serwera (do nazwy dopisywany jest skrót opcji)")
+    parser.add_argument("--profile", default=None, help="Profil uruchomienia (domyślnie RUN_PROFILE albo fast)")
+    parser.add_argument("command", choices=("start", "stop", "status"))
+    args = parser.parse_args(argv)
+
+    server = BrowserServer(RunProfile.from_file(args.profile).server_options(), args.state)
+    if args.command == "start":
+        print(server.endpoint())
+    elif args.command == "stop":
+        print("Serwer zatrzymany" if server.stop() else "Brak uruchomionego serwera")
+    else:
+        state = server.read_state()
+        if state is None:
+            print("Brak uruchomionego serwera")
+            return
+        reason = server.stale_reason(state)
+        print(f"{state['ws_endpoint']}  pid {state['pid']}  " + (f"nieaktualny: {reason}" if reason else "działa"))
+
+
+if __name__ == "__main__":
+    main()
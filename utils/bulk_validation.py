@@ -0,0 +1,220 @@
+"""
+Masowa walidacja wyszukiwarki na korpusie zapytań.
+
+Zapytania są czytane strumieniowo z pliku JSONL/CSV (nawet miliony linii),
+sprawdzane tymi samymi regułami co w TestAPISearch, a wynik każdego
+zapytania jest od razu dopisywany do pliku JSONL. Po przerwaniu kolejne
+uruchomienie wznawia pracę od ostatniego punktu kontrolnego:
+
+    python -m utils.bulk_validation --corpus queries.jsonl --concurrency 16
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, Optional, Sequence, Set, Tuple
+
+import requests
+
+from utils.helpers import get_base_url
+from utils.http_session import PooledSession
+from utils.search_corpus import DEFAULT_SEARCH_CORPUS, CorpusQuery, iter_corpus
+from utils.search_validation import check_search_response
+
+DEFAULT_RESULTS_PATH = "reports/bulk_validation.jsonl"
+NEGATIVE_CLASS = "negative"
+
+
+class Checkpoint:
+    """
+    Punkt kontrolny: liczba początkowych linii korpusu, które są już
+    sprawdzone i zapisane. Zapytania kończą się w dowolnej kolejności,
+    więc znacznik przesuwa się dopiero, gdy zamknie się ciągły zakres.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.position = self._read()
+        self._done_ahead: Set[int] = set()
+
+    def _read(self) -> int:
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                return int(json.load(handle).get("position", 0))
+        except (OSError, ValueError, AttributeError):
+            return 0
+
+    def mark_done(self, index: int) -> None:
+        """Zaznacza linię jako gotową i przesuwa znacznik po ciągłym zakresie"""
+        self._done_ahead.add(index)
+        while self.position in self._done_ahead:
+            self._done_ahead.remove(self.position)
+            self.position += 1
+
+    def save(self) -> None:
+        """Zapisuje znacznik atomowo (os.replace)"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"position": self.position, "saved_at": time.time()}, handle)
+        os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class BulkSearchValidator:
+    """
+    Przepuszcza zapytania z korpusu przez pulę wątków o ograniczonej
+    współbieżności. W pamięci jest najwyżej `concurrency` zapytań w locie
+    (plus numery linii zakończonych przed znacznikiem punktu kontrolnego),
+    a odpowiedzi są porzucane zaraz po sprawdzeniu.
+
+    Reguły: zapytanie z expected_title (albo każde spoza klasy 'negative',
+    wtedy oczekiwaną frazą jest samo zapytanie) musi zwrócić film, którego
+    tytuł zawiera frazę; zapytanie 'negative' musi zwrócić pustą listę.
+    """
+
+    def __init__(self, base_url: str, results_path: str = DEFAULT_RESULTS_PATH, concurrency: int = 8,
+                 checkpoint_every: int = 100, timeout: float = 10,
+                 session: Optional[requests.Session] = None):
+        self.url = f"{base_url.rstrip('/')}/api/search"
+        self.results_path = results_path
+        self.checkpoint = Checkpoint(f"{results_path}.checkpoint")
+        self.concurrency = max(concurrency, 1)
+        self.checkpoint_every = max(checkpoint_every, 1)
+        self.timeout = timeout
+        self.session = session
+        self.summary: Dict[str, Dict[str, int]] = {}
+
+    def run(self, queries: Iterator[CorpusQuery], restart: bool = False) -> Dict[str, Dict[str, int]]:
+        """Sprawdza zapytania (od punktu kontrolnego) i zwraca podsumowanie per klasa"""
+        if restart:
+            self.checkpoint.remove()
+            self.checkpoint = Checkpoint(self.checkpoint.path)
+            _remove(self.results_path)
+        already_done = self._results_after_checkpoint()
+        directory = os.path.dirname(self.results_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        session = self.session or PooledSession(pool_maxsize=self.concurrency)
+        completed = 0
+        with open(self.results_path, "a", encoding="utf-8") as results, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bulk-validation") as executor:
+            in_flight: Set[Future] = set()
+            try:
+                for index, query in enumerate(queries):
+                    if index < self.checkpoint.position or index in already_done:
+                        self.checkpoint.mark_done(index)
+                        continue
+                    if len(in_flight) >= self.concurrency:
+                        completed += self._drain(wait(in_flight, return_when=FIRST_COMPLETED)[0],
+                                                 in_flight, results)
+                    in_flight.add(executor.submit(self._validate, session, index, query))
+                    if completed >= self.checkpoint_every:
+                        results.flush()
+                        self.checkpoint.save()
+                        completed = 0
+                while in_flight:
+                    self._drain(wait(in_flight, return_when=FIRST_COMPLETED)[0], in_flight, results)
+            finally:
+                # Przy przerwaniu (Ctrl+C) zapisujemy to, co już skończone
+                for future in in_flight:
+                    future.cancel()
+                results.flush()
+                self.checkpoint.save()
+                if self.session is None:
+                    session.close()
+        return self.summary
+
+    def _drain(self, done: Set[Future], in_flight: Set[Future], results: Any) -> int:
+        for future in done:
+            in_flight.discard(future)
+            index, outcome = future.result()
+            results.write(json.dumps(outcome, ensure_ascii=False) + "\n")
+            self.checkpoint.mark_done(index)
+            stats = self.summary.setdefault(outcome["class"], {"passed": 0, "failed": 0})
+            stats["passed" if outcome["ok"] else "failed"] += 1
+        return len(done)
+
+    def _validate(self, session: requests.Session, index: int,
+                  query: CorpusQuery) -> Tuple[int, Dict[str, Any]]:
+        expect_results = query.query_class != NEGATIVE_CLASS or bool(query.expected_title)
+        search_term = query.expected_title or query.query
+        started = time.perf_counter()
+        status: Optional[int] = None
+        try:
+            response = session.get(self.url, params={"q": query.query}, timeout=self.timeout,
+                                   headers={"Accept": "application/json"})
+            status = response.status_code
+            problems = check_search_response(response, search_term, expect_results)
+        except requests.exceptions.RequestException as e:
+            problems = [f"Błąd zapytania: {e}"]
+        return index, {
+            "line": index,
+            "query": query.query,
+            "class": query.query_class,
+            "status": status,
+            "ok": not problems,
+            "problems": problems,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def _results_after_checkpoint(self) -> Set[int]:
+        """
+        Linie zapisane do wyników za znacznikiem punktu kontrolnego - zakończone
+        tuż przed przerwaniem. Nie sprawdzamy ich drugi raz, żeby nie dublować wyników.
+        """
+        done: Set[int] = set()
+        try:
+            with open(self.results_path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        index = json.loads(line)["line"]
+                    except (ValueError, KeyError, TypeError):
+                        # Ucięta ostatnia linia po przerwaniu
+                        continue
+                    if index >= self.checkpoint.position:
+                        done.add(index)
+        except OSError:
+            pass
+        return done
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Masowa walidacja wyszukiwarki na korpusie zapytań")
+    parser.add_argument("--base-url", default=None, help="Adres strony (domyślnie VOD_BASE_URL)")
+    parser.add_argument("--corpus", default=DEFAULT_SEARCH_CORPUS, help="Korpus zapytań (JSONL albo CSV)")
+    parser.add_argument("--output", default=DEFAULT_RESULTS_PATH, help="Plik wyników JSONL")
+    parser.add_argument("--concurrency", type=int, default=8, help="Liczba zapytań w locie")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="Co ile zapytań zapisać punkt kontrolny")
+    parser.add_argument("--restart", action="store_true", help="Zacznij od początku zamiast wznawiać")
+    args = parser.parse_args(argv)
+
+    validator = BulkSearchValidator(args.base_url or get_base_url(), args.output,
+                                    concurrency=args.concurrency, checkpoint_every=args.checkpoint_every)
+    try:
+        summary = validator.run(iter_corpus(args.corpus), restart=args.restart)
+    except KeyboardInterrupt:
+        print(f"\nPrzerwano - wznowienie od linii {validator.checkpoint.position}")
+        raise SystemExit(130)
+    for query_class, stats in sorted(summary.items()):
+        print(f"{query_class}: {stats['passed']} poprawnych, {stats['failed']} błędnych")
+    print(f"Wyniki zapisane w {args.output}")
+    if any(stats["failed"] for stats in summary.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
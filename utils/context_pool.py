@@ -0,0 +1,202 @@
+from typing import Any, Dict, List, Optional, Set, Union
+from urllib.parse import urlparse
+
+from playwright.sync_api import Browser, BrowserContext, Page
+
+from utils.storage_state import load_storage_state
+
+
+class _RouteTracker:
+    """
+    Zapamiętuje wzorce URL przekazane do route/route_from_har danego obiektu
+    (kontekstu lub strony), żeby można je było zdjąć przy resecie.
+    Playwright 1.40 nie ma jeszcze unroute_all.
+    """
+
+    def __init__(self, target: Union[BrowserContext, Page]):
+        self.target = target
+        self.patterns: List[Any] = []
+        original_route = target.route
+        original_route_from_har = target.route_from_har
+
+        def route(url, handler, times=None):
+            self.patterns.append(url)
+            return original_route(url, handler, times=times)
+
+        def route_from_har(har, url=None, **kwargs):
+            if not kwargs.get("update"):
+                self.patterns.append(url or "**/*")
+            return original_route_from_har(har, url=url, **kwargs)
+
+        target.route = route
+        target.route_from_har = route_from_har
+
+    def reset(self) -> None:
+        """Zdejmuje wszystkie zarejestrowane trasy"""
+        for pattern in self.patterns:
+            self.target.unroute(pattern)
+        self.patterns.clear()
+
+
+class PooledContext:
+    """Kontekst z puli razem z rozgrzaną stroną, którą dostaje kolejny test"""
+
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.routes = _RouteTracker(context)
+        self.origins: Set[str] = set()
+        self.page: Optional[Page] = None
+        self.page_routes: Optional[_RouteTracker] = None
+        context.on("page", self._track_origins)
+        self.open_page()
+
+    def open_page(self) -> Page:
+        """Otwiera (lub ponownie otwiera) stronę przekazywaną testom"""
+        self.page = self.context.new_page()
+        self.page_routes = _RouteTracker(self.page)
+        return self.page
+
+    def _track_origins(self, page: Page) -> None:
+        # Originy odwiedzone w teście - ich storage czyścimy przy resecie
+        page.on("framenavigated", lambda frame: self.origins.add(_origin(frame.url)))
+
+
+class ContextPool:
+    """
+    Pula kontekstów przeglądarki wielokrotnego użytku.
+
+    Zamiast tworzyć i zamykać BrowserContext na każdy test, pula wydaje
+    rozgrzany kontekst (z otwartą stroną), a po teście czyści jego stan:
+    ciasteczka, localStorage/sessionStorage/IndexedDB/cache odwiedzonych
+    originów, uprawnienia, trasy (route) i dodatkowe strony. Kontekst,
+    którego nie udało się wyczyścić, jest zamykany.
+    
+    Jeśli w opcjach podano storage_state (rozgrzany snapshot), reset
+    przywraca jego ciasteczka i localStorage zamiast zostawiać pusty stan.
+    """
+
+    # Rodzaje danych czyszczone przez CDP Storage.clearDataForOrigin
+    STORAGE_TYPES = "local_storage,indexeddb,websql,cache_storage,service_workers,file_systems"
+
+    def __init__(self, browser: Browser, size: int = 1, **context_options: Any):
+        self.browser = browser
+        self.size = size
+        self.context_options: Dict[str, Any] = context_options
+        self.snapshot = self._load_snapshot(context_options.get("storage_state"))
+        self._idle: List[PooledContext] = []
+        self._leased: Dict[int, PooledContext] = {}
+        for _ in range(size):
+            self._idle.append(self._create())
+
+    def acquire(self) -> PooledContext:
+        """Wydaje kontekst z puli (lub tworzy nowy, gdy pula jest pusta)"""
+        pooled = self._idle.pop() if self._idle else self._create()
+        self._leased[id(pooled)] = pooled
+        return pooled
+
+    def release(self, pooled: PooledContext) -> None:
+        """Czyści stan kontekstu i zwraca go do puli"""
+        self._leased.pop(id(pooled), None)
+        if len(self._idle) >= self.size:
+            self._discard(pooled)
+            return
+        try:
+            self.reset(pooled)
+        except Exception:
+            # Kontekst w nieznanym stanie (np. przeglądarka padła) - nie oddajemy go
+            self._discard(pooled)
+            return
+        self._idle.append(pooled)
+
+    def reset(self, pooled: PooledContext) -> None:
+        """Przywraca kontekst do stanu "jak nowy" bez jego zamykania"""
+        context = pooled.context
+        for page in list(context.pages):
+            if page is not pooled.page:
+                page.close()
+
+        page = pooled.page
+        if page is None or page.is_closed():
+            page = pooled.open_page()
+        else:
+            pooled.page_routes.reset()
+            for frame in page.frames:
+                pooled.origins.add(_origin(frame.url))
+            try:
+                page.evaluate("() => { try { sessionStorage.clear(); } catch (error) {} }")
+            except Exception:
+                pass
+            page.goto("about:blank")
+
+        pooled.routes.reset()
+        context.clear_cookies()
+        context.clear_permissions()
+        if self.context_options.get("permissions"):
+            context.grant_permissions(self.context_options["permissions"])
+        context.set_extra_http_headers(self.context_options.get("extra_http_headers") or {})
+        context.set_offline(bool(self.context_options.get("offline")))
+        self._reset_storage(page, pooled.origins)
+        pooled.origins.clear()
+
+    def close(self) -> None:
+        """Zamyka wszystkie konteksty puli"""
+        for pooled in self._idle + list(self._leased.values()):
+            self._discard(pooled)
+        self._idle.clear()
+        self._leased.clear()
+
+    def _create(self) -> PooledContext:
+        return PooledContext(self.browser.new_context(**self.context_options))
+
+    def _reset_storage(self, page: Page, origins: Set[str]) -> None:
+        snapshot_origins = {entry["origin"]: entry.get("localStorage", [])
+                            for entry in self.snapshot.get("origins", [])}
+        origins = {origin for origin in origins if origin} | set(snapshot_origins)
+        if self.snapshot.get("cookies"):
+            # clear_cookies już było - wracamy do ciasteczek ze snapshotu
+            page.context.add_cookies(self.snapshot["cookies"])
+        if not origins:
+            return
+        if self.browser.browser_type.name != "chromium":
+            raise RuntimeError("Czyszczenie storage wymaga Chromium (CDP)")
+        session = page.context.new_cdp_session(page)
+        try:
+            for origin in origins:
+                session.send("Storage.clearDataForOrigin", {
+                    "origin": origin,
+                    "storageTypes": self.STORAGE_TYPES,
+                })
+            if snapshot_origins:
+                session.send("DOMStorage.enable")
+            for origin, items in snapshot_origins.items():
+                for item in items:
+                    session.send("DOMStorage.setDOMStorageItem", {
+                        "storageId": {"securityOrigin": origin, "isLocalStorage": True},
+                        "key": item["name"],
+                        "value": item["value"],
+                    })
+        finally:
+            session.detach()
+
+    @staticmethod
+    def _load_snapshot(storage_state: Any) -> Dict[str, Any]:
+        if isinstance(storage_state, dict):
+            return storage_state
+        if storage_state:
+            return load_storage_state(str(storage_state)) or {}
+        return {}
+
+    @staticmethod
+    def _discard(pooled: PooledContext) -> None:
+        try:
+            pooled.context.close()
+        except Exception:
+            pass
+
+
+def _origin(url: str) -> str:
+    """Origin (schemat + host) dla adresów http(s), pusty dla about:blank itp."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https"):
+        return ""
+    return f"{parsed.scheme}://{parsed.netloc}"
@@ -0,0 +1,145 @@
+"""
+Budżet czasu testu wspólny dla wszystkich oczekiwań.
+
+Każdy test dostaje Deadline (marker deadline(seconds), --test-deadline albo
+TEST_DEADLINE_S). Oczekiwania page objectów i zapytania HTTP przycinają
+swoje limity do pozostałego budżetu, a krok, po którym budżet jest
+wyczerpany, oblewa test od razu - z nazwą kroku i listą kroków, które
+zużyły najwięcej czasu.
+"""
+import contextlib
+import contextvars
+import os
+import time
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
+
+import pytest
+
+from utils.structured_logging import current_step
+
+# Domyślne limity akcji i nawigacji Playwright - oczekiwania bez jawnego
+# timeoutu nie czekają dłużej (profil uruchomienia ustawia je przez
+# set_action_timeout i set_navigation_timeout)
+PLAYWRIGHT_DEFAULT_TIMEOUT_MS = 30000
+_action_timeout_ms = PLAYWRIGHT_DEFAULT_TIMEOUT_MS
+_navigation_timeout_ms = PLAYWRIGHT_DEFAULT_TIMEOUT_MS
+
+RequestsTimeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+_current: "contextvars.ContextVar[Optional[Deadline]]" = contextvars.ContextVar("test_deadline", default=None)
+
+
+def get_deadline_budget() -> Optional[float]:
+    """Budżet testu w sekundach (zmienna TEST_DEADLINE_S, domyślnie 180; 0 wyłącza)"""
+    budget = float(os.getenv('TEST_DEADLINE_S', '180'))
+    return budget if budget > 0 else None
+
+
+class DeadlineExceeded(pytest.fail.Exception):
+    """
+    Budżet czasu testu wyczerpany. Dziedziczy po pytest.fail.Exception
+    (BaseException), żeby nie połknęły go bloki except Exception w page objectach.
+    """
+
+
+class Deadline:
+    """Budżet czasu jednego testu i czas zużyty przez kolejne kroki"""
+
+    def __init__(self, budget_s: float, clock: Callable[[], float] = time.monotonic):
+        self.budget_s = budget_s
+        self.clock = clock
+        self.expires_at = clock() + budget_s
+        self.steps: Dict[str, float] = {}
+
+    def remaining_s(self) -> float:
+        return self.expires_at - self.clock()
+
+    def check(self, step: Optional[str] = None) -> None:
+        """Oblewa test, jeśli budżet się skończył"""
+        if self.remaining_s() <= 0:
+            raise DeadlineExceeded(self.describe(step or current_step()))
+
+    def timeout_ms(self, requested_ms: Optional[float] = None) -> int:
+        """Limit oczekiwania Playwright (ms) przycięty do pozostałego budżetu"""
+        self.check()
+        requested_ms = _action_timeout_ms if requested_ms is None else requested_ms
+        # Co najmniej 1 ms - timeout 0 wyłącza limit w Playwright
+        return max(int(min(requested_ms, self.remaining_s() * 1000)), 1)
+
+    def timeout_s(self, requested: RequestsTimeout = None) -> RequestsTimeout:
+        """Timeout requests (także krotka connect, read) przycięty do pozostałego budżetu"""
+        self.check()
+        remaining = self.remaining_s()
+        if isinstance(requested, tuple):
+            return tuple(remaining if value is None else min(value, remaining) for value in requested)
+        return remaining if requested is None else min(requested, remaining)
+
+    def charge(self, step: str, duration_s: float) -> None:
+        """Zapisuje czas kroku i oblewa test, jeśli ten krok wyczerpał budżet"""
+        self.steps[step] = self.steps.get(step, 0.0) + duration_s
+        self.check(step)
+
+    def describe(self, step: Optional[str] = None) -> str:
+        slowest = sorted(self.steps.items(), key=lambda item: item[1], reverse=True)[:3]
+        message = f"Wyczerpany budżet czasu testu ({self.budget_s:g} s)"
+        if step:
+            message += f" w kroku {step}"
+        if slowest:
+            message += "; najdłuższe kroki: " + ", ".join(f"{name} {spent:.1f} s" for name, spent in slowest)
+        return message
+
+
+def set_action_timeout(timeout_ms: float) -> None:
+    """Domyślny limit akcji bez jawnego timeoutu (taki sam jak w kontekstach przeglądarki)"""
+    global _action_timeout_ms
+    _action_timeout_ms = timeout_ms
+
+
+def set_navigation_timeout(timeout_ms: float) -> None:
+    """Domyślny limit nawigacji (taki sam jak w kontekstach przeglądarki)"""
+    global _navigation_timeout_ms
+    _navigation_timeout_ms = timeout_ms
+
+
+@contextlib.contextmanager
+def bound_deadline(budget_s: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Ustawia budżet dla bieżącego testu (None - bez budżetu)"""
+    deadline = Deadline(budget_s) if budget_s else None
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def get_deadline() -> Optional[Deadline]:
+    """Budżet bieżącego testu (także w zadaniach asyncio utworzonych przez test)"""
+    return _current.get()
+
+
+def timeout_ms(requested_ms: Optional[float] = None) -> Optional[float]:
+    """Limit oczekiwania Playwright: bez budżetu bez zmian, z budżetem przycięty"""
+    deadline = _current.get()
+    return requested_ms if deadline is None else deadline.timeout_ms(requested_ms)
+
+
+def navigation_timeout_ms() -> Optional[float]:
+    """
+    Limit nawigacji (goto): bez budżetu None - obowiązuje domyślny limit
+    nawigacji kontekstu, z budżetem ten sam limit przycięty do budżetu
+    """
+    deadline = _current.get()
+    return None if deadline is None else deadline.timeout_ms(_navigation_timeout_ms)
+
+
+def timeout_s(requested: RequestsTimeout = None) -> RequestsTimeout:
+    """Timeout zapytania HTTP: bez budżetu bez zmian, z budżetem przycięty"""
+    deadline = _current.get()
+    return requested if deadline is None else deadline.timeout_s(requested)
+
+
+def charge_step(step: str, duration_s: float) -> None:
+    """Dolicza krok do budżetu bieżącego testu (bez budżetu nic nie robi)"""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.charge(step, duration_s)
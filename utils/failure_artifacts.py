@@ -0,0 +1,187 @@
+"""
+Artefakty testów, które nie przeszły: screenshot, snapshot DOM i trace
+Playwright.
+
+Trace nagrywany jest w kawałkach (tracing.start_chunk per test) - przy
+zaliczonym teście kawałek jest odrzucany bez zapisu, przy niezaliczonym
+zapisywany jako zip. Pliki zapisuje wątek w tle, który po każdym zapisie
+pilnuje limitu rozmiaru i wieku katalogu reports/screenshots.
+"""
+import os
+import queue
+import re
+import threading
+import time
+import weakref
+from typing import List, Optional, Tuple, Union
+
+from playwright.sync_api import BrowserContext, Error as PlaywrightError, Page
+
+from utils.helpers import get_screenshot_path
+from utils.structured_logging import get_logger
+
+DEFAULT_ARTIFACTS_DIR = "reports/screenshots"
+USER_PROPERTY = "failure_artifacts"
+# off - nic, basic - screenshot i DOM (zero kosztu dla zaliczonych testów),
+# trace - dodatkowo trace Playwright (snapshoty DOM przy każdej akcji)
+ARTIFACT_MODES = ("off", "basic", "trace")
+
+# Konteksty, w których tracing jest już uruchomiony (konteksty z puli żyją
+# przez wiele testów - tracing.start wolno wywołać tylko raz)
+_TRACING_CONTEXTS: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
+
+
+def get_artifacts_mode() -> str:
+    """Tryb artefaktów (zmienna FAILURE_ARTIFACTS, domyślnie trace)"""
+    return os.getenv('FAILURE_ARTIFACTS', 'trace')
+
+
+class Retention:
+    """
+    Limit katalogu artefaktów: pliki starsze niż max_age_s są usuwane,
+    a potem najstarsze pliki, dopóki łączny rozmiar przekracza max_bytes
+    """
+
+    def __init__(self, max_bytes: int, max_age_s: float):
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+
+    @classmethod
+    def from_env(cls) -> "Retention":
+        """Limity ze zmiennych ARTIFACTS_MAX_MB (domyślnie 500) i ARTIFACTS_MAX_AGE_DAYS (domyślnie 7)"""
+        return cls(int(float(os.getenv('ARTIFACTS_MAX_MB', '500')) * 1024 * 1024),
+                   float(os.getenv('ARTIFACTS_MAX_AGE_DAYS', '7')) * 86400)
+
+    def apply(self, directory: str) -> List[str]:
+        """Usuwa pliki ponad limity i zwraca ich ścieżki"""
+        files = []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return []
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue
+        files.sort()
+        now = time.time()
+        total = sum(size for _, size, _ in files)
+        removed = []
+        for mtime, size, path in files:
+            if now - mtime <= self.max_age_s and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Inny worker xdist mógł usunąć plik pierwszy
+                pass
+            total -= size
+            removed.append(path)
+        return removed
+
+
+class ArtifactWriter:
+    """Zapisuje artefakty w wątku w tle, żeby teardown testu nie czekał na dysk"""
+
+    def __init__(self, directory: str = DEFAULT_ARTIFACTS_DIR, retention: Optional[Retention] = None):
+        self.directory = directory
+        self.retention = retention or Retention.from_env()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+        # Porządki po poprzednich uruchomieniach
+        self._queue.put(("retention", None, None))
+
+    def write(self, path: str, data: Union[bytes, str]) -> None:
+        """Zleca zapis pliku (atomowo, przez plik tymczasowy)"""
+        self._queue.put(("write", path, data))
+
+    def enforce_retention(self) -> None:
+        """Zleca sprawdzenie limitów (np. po zapisie trace przez Playwright)"""
+        self._queue.put(("retention", None, None))
+
+    def close(self) -> None:
+        """Czeka na zapis wszystkich zleconych plików"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            kind, path, data = task
+            if kind == "write":
+                try:
+                    self._write(path, data)
+                except OSError as e:
+                    get_logger(__name__).warning("Nie udało się zapisać %s: %s", path, e)
+            # Limity sprawdzane dopiero, gdy kolejka opustoszeje
+            if self._queue.empty():
+                self.retention.apply(self.directory)
+
+    @staticmethod
+    def _write(path: str, data: Union[bytes, str]) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if isinstance(data, str):
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                handle.write(data)
+        else:
+            with open(tmp_path, "wb") as handle:
+                handle.write(data)
+        os.replace(tmp_path, path)
+
+
+def artifact_base_path(nodeid: str) -> str:
+    """Ścieżka artefaktów testu bez rozszerzenia (nazwa z nodeid i znacznik czasu)"""
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid.split("/")[-1]).strip("_")[:120]
+    return os.path.splitext(get_screenshot_path(name))[0]
+
+
+def start_trace_chunk(context: BrowserContext, title: str) -> None:
+    """Zaczyna kawałek trace dla testu (tracing kontekstu uruchamiany raz)"""
+    if context not in _TRACING_CONTEXTS:
+        # Bez screencastu - ostatni widok strony daje screenshot przy porażce
+        context.tracing.start(screenshots=False, snapshots=True, sources=False)
+        _TRACING_CONTEXTS.add(context)
+    context.tracing.start_chunk(title=title)
+
+
+def stop_trace_chunk(context: BrowserContext, path: Optional[str]) -> Optional[str]:
+    """Kończy kawałek trace: zapisuje go do path albo (path=None) odrzuca"""
+    try:
+        context.tracing.stop_chunk(path=path)
+    except PlaywrightError:
+        # Kontekst zamknięty w trakcie testu
+        _TRACING_CONTEXTS.discard(context)
+        return None
+    return path
+
+
+def capture_page(page: Page, base_path: str, writer: ArtifactWriter) -> Tuple[List[str], Optional[bytes]]:
+    """
+    Zbiera screenshot i DOM strony (w wątku testu - API Playwright nie jest
+    wątkowo bezpieczne) i zleca ich zapis do wątku w tle. Zwraca ścieżki
+    i sam screenshot (do osadzenia w raporcie HTML).
+    """
+    paths = []
+    screenshot = None
+    try:
+        screenshot = page.screenshot(full_page=True)
+        writer.write(f"{base_path}.png", screenshot)
+        paths.append(f"{base_path}.png")
+    except PlaywrightError:
+        pass
+    try:
+        writer.write(f"{base_path}.html", page.content())
+        paths.append(f"{base_path}.html")
+    except PlaywrightError:
+        pass
+    return paths, screenshot
+
@@ -0,0 +1,131 @@
+import base64
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from playwright.sync_api import APIResponse, BrowserContext, Request, Route
+
+DEFAULT_HAR_DIR = "tests/hars"
+
+
+def har_path_for(nodeid: str, har_dir: str = DEFAULT_HAR_DIR) -> str:
+    """Ścieżka archiwum HAR dla testu (nodeid zamieniony na bezpieczną nazwę pliku)"""
+    name = nodeid.split("/")[-1].replace("::", "__")
+    name = re.sub(r"[^A-Za-z0-9_.\[\]-]+", "_", name)
+    return os.path.join(har_dir, f"{name}.har")
+
+
+class HarReplayer:
+    """
+    Odtwarza ruch sieciowy testu z archiwum HAR przez routing Playwright.
+
+    Żądanie, którego nie ma w archiwum, jest zapisywane jako "miss" i -
+    w trybie ścisłym - przerywane, a test kończy się błędem z listą
+    brakujących URL. Z update_on_miss brakujące żądania idą do sieci,
+    a odpowiedzi są dopisywane do archiwum po zakończeniu testu.
+    """
+
+    def __init__(self, har_path: str, update_on_miss: bool = False):
+        self.har_path = har_path
+        self.update_on_miss = update_on_miss
+        self.misses: List[str] = []
+        self._new_entries: List[Dict[str, Any]] = []
+
+    def attach(self, context: BrowserContext) -> None:
+        """Rejestruje odtwarzanie na kontekście"""
+        # Trasy są sprawdzane od ostatnio dodanej: najpierw HAR, a gdy nie ma
+        # w nim żądania (not_found="fallback") - obsługa braków
+        context.route("**/*", self._handle_miss)
+        if os.path.exists(self.har_path):
+            context.route_from_har(self.har_path, not_found="fallback")
+
+    def _handle_miss(self, route: Route) -> None:
+        request = route.request
+        self.misses.append(f"{request.method} {request.url}")
+        if not self.update_on_miss:
+            route.abort("internetdisconnected")
+            return
+        response = route.fetch()
+        self._new_entries.append(_har_entry(request, response))
+        route.fulfill(response=response)
+
+    def finalize(self) -> None:
+        """Dopisuje do archiwum odpowiedzi pobrane przy update_on_miss"""
+        if not self._new_entries:
+            return
+        har = _read_har(self.har_path)
+        har["log"]["entries"].extend(self._new_entries)
+        directory = os.path.dirname(self.har_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.har_path, "w", encoding="utf-8") as handle:
+            json.dump(har, handle, indent=2)
+        self._new_entries.clear()
+
+    def miss_report(self, limit: int = 20) -> str:
+        """Czytelny opis żądań, których zabrakło w archiwum"""
+        lines = [f"Brak {len(self.misses)} żądań w {self.har_path} (nagraj ponownie: --record "
+                 f"albo uzupełnij: --replay --update-on-miss):"]
+        lines.extend(f"  {miss}" for miss in self.misses[:limit])
+        if len(self.misses) > limit:
+            lines.append(f"  ... i {len(self.misses) - limit} więcej")
+        return "\n".join(lines)
+
+
+def _read_har(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {"log": {"version": "1.2", "creator": {"name": "vod-film-tests", "version": "1.0"},
+                        "pages": [], "entries": []}}
+
+
+def _headers(headers: Dict[str, str]) -> List[Dict[str, str]]:
+    return [{"name": name, "value": value} for name, value in headers.items()]
+
+
+def _har_entry(request: Request, response: APIResponse) -> Dict[str, Any]:
+    """Wpis HAR 1.2 z treścią osadzoną w base64"""
+    body = response.body()
+    post_data: Optional[str] = request.post_data
+    entry_request: Dict[str, Any] = {
+        "method": request.method,
+        "url": request.url,
+        "httpVersion": "HTTP/1.1",
+        "cookies": [],
+        "headers": _headers(request.headers),
+        "queryString": [],
+        "headersSize": -1,
+        "bodySize": len(post_data or ""),
+    }
+    if post_data is not None:
+        entry_request["postData"] = {
+            "mimeType": request.headers.get("content-type", ""),
+            "text": post_data,
+        }
+    return {
+        "startedDateTime": datetime.now(timezone.utc).isoformat(),
+        "time": 0,
+        "request": entry_request,
+        "response": {
+            "status": response.status,
+            "statusText": response.status_text,
+            "httpVersion": "HTTP/1.1",
+            "cookies": [],
+            "headers": _headers(response.headers),
+            "content": {
+                "size": len(body),
+                "mimeType": response.headers.get("content-type", ""),
+                "text": base64.b64encode(body).decode("ascii"),
+                "encoding": "base64",
+            },
+            "redirectURL": response.headers.get("location", ""),
+            "headersSize": -1,
+            "bodySize": len(body),
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": 0, "receive": 0},
+    }
@@ -1,32 +1,21 @@
 import logging
+import math
 import os
 from datetime import datetime
+from typing import Sequence
+from urllib.parse import urlparse
+
+from utils.structured_logging import configure_logging, get_logger
 
 
 def setup_logger(name: str, log_file: str = None) -> logging.Logger:
     """
-    Konfiguruje logger dla testów
+    Zwraca logger testów (utils.structured_logging) - handlery konfigurowane
+    są raz na proces, więc kolejne wywołania nie dublują linii logu.
+    log_file dodaje plik JSON lines (każdy plik tylko raz).
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # Format logów
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    # Handler konsoli
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # Handler pliku (opcjonalny)
-    if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
-    return logger
+    configure_logging(log_file)
+    return get_logger(name)
 
 
 def get_screenshot_path(test_name: str) -> str:
@@ -47,4 +36,37 @@ def is_headless_mode() -> bool:
     """
     Sprawdza czy testy mają być uruchomione w trybie headless
     """
-    return os.getenv('HEADLESS', 'false').lower() == 'true'
\ No newline at end of file
+    return os.getenv('HEADLESS', 'false').lower() == 'true'
+
+DEFAULT_BASE_URL = "https://vod.film"
+
+
+def get_base_url() -> str:
+    """
+    Zwraca adres testowanej strony (zmienna VOD_BASE_URL, domyślnie https://vod.film)
+    """
+    return os.getenv('VOD_BASE_URL', DEFAULT_BASE_URL).rstrip('/')
+
+
+def page_type_for_url(url: str) -> str:
+    """
+    Określa typ strony VOD.Film na podstawie URL (home, movies, movie, search...)
+    """
+    path = urlparse(url).path.rstrip('/')
+    if not path:
+        return "home"
+    if path.startswith('/film/'):
+        return "movie"
+    if path == '/filmy' or path.startswith('/filmy/'):
+        return "movies"
+    return path.lstrip('/').split('/')[0] or "home"
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """
+    Percentyl metodą najbliższej rangi (wartości muszą być posortowane)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
@@ -0,0 +1,186 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.poolmanager import PoolManager
+from urllib3.util.retry import Retry
+
+from utils.deadline import get_deadline
+
+USER_PROPERTY = "http_connections"
+
+# Statusy, przy których ponawiamy zapytanie (throttling i błędy serwera)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+}
+
+
+class RetryPolicy:
+    """
+    Polityka ponawiania zapytań API. Wartości domyślne pochodzą ze zmiennych
+    API_RETRIES (3), API_BACKOFF_FACTOR (0.5 s) i API_MAX_RETRY_AFTER (30 s).
+    """
+
+    def __init__(self, retries: Optional[int] = None, backoff_factor: Optional[float] = None,
+                 max_retry_after: Optional[float] = None):
+        self.retries = int(os.getenv('API_RETRIES', '3')) if retries is None else retries
+        self.backoff_factor = (float(os.getenv('API_BACKOFF_FACTOR', '0.5'))
+                               if backoff_factor is None else backoff_factor)
+        self.max_retry_after = (float(os.getenv('API_MAX_RETRY_AFTER', '30'))
+                                if max_retry_after is None else max_retry_after)
+
+    def build(self) -> Retry:
+        """Obiekt Retry dla urllib3"""
+        return _CappedRetry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+            respect_retry_after_header=True,
+            # Po wyczerpaniu prób zwracamy ostatnią odpowiedź - test sam oceni status
+            raise_on_status=False,
+            max_retry_after=self.max_retry_after,
+        )
+
+
+class _CappedRetry(Retry):
+    """Retry, który honoruje Retry-After, ale nie czeka dłużej niż max_retry_after"""
+
+    def __init__(self, *args: Any, max_retry_after: float = 30, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kwargs: Any) -> "_CappedRetry":
+        retry = super().new(**kwargs)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self.max_retry_after)
+
+
+class _CountingPoolManager(PoolManager):
+    """PoolManager, który pamięta utworzone pule, żeby policzyć połączenia"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.created_pools: List[HTTPConnectionPool] = []
+
+    def _new_pool(self, *args: Any, **kwargs: Any) -> HTTPConnectionPool:
+        pool = super()._new_pool(*args, **kwargs)
+        self.created_pools.append(pool)
+        return pool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter z pulą połączeń keep-alive i licznikiem połączeń:
+    ile zapytań poszło nowym połączeniem (TCP+TLS), a ile użyło istniejącego.
+    """
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool = False,
+                         **pool_kwargs: Any) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _CountingPoolManager(num_pools=connections, maxsize=maxsize,
+                                                block=block, **pool_kwargs)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Liczba zapytań (z ponowieniami), otwartych i ponownie użytych połączeń"""
+        pools = self.poolmanager.created_pools
+        requests_sent = sum(pool.num_requests for pool in pools)
+        opened = sum(pool.num_connections for pool in pools)
+        return {
+            "requests": requests_sent,
+            "connections_opened": opened,
+            "connections_reused": max(requests_sent - opened, 0),
+        }
+
+
+class PooledSession(requests.Session):
+    """
+    Sesja HTTP dla testów API: połączenia keep-alive z puli (bez nowego
+    uzgadniania TLS przy każdym zapytaniu) i ponawianie 429/5xx z backoffem
+    zgodnie z nagłówkiem Retry-After.
+    """
+
+    def __init__(self, retry_policy: Optional[RetryPolicy] = None, pool_maxsize: int = 10):
+        super().__init__()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.adapter = PooledHTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize,
+                                         max_retries=self.retry_policy.build())
+        self.mount("http://", self.adapter)
+        self.mount("https://", self.adapter)
+        self.headers.update(DEFAULT_HEADERS)
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        """
+        Zapytanie w ramach budżetu czasu testu: timeout przycięty do
+        pozostałego budżetu, a zapytanie, po którym budżet jest wyczerpany,
+        oblewa test
+        """
+        deadline = get_deadline()
+        if deadline is None:
+            return super().request(method, url, *args, **kwargs)
+        kwargs["timeout"] = deadline.timeout_s(kwargs.get("timeout"))
+        started = time.perf_counter()
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            deadline.charge(f"HTTP {method.upper()} {urlsplit(url).path or '/'}", time.perf_counter() - started)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Statystyki połączeń sesji"""
+        return self.adapter.connection_stats()
+
+
+def stats_delta(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    """Różnica statystyk - ile zapytań i połączeń przypada na jeden test"""
+    return {key: after[key] - before.get(key, 0) for key in after}
+
+
+class ConnectionReport:
+    """
+    Zbiera statystyki połączeń HTTP z testów (także z workerów xdist,
+    przez user_properties raportów) i pokazuje podsumowanie w terminalu.
+    """
+
+    def __init__(self) -> None:
+        self.tests: Dict[str, Dict[str, int]] = {}
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.tests[report.nodeid] = value
+
+    def totals(self) -> Dict[str, int]:
+        """Sumy dla całej sesji"""
+        totals = {"requests": 0, "connections_opened": 0, "connections_reused": 0}
+        for stats in self.tests.values():
+            for key in totals:
+                totals[key] += stats.get(key, 0)
+        return totals
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.tests:
+            return
+        totals = self.totals()
+        terminalreporter.write_sep("-", "http connections")
+        terminalreporter.write_line(
+            f"{totals['requests']} zapytań API w {len(self.tests)} testach: "
+            f"{totals['connections_opened']} nowych połączeń, "
+            f"{totals['connections_reused']} ponownie użytych"
+        )
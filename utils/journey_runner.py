@@ -0,0 +1,153 @@
+"""
+Równoległe ścieżki użytkownika na wielu stronach jednego kontekstu.
+
+Ścieżki działają w jednej pętli zdarzeń na asynchronicznych page objectach
+(AsyncHomePage, AsyncMoviePage - te same metody i selektory co HomePage
+i MoviePage). Czas ścieżki to głównie czekanie na sieć, więc dziesięć
+ścieżek na dziesięciu stronach trwa mniej więcej tyle, co jedna.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urljoin
+
+from playwright.async_api import BrowserContext, Page
+
+from pages import AsyncHomePage, AsyncMoviePage
+from utils.step_timing import step_log
+
+Journey = Callable[[Page], Awaitable[Dict[str, Any]]]
+
+
+class JourneyResult:
+    """Wynik jednej ścieżki: dane zebrane przez ścieżkę, błąd, czas i czasy kroków"""
+
+    __slots__ = ("name", "data", "error", "duration_s", "steps")
+
+    def __init__(self, name: str, data: Dict[str, Any], error: Optional[str], duration_s: float,
+                 steps: Dict[str, Dict[str, Any]]):
+        self.name = name
+        self.data = data
+        self.error = error
+        self.duration_s = duration_s
+        self.steps = steps
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "ok": self.ok, "error": self.error, "duration_s": self.duration_s,
+                "data": self.data, "steps": self.steps}
+
+    def __repr__(self) -> str:
+        return f"JourneyResult({self.name!r}, ok={self.ok}, duration_s={self.duration_s})"
+
+
+class JourneyRunner:
+    """
+    Uruchamia ścieżki na najwyżej `pages` stronach jednego kontekstu.
+    Strony są otwierane w miarę potrzeby i używane ponownie przez kolejne
+    ścieżki. Zostają otwarte do zamknięcia kontekstu - fixture async_context
+    zbiera z nich czasy kroków i metryki nawigacji do raportu testu.
+    """
+
+    def __init__(self, context: BrowserContext, base_url: str, pages: int = 10):
+        self.context = context
+        self.base_url = base_url.rstrip('/')
+        self.max_pages = max(pages, 1)
+        self.pages: List[Page] = []
+        self._opening = 0
+        self._idle: "asyncio.Queue[Page]" = asyncio.Queue()
+
+    async def run(self, journeys: Dict[str, Journey]) -> List[JourneyResult]:
+        """Uruchamia ścieżki równolegle; wyniki w kolejności ścieżek"""
+        return list(await asyncio.gather(*(self._run_one(name, journey) for name, journey in journeys.items())))
+
+    async def search(self, terms: Sequence[str]) -> List[JourneyResult]:
+        """Ścieżka wyszukiwanie -> pierwszy wynik -> strona filmu dla każdej frazy"""
+        return await self.run({term: self.search_journey(term) for term in terms})
+
+    async def open_all_results(self, term: str) -> List[JourneyResult]:
+        """
+        Wyszukuje frazę, a potem otwiera wszystkie wyniki naraz i sprawdza
+        na każdej stronie filmu nagłówek H1 i odtwarzacz
+        """
+        [search] = await self.run({term: self.results_journey(term)})
+        if not search.ok:
+            return [search]
+        hrefs = [href for href in search.data["results"] if href]
+        return [search] + await self.run({href: self.movie_journey(href) for href in hrefs})
+
+    def search_journey(self, term: str) -> Journey:
+        async def journey(page: Page) -> Dict[str, Any]:
+            home_page = AsyncHomePage(page, self.base_url)
+            await home_page.open_homepage()
+            await home_page.click_search_icon()
+            await home_page.search_for_movie(term)
+            results = await home_page.get_search_results()
+            data: Dict[str, Any] = {"results": len(results)}
+            if results:
+                data["movie_url"] = await home_page.click_first_movie_result()
+                data.update(await _check_movie_page(AsyncMoviePage(page)))
+            return data
+
+        return journey
+
+    def results_journey(self, term: str) -> Journey:
+        async def journey(page: Page) -> Dict[str, Any]:
+            home_page = AsyncHomePage(page, self.base_url)
+            await home_page.open_homepage()
+            await home_page.click_search_icon()
+            await home_page.search_for_movie(term)
+            return {"results": [card.href for card in await home_page.get_search_results()]}
+
+        return journey
+
+    def movie_journey(self, href: str) -> Journey:
+        async def journey(page: Page) -> Dict[str, Any]:
+            movie_page = AsyncMoviePage(page)
+            await movie_page.navigate_to(urljoin(f"{self.base_url}/", href))
+            return await _check_movie_page(movie_page)
+
+        return journey
+
+    async def _run_one(self, name: str, journey: Journey) -> JourneyResult:
+        page = await self._acquire()
+        # Kroki wcześniejszych ścieżek na tej stronie liczone są osobno
+        earlier_steps = step_log.pop(page)
+        started = time.perf_counter()
+        data: Dict[str, Any] = {}
+        error = None
+        try:
+            data = await journey(page)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        duration = round(time.perf_counter() - started, 3)
+        steps = step_log.pop(page)
+        # Test dostaje sumę kroków wszystkich ścieżek na stronie
+        step_log.merge(page, earlier_steps)
+        step_log.merge(page, steps)
+        self._idle.put_nowait(page)
+        return JourneyResult(name, data, error, duration, steps)
+
+    async def _acquire(self) -> Page:
+        if self._idle.empty() and len(self.pages) + self._opening < self.max_pages:
+            # Licznik zwiększany przed await - równoległe ścieżki nie przekroczą limitu
+            self._opening += 1
+            try:
+                page = await self.context.new_page()
+            finally:
+                self._opening -= 1
+            self.pages.append(page)
+            return page
+        return await self._idle.get()
+
+
+async def _check_movie_page(movie_page: AsyncMoviePage) -> Dict[str, Any]:
+    loaded = await movie_page.wait_for_movie_page()
+    return {
+        "loaded": loaded,
+        "title": await movie_page.get_movie_title(),
+        "player_visible": await movie_page.is_video_player_visible(),
+    }
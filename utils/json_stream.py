@@ -0,0 +1,92 @@
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator
+
+
+class _JsonStream:
+    """Bufor tekstu JSON dociągany kawałkami ze strumienia bajtów"""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Dociąga kolejny kawałek, porzucając już przetworzony początek bufora"""
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.buffer += self._utf8.decode(chunk)
+                return True
+        self.buffer += self._utf8.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Pierwszy znak po białych znakach (dociąga dane w razie potrzeby)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Nieoczekiwany koniec JSON")
+
+    def expect(self, *chars: str) -> str:
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Niepoprawny JSON: oczekiwano {' lub '.join(chars)}, jest {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Dekoduje jedną kompletną wartość JSON"""
+        while True:
+            self.peek()
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # Liczba na końcu bufora może być ucięta ("12" z "123")
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], array_key: str, fields: Dict[str, Any]) -> Iterator[Any]:
+    """
+    Parsuje obiekt JSON przyrostowo i zwraca kolejno elementy tablicy
+    pod kluczem array_key, nie trzymając w pamięci całej odpowiedzi.
+    Pozostałe pola najwyższego poziomu (np. total, page) trafiają do fields.
+    """
+    stream = _JsonStream(chunks)
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.pos += 1
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key == array_key and stream.peek() == "[":
+            stream.pos += 1
+            if stream.peek() == "]":
+                stream.pos += 1
+            else:
+                while True:
+                    yield stream.value()
+                    if stream.expect(",", "]") == "]":
+                        break
+        else:
+            fields[key] = stream.value()
+        if stream.expect(",", "}") == "}":
+            return
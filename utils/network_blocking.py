@@ -0,0 +1,193 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import pytest
+from playwright.async_api import BrowserContext as AsyncBrowserContext, Route as AsyncRoute
+from playwright.sync_api import BrowserContext, Route
+
+DEFAULT_BLOCKING_CONFIG = "config/network_blocking.json"
+USER_PROPERTY = "network_blocking"
+# Powód przerwania zablokowanych żądań i błąd, który Chromium zgłasza
+# potem w request.failure (odróżnia blokadę od prawdziwych awarii sieci)
+BLOCK_ABORT_REASON = "blockedbyclient"
+BLOCKED_FAILURE = "net::ERR_BLOCKED_BY_CLIENT"
+
+
+class BlockingProfile:
+    """
+    Profil blokowania zasobów: typy zasobów Playwright (image, font, media...)
+    oraz nazwane grupy domen (ads, analytics...) blokowane razem z subdomenami.
+    """
+
+    def __init__(self, resource_types: Iterable[str], domain_groups: Dict[str, List[str]],
+                 estimated_bytes: Optional[Dict[str, int]] = None):
+        self.resource_types = set(resource_types)
+        self.domain_groups = {name: list(domains) for name, domains in domain_groups.items()}
+        self.estimated_bytes = estimated_bytes or {}
+        self._domains = {
+            domain.lower(): group
+            for group, domains in self.domain_groups.items()
+            for domain in domains
+        }
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_BLOCKING_CONFIG) -> "BlockingProfile":
+        """Wczytuje profil z pliku JSON (domyślnie config/network_blocking.json)"""
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(data.get("resource_types", []), data.get("domain_groups", {}),
+                   data.get("estimated_bytes", {}))
+
+    def without(self, names: Iterable[str]) -> "BlockingProfile":
+        """Kopia profilu bez podanych typów zasobów lub grup domen"""
+        names = set(names)
+        return BlockingProfile(
+            self.resource_types - names,
+            {group: domains for group, domains in self.domain_groups.items() if group not in names},
+            self.estimated_bytes,
+        )
+
+    def is_empty(self) -> bool:
+        """Profil, który niczego nie blokuje"""
+        return not self.resource_types and not self._domains
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Zwraca powód blokady ('domain:ads', 'type:image') lub None"""
+        host = (urlparse(url).hostname or "").lower()
+        parts = host.split(".")
+        for index in range(len(parts) - 1):
+            group = self._domains.get(".".join(parts[index:]))
+            if group is not None:
+                return f"domain:{group}"
+        if resource_type in self.resource_types:
+            return f"type:{resource_type}"
+        return None
+
+    def estimate_bytes(self, resource_type: str) -> int:
+        """Szacowany rozmiar zablokowanego zasobu danego typu"""
+        return self.estimated_bytes.get(resource_type, self.estimated_bytes.get("other", 0))
+
+
+class NetworkBlocker:
+    """
+    Blokuje żądania kontekstu zgodnie z profilem i liczy, ile zaoszczędzono.
+
+    Niezablokowane żądania przechodzą przez route.fallback(), więc blokada
+    składa się z innymi trasami (np. odtwarzaniem HAR). Zablokowane żądania
+    nie mają odpowiedzi, więc oszczędzone bajty są szacowane per typ zasobu.
+    """
+
+    def __init__(self, profile: BlockingProfile):
+        self.profile = profile
+        self.blocked_requests = 0
+        self.estimated_bytes = 0
+        self.by_reason: Dict[str, int] = {}
+
+    def attach(self, context: BrowserContext) -> None:
+        """Rejestruje blokadę na wszystkie żądania kontekstu"""
+        context.route("**/*", self._handle)
+
+    async def attach_async(self, context: AsyncBrowserContext) -> None:
+        """attach dla kontekstu z asynchronicznego API Playwright"""
+        await context.route("**/*", self._handle_async)
+
+    def _handle(self, route: Route) -> None:
+        if self._should_block(route.request):
+            route.abort(BLOCK_ABORT_REASON)
+        else:
+            route.fallback()
+
+    async def _handle_async(self, route: AsyncRoute) -> None:
+        if self._should_block(route.request):
+            await route.abort(BLOCK_ABORT_REASON)
+        else:
+            await route.fallback()
+
+    def _should_block(self, request: Any) -> bool:
+        """Sprawdza żądanie i liczy zablokowane"""
+        reason = self.profile.block_reason(request.url, request.resource_type)
+        if reason is None:
+            return False
+        self.blocked_requests += 1
+        self.estimated_bytes += self.profile.estimate_bytes(request.resource_type)
+        self.by_reason[reason] = self.by_reason.get(reason, 0) + 1
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        """Statystyki blokady do raportu"""
+        return {
+            "blocked_requests": self.blocked_requests,
+            "estimated_bytes_saved": self.estimated_bytes,
+            "by_reason": dict(sorted(self.by_reason.items())),
+        }
+
+
+def profile_for_test(profile: Optional[BlockingProfile], item: pytest.Item) -> Optional[BlockingProfile]:
+    """
+    Profil dla konkretnego testu z uwzględnieniem markerów:
+    @pytest.mark.no_blocking wyłącza blokadę, a
+    @pytest.mark.allow_resources("ads", "image") zdejmuje wybrane grupy/typy.
+    """
+    if profile is None or item.get_closest_marker("no_blocking"):
+        return None
+    allowed = [name for marker in item.iter_markers("allow_resources") for name in marker.args]
+    if allowed:
+        profile = profile.without(allowed)
+    return None if profile.is_empty() else profile
+
+
+class BlockingReport:
+    """
+    Zbiera statystyki blokady ze wszystkich testów (także z workerów xdist,
+    przez user_properties raportów) i zapisuje podsumowanie do JSON.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tests: Dict[str, Dict[str, Any]] = {}
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.tests[report.nodeid] = value
+
+    def totals(self) -> Dict[str, Any]:
+        """Sumy dla całej sesji"""
+        by_reason: Dict[str, int] = {}
+        for stats in self.tests.values():
+            for reason, count in stats["by_reason"].items():
+                by_reason[reason] = by_reason.get(reason, 0) + count
+        return {
+            "tests": len(self.tests),
+            "blocked_requests": sum(stats["blocked_requests"] for stats in self.tests.values()),
+            "estimated_bytes_saved": sum(stats["estimated_bytes_saved"] for stats in self.tests.values()),
+            "by_reason": dict(sorted(by_reason.items())),
+        }
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.tests:
+            return
+        totals = self.totals()
+        terminalreporter.write_sep("-", "network blocking")
+        terminalreporter.write_line(
+            f"Zablokowano {totals['blocked_requests']} żądań "
+            f"(~{totals['estimated_bytes_saved'] / 1024 / 1024:.1f} MB) w {totals['tests']} testach"
+        )
+        for reason, count in totals["by_reason"].items():
+            terminalreporter.write_line(f"  {reason}: {count}")
+
+    @pytest.hookimpl
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if not self.tests:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump({"totals": self.totals(), "tests": self.tests}, handle, indent=2)
@@ -0,0 +1,299 @@
+"""
+Waterfall sieci i waga strony dla każdego testu (opcja --network-waterfall).
+
+NetworkRecorder zapisuje każde żądanie kontekstu: URL, typ zasobu, status,
+bajty przesłane siecią, czasy (start, TTFB, koniec), czy to domena testowanej
+strony, czy zewnętrzna, i czy odpowiedź przyszła z cache. Test dostaje
+waterfall i sumy w raporcie HTML (żądania zablokowane przez NetworkBlocker
+są oznaczone i liczone osobno, nie jako nieudane), a WaterfallReport zapisuje je do
+reports/network_waterfall.json i dopisuje wagę stron do
+reports/page_weight.jsonl (jedna linia na uruchomienie - zmiany w czasie).
+"""
+import html
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import pytest
+from playwright.async_api import BrowserContext as AsyncBrowserContext, Request as AsyncRequest
+from playwright.sync_api import BrowserContext, Error as PlaywrightError, Request
+
+from utils.network_blocking import BLOCKED_FAILURE
+from utils.timing_store import get_commit
+
+USER_PROPERTY = "network_waterfall"
+DEFAULT_WATERFALL_REPORT = "reports/network_waterfall.json"
+DEFAULT_PAGE_WEIGHT_HISTORY = "reports/page_weight.jsonl"
+# Ile najwolniejszych hostów pokazywać w podsumowaniach
+SLOWEST_HOSTS = 5
+# Raport HTML pokazuje najwyżej tyle wierszy waterfallu (JSON ma wszystkie)
+MAX_HTML_ROWS = 300
+
+
+def is_waterfall_enabled() -> bool:
+    """Nagrywanie waterfallu (zmienna NETWORK_WATERFALL, domyślnie wyłączone)"""
+    return os.getenv('NETWORK_WATERFALL', 'false').lower() == 'true'
+
+
+class NetworkRecorder:
+    """
+    Nagrywa żądania kontekstu na czas jednego testu. Rozmiary pobierane są
+    przy zakończeniu żądania - request.sizes to jedno wywołanie do
+    przeglądarki na każde żądanie z odpowiedzią - więc po teście wystarczy
+    finalize.
+    """
+
+    def __init__(self, base_url: str):
+        self.site = _site(urlparse(base_url).hostname or "")
+        self.entries: List[Dict[str, Any]] = []
+        self._responses: Dict[Any, Any] = {}
+        self._handlers: Dict[str, Any] = {}
+
+    def attach(self, context: BrowserContext) -> None:
+        """Rejestruje nasłuch zdarzeń sieci kontekstu"""
+        self._listen(context, {"response": self._on_response, "requestfinished": self._on_finished,
+                               "requestfailed": self._on_failed})
+
+    def attach_async(self, context: AsyncBrowserContext) -> None:
+        """attach dla kontekstu z asynchronicznego API Playwright"""
+        self._listen(context, {"response": self._on_response, "requestfinished": self._on_finished_async,
+                               "requestfailed": self._on_failed})
+
+    def detach(self, context: Any) -> None:
+        """Zdejmuje nasłuch (konteksty z puli obsługują kolejne testy)"""
+        for event, handler in self._handlers.items():
+            context.remove_listener(event, handler)
+        self._handlers = {}
+
+    def finalize(self) -> Dict[str, Any]:
+        """Waterfall testu (żądania od najwcześniejszego) i sumy"""
+        # Żądania bez zakończenia do końca testu (np. strumienie, long polling)
+        for request, response in self._responses.items():
+            self.entries.append(self._entry(request, response, None))
+        self._responses = {}
+        starts = [entry["start"] for entry in self.entries if entry["start"]]
+        origin = min(starts) if starts else 0
+        requests = []
+        for entry in sorted(self.entries, key=lambda item: item["start"] or float("inf")):
+            entry = dict(entry)
+            start = entry.pop("start")
+            entry["start_ms"] = round(start - origin, 1) if start else None
+            requests.append(entry)
+        return {"summary": summarize(requests), "requests": requests}
+
+    def _listen(self, context: Any, handlers: Dict[str, Any]) -> None:
+        self._handlers = handlers
+        for event, handler in handlers.items():
+            context.on(event, handler)
+
+    def _on_response(self, response: Any) -> None:
+        self._responses[response.request] = response
+
+    def _on_finished(self, request: Request) -> None:
+        response = self._responses.pop(request, None)
+        try:
+            sizes = request.sizes() if response is not None else None
+        except PlaywrightError:
+            sizes = None
+        self.entries.append(self._entry(request, response, sizes))
+
+    async def _on_finished_async(self, request: AsyncRequest) -> None:
+        response = self._responses.pop(request, None)
+        try:
+            sizes = await request.sizes() if response is not None else None
+        except PlaywrightError:
+            sizes = None
+        self.entries.append(self._entry(request, response, sizes))
+
+    def _on_failed(self, request: Any) -> None:
+        self.entries.append(self._entry(request, self._responses.pop(request, None), None))
+
+    def _entry(self, request: Any, response: Any, sizes: Optional[Dict[str, int]]) -> Dict[str, Any]:
+        host = urlparse(request.url).hostname or ""
+        timing = request.timing
+        status = response.status if response is not None else None
+        transfer = None
+        if sizes is not None:
+            transfer = max(sizes["responseHeadersSize"], 0) + max(sizes["responseBodySize"], 0)
+        return {
+            "url": request.url,
+            "host": host,
+            "type": request.resource_type,
+            "status": status,
+            "transfer_bytes": transfer,
+            # startTime to czas ścienny (ms) - pozostałe czasy są względem niego
+            "start": timing.get("startTime") or None,
+            "ttfb_ms": _relative(timing.get("responseStart")),
+            "duration_ms": _relative(timing.get("responseEnd")),
+            "third_party": not (host == self.site or host.endswith(f".{self.site}")),
+            # 304 (rewalidacja), service worker albo odpowiedź bez transferu z sieci
+            "cached": status == 304 or bool(response is not None and response.from_service_worker)
+                      or (transfer == 0 and status == 200),
+            "failure": request.failure,
+            "blocked": request.failure == BLOCKED_FAILURE,
+        }
+
+
+def summarize(requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Sumy waterfallu: żądania i bajty (łącznie, per typ, własne i zewnętrzne),
+    najwolniejsze hosty. Żądania zablokowane celowo nie wyszły do sieci -
+    liczone są tylko w "blocked".
+    """
+    sent = [entry for entry in requests if not entry["blocked"]]
+    summary: Dict[str, Any] = {
+        "requests": len(sent),
+        "transfer_bytes": 0,
+        "failed": 0,
+        "blocked": len(requests) - len(sent),
+        "cached": 0,
+        "first_party": {"requests": 0, "bytes": 0},
+        "third_party": {"requests": 0, "bytes": 0},
+        "by_type": {},
+    }
+    hosts: Dict[str, Dict[str, Any]] = {}
+    end_ms = 0.0
+    for entry in sent:
+        size = entry["transfer_bytes"] or 0
+        summary["transfer_bytes"] += size
+        summary["failed"] += entry["failure"] is not None
+        summary["cached"] += entry["cached"]
+        party = summary["third_party" if entry["third_party"] else "first_party"]
+        party["requests"] += 1
+        party["bytes"] += size
+        by_type = summary["by_type"].setdefault(entry["type"], {"requests": 0, "bytes": 0})
+        by_type["requests"] += 1
+        by_type["bytes"] += size
+        host = hosts.setdefault(entry["host"], {"host": entry["host"], "third_party": entry["third_party"],
+                                                "requests": 0, "bytes": 0, "total_ms": 0.0, "max_ms": 0.0})
+        host["requests"] += 1
+        host["bytes"] += size
+        if entry["duration_ms"] is not None:
+            host["total_ms"] = round(host["total_ms"] + entry["duration_ms"], 1)
+            host["max_ms"] = max(host["max_ms"], entry["duration_ms"])
+            if entry["start_ms"] is not None:
+                end_ms = max(end_ms, entry["start_ms"] + entry["duration_ms"])
+    summary["duration_ms"] = round(end_ms, 1)
+    summary["slowest_hosts"] = sorted(hosts.values(), key=lambda item: item["total_ms"], reverse=True)[:SLOWEST_HOSTS]
+    return summary
+
+
+def waterfall_html(waterfall: Dict[str, Any]) -> str:
+    """Waterfall i sumy do raportu pytest-html (paski względem czasu całego testu)"""
+    summary = waterfall["summary"]
+    scale = summary["duration_ms"] or 1
+    rows = []
+    sent = [entry for entry in waterfall["requests"] if not entry["blocked"]]
+    for entry in sent[:MAX_HTML_ROWS]:
+        start = entry["start_ms"] or 0
+        width = max((entry["duration_ms"] or 0) / scale * 100, 0.5)
+        color = "#c66" if entry["failure"] else ("#e9a23b" if entry["third_party"] else "#5b8fd6")
+        bar = (f"<div style='margin-left:{start / scale * 100:.1f}%;width:{width:.1f}%;"
+               f"height:8px;background:{color}'></div>")
+        cells = (entry["url"][:120], entry["type"], entry["status"] or entry["failure"] or "-",
+                 _kb(entry["transfer_bytes"]), "-" if entry["duration_ms"] is None else entry["duration_ms"],
+                 "tak" if entry["cached"] else "")
+        rows.append("<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in cells)
+                    + f"<td style='min-width:300px'>{bar}</td></tr>")
+    hosts = "".join(
+        f"<li>{html.escape(host['host'])}{' (zewn.)' if host['third_party'] else ''}: {host['requests']} żądań, "
+        f"{_kb(host['bytes'])} KB, łącznie {host['total_ms']} ms, max {host['max_ms']} ms</li>"
+        for host in summary["slowest_hosts"]
+    )
+    header = "".join(f"<th>{name}</th>" for name in ("url", "typ", "status", "KB", "ms", "cache", "waterfall"))
+    return (
+        "<div class='network-waterfall'><p><b>Sieć</b>: "
+        f"{summary['requests']} żądań, {_kb(summary['transfer_bytes'])} KB "
+        f"(zewnętrzne: {summary['third_party']['requests']} żądań, {_kb(summary['third_party']['bytes'])} KB), "
+        f"nieudane: {summary['failed']}, zablokowane: {summary['blocked']}, z cache: {summary['cached']}</p>"
+        f"<p><b>Najwolniejsze hosty</b></p><ul>{hosts}</ul>"
+        f"<table border='1' cellpadding='2'><tr>{header}</tr>{''.join(rows)}</table></div>"
+    )
+
+
+class WaterfallReport:
+    """
+    Zbiera waterfalle testów (także z workerów xdist, przez user_properties
+    raportów), zapisuje je do JSON i dopisuje wagę stron do historii
+    """
+
+    def __init__(self, path: str = DEFAULT_WATERFALL_REPORT, history_path: str = DEFAULT_PAGE_WEIGHT_HISTORY,
+                 environment: Optional[str] = None):
+        self.path = path
+        self.history_path = history_path
+        self.environment = environment
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.tests: Dict[str, Dict[str, Any]] = {}
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.tests[report.nodeid] = value
+
+    def totals(self) -> Dict[str, Any]:
+        """Sumy sesji; najwolniejsze hosty według łącznego czasu żądań"""
+        hosts: Dict[str, Dict[str, Any]] = {}
+        for waterfall in self.tests.values():
+            for host in waterfall["summary"]["slowest_hosts"]:
+                total = hosts.setdefault(host["host"], dict(host, requests=0, bytes=0, total_ms=0.0, max_ms=0.0))
+                total["requests"] += host["requests"]
+                total["bytes"] += host["bytes"]
+                total["total_ms"] = round(total["total_ms"] + host["total_ms"], 1)
+                total["max_ms"] = max(total["max_ms"], host["max_ms"])
+        summaries = [waterfall["summary"] for waterfall in self.tests.values()]
+        return {
+            "tests": len(self.tests),
+            "requests": sum(summary["requests"] for summary in summaries),
+            "transfer_bytes": sum(summary["transfer_bytes"] for summary in summaries),
+            "third_party_bytes": sum(summary["third_party"]["bytes"] for summary in summaries),
+            "slowest_hosts": sorted(hosts.values(), key=lambda item: item["total_ms"], reverse=True)[:SLOWEST_HOSTS],
+        }
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.tests:
+            return
+        totals = self.totals()
+        terminalreporter.write_sep("-", "network waterfall")
+        terminalreporter.write_line(
+            f"{totals['requests']} żądań, {totals['transfer_bytes'] / 1024 / 1024:.1f} MB "
+            f"(zewnętrzne {totals['third_party_bytes'] / 1024 / 1024:.1f} MB) w {totals['tests']} testach"
+        )
+        for host in totals["slowest_hosts"]:
+            terminalreporter.write_line(f"  {host['host']}: {host['requests']} żądań, łącznie {host['total_ms']} ms, "
+                                        f"max {host['max_ms']} ms")
+
+    @pytest.hookimpl
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if not self.tests:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump({"totals": self.totals(), "tests": self.tests}, handle, indent=2)
+        weights = {
+            nodeid: {key: waterfall["summary"][key] for key in ("requests", "transfer_bytes", "duration_ms")}
+            for nodeid, waterfall in self.tests.items()
+        }
+        with open(self.history_path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"started_at": self.started_at, "commit": get_commit(),
+                                     "environment": self.environment, "tests": weights}) + "\n")
+
+
+def _site(host: str) -> str:
+    return host[4:] if host.startswith("www.") else host
+
+
+def _relative(value: Optional[float]) -> Optional[float]:
+    # -1 oznacza, że faza nie wystąpiła (np. żądanie przerwane)
+    return round(value, 1) if value is not None and value >= 0 else None
+
+
+def _kb(size: Optional[int]) -> str:
+    return "-" if size is None else f"{size / 1024:.1f}"
@@ -0,0 +1,166 @@
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import requests
+
+from utils.json_stream import iter_json_array
+from utils.search_validation import movie_title
+
+# Typy pól rekordu wyniku wyszukiwania (struktura z README)
+REQUIRED_FIELDS: Dict[str, tuple] = {"id": (int, str)}
+OPTIONAL_FIELDS: Dict[str, tuple] = {
+    "original_title": (str,),
+    "year": (int,),
+    "type": (str,),
+    "poster": (str, type(None)),
+    "url": (str,),
+}
+
+
+def record_problems(record: Any) -> List[str]:
+    """Sprawdza schemat jednego rekordu wyniku; pusta lista = rekord poprawny"""
+    if not isinstance(record, dict):
+        return ["Rekord nie jest obiektem JSON"]
+    problems = []
+    for field, types in REQUIRED_FIELDS.items():
+        if not isinstance(record.get(field), types):
+            problems.append(f"Brak lub zły typ pola '{field}'")
+    if movie_title(record) is None:
+        problems.append("Brak pola tytułu")
+    for field, types in OPTIONAL_FIELDS.items():
+        if field in record and not isinstance(record[field], types):
+            problems.append(f"Zły typ pola '{field}': {type(record[field]).__name__}")
+    return problems
+
+
+class PaginationReport:
+    """Wynik walidacji całego zbioru wyników"""
+
+    # Ile problemów zapisać w raporcie - reszta jest tylko liczona
+    MAX_PROBLEMS = 50
+
+    def __init__(self) -> None:
+        self.total: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.reported_pages: Optional[int] = None
+        self.pages_fetched = 0
+        self.records = 0
+        self.duplicate_ids = 0
+        self.problem_count = 0
+        self.problems: List[str] = []
+
+    def add_problem(self, problem: str) -> None:
+        self.problem_count += 1
+        if len(self.problems) < self.MAX_PROBLEMS:
+            self.problems.append(problem)
+
+    @property
+    def ok(self) -> bool:
+        return self.problem_count == 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "limit": self.limit,
+            "reported_pages": self.reported_pages,
+            "pages_fetched": self.pages_fetched,
+            "records": self.records,
+            "duplicate_ids": self.duplicate_ids,
+            "problem_count": self.problem_count,
+            "problems": self.problems,
+        }
+
+
+class PaginatedSearchValidator:
+    """
+    Przechodzi wszystkie strony wyników /api/search dla jednego zapytania.
+
+    Pierwsza strona podaje total i limit; pozostałe strony są pobierane
+    równolegle. Każda odpowiedź jest czytana strumieniowo (stream=True)
+    i parsowana przyrostowo, więc w pamięci jest najwyżej jeden rekord
+    na wątek - plus zbiór już widzianych id do wykrywania duplikatów.
+    Sprawdzane są: schemat każdego rekordu, unikalność id między stronami,
+    pełne strony przed ostatnią, suma rekordów równa total, liczba stron
+    zgodna z total, oraz pusta strona za ostatnią.
+    """
+
+    def __init__(self, session: requests.Session, api_url: str, limit: int = 100,
+                 concurrency: int = 4, timeout: float = 30, chunk_size: int = 16 * 1024):
+        self.session = session
+        self.api_url = api_url
+        self.limit = limit
+        self.concurrency = max(concurrency, 1)
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+    def validate(self, query: str) -> PaginationReport:
+        """Waliduje wszystkie strony wyników dla query"""
+        report = PaginationReport()
+        seen_ids: Set[Any] = set()
+        lock = threading.Lock()
+
+        first_fields, first_count = self._check_page(query, 1, report, seen_ids, lock)
+        report.pages_fetched = 1
+        total = first_fields.get("total")
+        if not isinstance(total, int):
+            report.add_problem(f"Brak pola total na pierwszej stronie: {first_fields}")
+            return report
+        report.total = total
+        report.limit = limit = first_fields.get("limit", self.limit)
+        report.reported_pages = first_fields.get("pages")
+        expected_pages = math.ceil(total / limit) if limit else 0
+        if report.reported_pages is not None and report.reported_pages != expected_pages:
+            report.add_problem(f"Pole pages={report.reported_pages}, a z total={total} "
+                               f"i limit={limit} wynika {expected_pages}")
+
+        counts = {1: first_count}
+        # Strona za ostatnią musi być pusta - inaczej total zaniża liczbę wyników
+        pages = list(range(2, expected_pages + 2))
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="pagination") as executor:
+            for page, (_, count) in zip(pages, executor.map(
+                    lambda page: self._check_page(query, page, report, seen_ids, lock), pages)):
+                counts[page] = count
+        report.pages_fetched += len(pages)
+
+        for page in range(1, expected_pages):
+            if counts.get(page) != limit:
+                report.add_problem(f"Strona {page} ma {counts.get(page)} rekordów zamiast {limit}")
+        if counts.get(expected_pages + 1, 0):
+            report.add_problem(f"Strona {expected_pages + 1} za ostatnią zwróciła "
+                               f"{counts[expected_pages + 1]} rekordów")
+        if report.records != total:
+            report.add_problem(f"Suma rekordów {report.records} różni się od total={total}")
+        return report
+
+    def _check_page(self, query: str, page: int, report: PaginationReport, seen_ids: Set[Any],
+                    lock: threading.Lock) -> Tuple[Dict[str, Any], int]:
+        fields: Dict[str, Any] = {}
+        count = 0
+        try:
+            with self.session.get(self.api_url, params={"q": query, "page": page, "limit": self.limit},
+                                  headers={"Accept": "application/json"},
+                                  timeout=self.timeout, stream=True) as response:
+                content_type = response.headers.get('content-type', '')
+                if response.status_code != 200 or 'json' not in content_type:
+                    with lock:
+                        report.add_problem(f"Strona {page}: status {response.status_code}, {content_type}")
+                    return fields, 0
+                for record in iter_json_array(response.iter_content(self.chunk_size), "results", fields):
+                    count += 1
+                    problems = record_problems(record)
+                    record_id = record.get("id") if isinstance(record, dict) else None
+                    with lock:
+                        report.records += 1
+                        for problem in problems:
+                            report.add_problem(f"Strona {page}, rekord {count}: {problem}")
+                        if record_id is not None:
+                            if record_id in seen_ids:
+                                report.duplicate_ids += 1
+                                report.add_problem(f"Strona {page}: zduplikowane id {record_id!r}")
+                            seen_ids.add(record_id)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            with lock:
+                report.add_problem(f"Strona {page}: {e}")
+        return fields, count
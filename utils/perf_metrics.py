@@ -0,0 +1,112 @@
+import html
+import json
+import os
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from playwright.sync_api import Page
+
+DEFAULT_PERF_BUDGETS = "config/perf_budgets.json"
+USER_PROPERTY = "perf_metrics"
+
+# Metryki zbierane przy każdej nawigacji (kolejność kolumn w raporcie)
+METRICS = ("ttfb_ms", "dom_content_loaded_ms", "load_ms", "lcp_ms", "cls", "transfer_kb", "requests")
+BUDGET_MODES = ("warn", "fail", "off")
+
+
+class PerfBudgetWarning(pytest.PytestWarning):
+    """Przekroczony budżet wydajności w trybie 'warn'"""
+
+
+def is_perf_capture_enabled() -> bool:
+    """Zbieranie metryk przy nawigacji (zmienna PERF_METRICS, domyślnie włączone; 0 wyłącza)"""
+    return os.getenv('PERF_METRICS', '1') != '0'
+
+
+def get_perf_load_timeout() -> int:
+    """
+    Ile ms czekać na zdarzenie load po nawigacji wywołanej kliknięciem,
+    zanim metryki zostaną odczytane (zmienna PERF_LOAD_TIMEOUT, domyślnie 5000)
+    """
+    return int(os.getenv('PERF_LOAD_TIMEOUT', '5000'))
+
+
+class NavigationMetricsLog:
+    """
+    Metryki nawigacji zebrane przez page objecty, per strona Playwright.
+    Page objecty są tworzone w testach, więc fixture odbiera metryki przez
+    stronę, a nie przez obiekt strony.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "weakref.WeakKeyDictionary[Page, List[Dict[str, Any]]]" = weakref.WeakKeyDictionary()
+
+    def record(self, page: Page, metrics: Dict[str, Any]) -> None:
+        self._entries.setdefault(page, []).append(metrics)
+
+    def pop(self, page: Page) -> List[Dict[str, Any]]:
+        """Zwraca i czyści metryki strony (strona z puli wraca do kolejnego testu)"""
+        return self._entries.pop(page, [])
+
+
+navigation_log = NavigationMetricsLog()
+
+
+class PerfBudgets:
+    """
+    Budżety wydajności per typ strony (home, movies, movie...) z pliku JSON.
+    Typ 'default' obowiązuje dla wszystkich stron i może być nadpisany
+    przez budżet konkretnego typu. Tryb 'warn' zgłasza ostrzeżenie,
+    'fail' oblewa test, 'off' tylko zbiera metryki.
+    """
+
+    def __init__(self, page_types: Dict[str, Dict[str, Any]], mode: str = "warn"):
+        if mode not in BUDGET_MODES:
+            raise ValueError(f"Nieznany tryb budżetów: {mode} (dozwolone: {', '.join(BUDGET_MODES)})")
+        self.page_types = page_types
+        self.mode = mode
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_PERF_BUDGETS, mode: Optional[str] = None) -> "PerfBudgets":
+        """Wczytuje budżety (domyślnie config/perf_budgets.json); mode nadpisuje tryb z pliku"""
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(data.get("page_types", {}), mode or data.get("mode", "warn"))
+
+    def budget_for(self, page_type: str) -> Tuple[Dict[str, float], str]:
+        """Limity i tryb dla typu strony"""
+        budget = dict(self.page_types.get("default", {}))
+        budget.update(self.page_types.get(page_type, {}))
+        mode = budget.pop("mode", self.mode) if self.mode != "off" else "off"
+        return budget, mode
+
+    def check(self, metrics: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Lista przekroczeń (tryb, opis) dla jednej nawigacji"""
+        budget, mode = self.budget_for(metrics.get("page_type", "default"))
+        if mode == "off":
+            return []
+        violations = []
+        for name, limit in budget.items():
+            value = metrics.get(name)
+            if value is not None and value > limit:
+                violations.append((mode, f"{metrics.get('page_type')} {metrics.get('url')}: "
+                                         f"{name}={value} > {limit}"))
+        return violations
+
+
+def metrics_table_html(navigations: List[Dict[str, Any]], violations: List[str]) -> str:
+    """Tabela metryk nawigacji do raportu pytest-html"""
+    header = "".join(f"<th>{name}</th>" for name in ("page", "url") + METRICS)
+    rows = []
+    for metrics in navigations:
+        cells = [html.escape(str(metrics.get("page_type", ""))), html.escape(str(metrics.get("url", "")))]
+        cells.extend(html.escape("-" if metrics.get(name) is None else str(metrics[name])) for name in METRICS)
+        rows.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+    budget_lines = "".join(f"<li>{html.escape(violation)}</li>" for violation in violations)
+    return (
+        "<div class='perf-metrics'><p><b>Metryki wydajności nawigacji</b></p>"
+        f"<table border='1' cellpadding='3'><tr>{header}</tr>{''.join(rows)}</table>"
+        + (f"<p><b>Przekroczone budżety</b></p><ul>{budget_lines}</ul>" if budget_lines else "")
+        + "</div>"
+    )
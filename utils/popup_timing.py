@@ -0,0 +1,101 @@
+import weakref
+from typing import Any, Dict, List, Optional
+
+import pytest
+from playwright.sync_api import Page
+
+from utils.helpers import percentile
+
+USER_PROPERTY = "popup_timings"
+
+
+class PopupTiming:
+    """
+    Pojawienie się popupa zmierzone przez obserwator w przeglądarce.
+    latency_ms liczone jest od kliknięcia (play_video), a gdy kliknięcia
+    nie było - od uzbrojenia obserwatora (since_click = False).
+    """
+
+    __slots__ = ("latency_ms", "since_click", "selector", "redirect_url", "already_visible")
+
+    def __init__(self, latency_ms: float, since_click: bool, selector: str,
+                 redirect_url: Optional[str], already_visible: bool = False):
+        self.latency_ms = latency_ms
+        self.since_click = since_click
+        self.selector = selector
+        self.redirect_url = redirect_url
+        self.already_visible = already_visible
+
+    @classmethod
+    def from_script(cls, result: Dict[str, Any]) -> "PopupTiming":
+        """Wynik AWAIT_POPUP (czasy performance.now w ms)"""
+        since_click = result.get("clicked_at") is not None
+        start = result["clicked_at"] if since_click else result["armed_at"]
+        return cls(
+            latency_ms=round(max(result["seen_at"] - start, 0.0), 1),
+            since_click=since_click,
+            selector=result.get("selector") or "",
+            redirect_url=result.get("href"),
+            already_visible=bool(result.get("already_visible")),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class PopupLog:
+    """Zmierzone popupy per strona Playwright (odbiera je conftest po teście)"""
+
+    def __init__(self) -> None:
+        self._entries: "weakref.WeakKeyDictionary[Page, List[PopupTiming]]" = weakref.WeakKeyDictionary()
+
+    def record(self, page: Page, timing: PopupTiming) -> None:
+        self._entries.setdefault(page, []).append(timing)
+
+    def pop(self, page: Page) -> List[Dict[str, Any]]:
+        return [timing.as_dict() for timing in self._entries.pop(page, [])]
+
+
+popup_log = PopupLog()
+
+
+def latency_summary(latencies_ms: List[float]) -> Dict[str, Any]:
+    """Rozkład czasu do popupa: liczba, min, p50, p90, p99, max (ms)"""
+    ordered = sorted(latencies_ms)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "min_ms": ordered[0],
+        "p50_ms": percentile(ordered, 50),
+        "p90_ms": percentile(ordered, 90),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1],
+    }
+
+
+class PopupReport:
+    """Rozkład czasu do popupa w bieżącym uruchomieniu (także z workerów xdist)"""
+
+    def __init__(self) -> None:
+        self.latencies_ms: List[float] = []
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.latencies_ms.extend(item["latency_ms"] for item in value
+                                         if item["since_click"] and not item["already_visible"])
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.latencies_ms:
+            return
+        summary = latency_summary(self.latencies_ms)
+        terminalreporter.write_sep("-", "czas do popupa (od kliknięcia play)")
+        terminalreporter.write_line(
+            f"n={summary['count']}  min={summary['min_ms']} ms  p50={summary['p50_ms']} ms  "
+            f"p90={summary['p90_ms']} ms  p99={summary['p99_ms']} ms  max={summary['max_ms']} ms"
+        )
@@ -0,0 +1,75 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pytest
+
+
+class ResultsCollector:
+    """
+    Zbiera wyniki testów i zapisuje je do jednego pliku JSON.
+
+    Przy uruchomieniu równoległym (pytest-xdist) plugin działa tylko
+    w procesie kontrolera, do którego workery odsyłają swoje raporty -
+    dzięki temu wyniki wszystkich workerów lądują w jednym pliku, tak
+    jak w jednym reports/report.html generowanym przez pytest-html.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.results: List[Dict[str, Any]] = []
+        self.started_at = datetime.now()
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        # Wynik testu to faza call, chyba że setup/teardown się nie powiódł
+        # albo test został pominięty już w setup (pytest.skip, skipif)
+        if report.when != "call" and not (report.failed or (report.skipped and report.when == "setup")):
+            return
+        self.results.append({
+            "nodeid": report.nodeid,
+            "phase": report.when,
+            "outcome": report.outcome,
+            "duration": round(report.duration, 3),
+            "worker": get_report_worker(report),
+        })
+
+    @pytest.hookimpl
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        summary: Dict[str, int] = {}
+        for result in self.results:
+            summary[result["outcome"]] = summary.get(result["outcome"], 0) + 1
+        workers = sorted({result["worker"] for result in self.results})
+        data = {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "workers": workers,
+            "summary": summary,
+            "tests": self.results,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2, ensure_ascii=False)
+
+
+def get_worker_id() -> str:
+    """
+    Zwraca identyfikator workera pytest-xdist (gw0, gw1...) lub 'master'
+    """
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def is_xdist_worker(config: pytest.Config) -> bool:
+    """Sprawdza czy bieżący proces jest workerem pytest-xdist"""
+    return hasattr(config, "workerinput")
+
+
+def get_report_worker(report: pytest.TestReport) -> str:
+    """Worker, który wykonał test (raporty od workerów mają atrybut node)"""
+    node = getattr(report, "node", None)
+    if node is not None:
+        return node.gateway.id
+    return get_worker_id()
@@ -0,0 +1,48 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+DEFAULT_RUN_PROFILES = "config/run_profiles.json"
+
+
+class RunProfile:
+    """
+    Nazwany zestaw ustawień szybkości przeglądarki (config/run_profiles.json):
+    headless, slow_mo i domyślne limity czasu akcji i nawigacji
+    """
+
+    def __init__(self, name: str, headless: bool = True, slow_mo: float = 0, timeout_ms: float = 30000,
+                 navigation_timeout_ms: float = 30000, args: Optional[List[str]] = None):
+        self.name = name
+        self.headless = headless
+        self.slow_mo = slow_mo
+        self.timeout_ms = timeout_ms
+        self.navigation_timeout_ms = navigation_timeout_ms
+        self.args = list(args or [])
+
+    @classmethod
+    def from_file(cls, name: Optional[str] = None, path: str = DEFAULT_RUN_PROFILES) -> "RunProfile":
+        """
+        Wczytuje profil o podanej nazwie (domyślnie RUN_PROFILE albo profil
+        "default" z pliku); nieznana nazwa to ValueError z listą profili
+        """
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        name = name or os.getenv('RUN_PROFILE') or data.get("default", "fast")
+        profiles = data.get("profiles", {})
+        if name not in profiles:
+            raise ValueError(f"Nieznany profil uruchomienia: {name} (dostępne: {', '.join(sorted(profiles))})")
+        return cls(name, **profiles[name])
+
+    def server_options(self) -> Dict[str, Any]:
+        """Opcje przeglądarki ustalane przy jej starcie (także dla serwera przeglądarki)"""
+        return {"headless": self.headless, "args": self.args}
+
+    def launch_options(self) -> Dict[str, Any]:
+        """Opcje chromium.launch"""
+        return dict(self.server_options(), slow_mo=self.slow_mo)
+
+    def apply(self, context: Any) -> None:
+        """Ustawia domyślne limity czasu kontekstu (sync i async - obie metody są synchroniczne)"""
+        context.set_default_timeout(self.timeout_ms)
+        context.set_default_navigation_timeout(self.navigation_timeout_ms)
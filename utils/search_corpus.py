@@ -0,0 +1,45 @@
+import csv
+import json
+import os
+from typing import Any, Dict, Iterator, Optional
+
+DEFAULT_SEARCH_CORPUS = "config/search_corpus.jsonl"
+
+
+class CorpusQuery:
+    """
+    Jedno zapytanie z korpusu: fraza, klasa zapytania (np. positive/negative)
+    i opcjonalnie fraza, którą musi zawierać tytuł pierwszego wyniku.
+    """
+
+    __slots__ = ("query", "query_class", "expected_title")
+
+    def __init__(self, query: str, query_class: str = "default", expected_title: Optional[str] = None):
+        self.query = query
+        self.query_class = query_class
+        self.expected_title = expected_title
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "CorpusQuery":
+        """Tworzy zapytanie z rekordu JSONL/CSV (kolumny query, class, expected_title)"""
+        query = str(record.get("query") or "").strip()
+        if not query:
+            raise ValueError(f"Rekord korpusu bez pola query: {record}")
+        return cls(query, record.get("class") or "default", record.get("expected_title") or None)
+
+
+def iter_corpus(path: str = DEFAULT_SEARCH_CORPUS) -> Iterator[CorpusQuery]:
+    """
+    Czyta korpus zapytań linia po linii (JSONL albo CSV z nagłówkiem),
+    bez wczytywania całego pliku do pamięci. Puste linie są pomijane.
+    """
+    if os.path.splitext(path)[1].lower() == ".csv":
+        with open(path, encoding="utf-8", newline="") as handle:
+            for record in csv.DictReader(handle):
+                yield CorpusQuery.from_record(record)
+        return
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield CorpusQuery.from_record(json.loads(line))
@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Optional, Union
+
+import requests
+
+# Pola, w których API może zwracać tytuł filmu
+TITLE_FIELDS = ('title', 'name', 'original_title', 'display_name')
+
+
+def extract_movies(data: Union[Dict[str, Any], list]) -> list:
+    """Lista filmów z odpowiedzi API niezależnie od jej struktury"""
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return []
+    # Struktura: {"results": [...], "movies": [...], "data": [...]}
+    movies = (data.get('results', []) or
+              data.get('movies', []) or
+              data.get('data', []) or
+              data.get('items', []))
+    # Jeśli nie ma zagnieżdżonych list, może cała odpowiedź to jeden film
+    if not movies and 'title' in data:
+        movies = [data]
+    return movies
+
+
+def movie_title(movie: Dict[str, Any]) -> Optional[str]:
+    """Tytuł filmu z pierwszego obecnego pola tytułu (None gdy brak)"""
+    for field in TITLE_FIELDS:
+        if field in movie:
+            return str(movie[field])
+    return None
+
+
+def check_movie_data(data: Union[Dict[str, Any], list], search_term: str,
+                     expect_results: bool = True) -> List[str]:
+    """
+    Sprawdza dane o filmach: czy są wyniki, czy pierwszy film jest obiektem
+    z polem tytułu i czy tytuł zawiera wyszukiwaną frazę. Z expect_results=False
+    (zapytanie negatywne) poprawna odpowiedź to pusta lista wyników.
+    Zwraca listę problemów - pusta oznacza poprawną odpowiedź.
+    """
+    movies = extract_movies(data)
+    if not expect_results:
+        return [f"Nieoczekiwane wyniki ({len(movies)}) dla '{search_term}'"] if movies else []
+    if not movies:
+        return [f"Brak filmów w odpowiedzi API dla '{search_term}'"]
+    first_movie = movies[0]
+    if not isinstance(first_movie, dict):
+        return ["Film nie jest obiektem JSON"]
+    title = movie_title(first_movie)
+    if title is None:
+        return [f"Brak pola tytułu w filmie: {first_movie.keys()}"]
+    if search_term.lower() not in title.lower():
+        return [f"Tytuł '{title}' nie zawiera frazy '{search_term}'"]
+    return []
+
+
+def check_search_response(response: requests.Response, search_term: str,
+                          expect_results: bool = True) -> List[str]:
+    """Sprawdza status, Content-Type i JSON odpowiedzi, a potem dane o filmach"""
+    if response.status_code != 200:
+        return [f"Niepoprawny status code: {response.status_code}"]
+    content_type = response.headers.get('content-type', '')
+    if 'application/json' not in content_type:
+        return [f"Niepoprawny Content-Type: {content_type}"]
+    try:
+        data = response.json()
+    except ValueError:
+        return ["Odpowiedź nie zawiera prawidłowego JSON"]
+    if not isinstance(data, (dict, list)):
+        return ["Odpowiedź nie jest prawidłowym JSON"]
+    return check_movie_data(data, search_term, expect_results)
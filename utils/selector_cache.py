@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Sequence
+
+
+class SelectorCache:
+    """
+    Pamięć selektorów, które wygrały w łańcuchu fallbacków.
+
+    Klucz to typ strony (np. 'home', 'movie') i skrót listy selektorów,
+    wartość to selektor, który ostatnio okazał się widoczny. Opcjonalnie
+    cache jest zapisywany do pliku JSON, żeby kolejne uruchomienia
+    nie musiały szukać selektorów od nowa.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if path:
+            self._entries.update(self._read_file())
+
+    @classmethod
+    def from_env(cls) -> "SelectorCache":
+        """Tworzy cache; plik ustawiany zmienną SELECTOR_CACHE_FILE"""
+        return cls(os.getenv('SELECTOR_CACHE_FILE') or None)
+
+    @staticmethod
+    def make_key(page_type: str, selectors: Sequence[str]) -> str:
+        """Buduje klucz cache dla typu strony i łańcucha selektorów"""
+        digest = hashlib.sha1("\n".join(selectors).encode("utf-8")).hexdigest()
+        return f"{page_type}:{digest[:12]}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Zwraca zapamiętany selektor lub None"""
+        return self._entries.get(key)
+
+    def set(self, key: str, selector: str) -> None:
+        """Zapamiętuje selektor, który wygrał"""
+        with self._lock:
+            if self._entries.get(key) == selector:
+                return
+            self._entries[key] = selector
+            self._persist()
+
+    def invalidate(self, key: str) -> None:
+        """Usuwa wpis, który przestał pasować do strony"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._persist(removed=(key,))
+
+    def clear(self) -> None:
+        """Czyści cały cache (także plik)"""
+        with self._lock:
+            removed = tuple(self._entries)
+            self._entries.clear()
+            self._persist(removed=removed)
+
+    def _read_file(self) -> Dict[str, str]:
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return {k: v for k, v in data.items() if isinstance(v, str)} if isinstance(data, dict) else {}
+
+    def _persist(self, removed: Sequence[str] = ()) -> None:
+        if not self.path:
+            return
+        # Inne procesy mogły w międzyczasie dopisać swoje wpisy -
+        # scalamy je i zapisujemy atomowo przez os.replace
+        merged = self._read_file()
+        for key in removed:
+            merged.pop(key, None)
+        for key, selector in merged.items():
+            self._entries.setdefault(key, selector)
+        merged.update(self._entries)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(merged, handle, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,207 @@
+import html
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, List
+
+import pytest
+from playwright.sync_api import Page
+
+from utils.structured_logging import get_logger
+
+USER_PROPERTY = "step_profile"
+DEFAULT_PROFILE_PATH = "reports/step_profiles.json"
+
+_state = threading.local()
+_enabled = False
+
+
+class StepFrame:
+    """Jedno wywołanie metody page objectu wraz z wywołaniami zagnieżdżonymi"""
+
+    __slots__ = ("name", "started", "wall_s", "round_trips", "wait_s",
+                 "selectors_tried", "selectors_matched", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.wall_s = 0.0
+        self.round_trips = 0
+        self.wait_s = 0.0
+        self.selectors_tried = 0
+        self.selectors_matched = 0
+        self.children: List["StepFrame"] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Słownik z wartościami łącznymi (z wywołaniami zagnieżdżonymi)"""
+        self_s = self.wall_s - sum(child.wall_s for child in self.children)
+        return {
+            "name": self.name,
+            "wall_ms": round(self.wall_s * 1000, 1),
+            "self_ms": round(max(self_s, 0.0) * 1000, 1),
+            "round_trips": self.round_trips,
+            "wait_ms": round(self.wait_s * 1000, 1),
+            "selectors_tried": self.selectors_tried,
+            "selectors_matched": self.selectors_matched,
+            "children": [child.as_dict() for child in self.children],
+        }
+
+
+class StepProfileLog:
+    """Drzewa wywołań page objectów per strona Playwright"""
+
+    def __init__(self) -> None:
+        self._entries: "weakref.WeakKeyDictionary[Page, List[StepFrame]]" = weakref.WeakKeyDictionary()
+
+    def record(self, page: Page, frame: StepFrame) -> None:
+        self._entries.setdefault(page, []).append(frame)
+
+    def pop(self, page: Page) -> List[Dict[str, Any]]:
+        return [frame.as_dict() for frame in self._entries.pop(page, [])]
+
+
+profile_log = StepProfileLog()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    """
+    Włącza szczegółowe profilowanie kroków. Round trips do przeglądarki
+    liczone są w jednym miejscu, przez które przechodzi każde wywołanie
+    synchronicznego API Playwright (prywatne SyncBase._sync, wersja
+    przypięta w requirements.txt). Gdy nowsza wersja go nie ma, profil
+    zawiera tylko czasy i selektory - bez round trips i czasu czekania.
+    """
+    global _enabled
+    _enabled = True
+    _install_round_trip_hook()
+
+
+def _stack() -> List[StepFrame]:
+    stack = getattr(_state, "stack", None)
+    if stack is None:
+        stack = _state.stack = []
+    return stack
+
+
+def enter_step(name: str) -> StepFrame:
+    frame = StepFrame(name)
+    _stack().append(frame)
+    return frame
+
+
+def exit_step(frame: StepFrame, page: Page) -> None:
+    """Zamyka wywołanie i dolicza jego liczniki do wywołania nadrzędnego"""
+    frame.wall_s = time.perf_counter() - frame.started
+    stack = _stack()
+    if stack and stack[-1] is frame:
+        stack.pop()
+    if stack:
+        parent = stack[-1]
+        parent.children.append(frame)
+        parent.round_trips += frame.round_trips
+        parent.wait_s += frame.wait_s
+        parent.selectors_tried += frame.selectors_tried
+        parent.selectors_matched += frame.selectors_matched
+    else:
+        profile_log.record(page, frame)
+
+
+def record_selectors(tried: int, matched: bool) -> None:
+    """Zapisuje do bieżącego kroku, ile selektorów sprawdzono i czy któryś pasował"""
+    stack = _stack() if _enabled else None
+    if stack:
+        stack[-1].selectors_tried += tried
+        stack[-1].selectors_matched += int(matched)
+
+
+def _install_round_trip_hook() -> bool:
+    """Podpina licznik round trips; False, gdy Playwright nie ma już SyncBase._sync"""
+    try:
+        from playwright._impl._sync_base import SyncBase
+    except ImportError:
+        SyncBase = None
+    original = getattr(SyncBase, "_sync", None)
+    if not callable(original):
+        get_logger(__name__).warning(
+            "Playwright bez SyncBase._sync - profil kroków bez round trips i czasu czekania"
+        )
+        return False
+    if getattr(original, "__step_hook__", False):
+        return True
+
+    def _sync(self: Any, coro: Any) -> Any:
+        stack = _stack()
+        if not stack:
+            return original(self, coro)
+        name = getattr(coro, "__qualname__", "")
+        started = time.perf_counter()
+        try:
+            return original(self, coro)
+        finally:
+            frame = stack[-1]
+            frame.round_trips += 1
+            # Czekanie to wywołania wait_for_* (w tym wait_for_timeout)
+            if ".wait_for" in name:
+                frame.wait_s += time.perf_counter() - started
+
+    _sync.__step_hook__ = True
+    SyncBase._sync = _sync
+    return True
+
+
+def flame_table_html(frames: List[Dict[str, Any]]) -> str:
+    """
+    Tabela "flame" dla raportu HTML: wywołania w kolejności, wcięte według
+    zagnieżdżenia, z paskiem proporcjonalnym do czasu względem całego testu
+    """
+    total_ms = sum(frame["wall_ms"] for frame in frames) or 1.0
+    rows: List[str] = []
+
+    def add(frame: Dict[str, Any], depth: int) -> None:
+        width = max(frame["wall_ms"] / total_ms * 100, 0.5)
+        bar = (f"<div style='margin-left:{depth * 12}px;background:#f0a040;width:{width:.1f}%;"
+               f"white-space:nowrap'>{html.escape(frame['name'])}</div>")
+        cells = [bar, frame["wall_ms"], frame["self_ms"], frame["round_trips"], frame["wait_ms"],
+                 f"{frame['selectors_matched']}/{frame['selectors_tried']}"]
+        rows.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+        for child in frame["children"]:
+            add(child, depth + 1)
+
+    for frame in frames:
+        add(frame, 0)
+    header = "".join(f"<th>{name}</th>" for name in
+                     ("krok", "wall ms", "self ms", "round trips", "wait ms", "selektory trafione/sprawdzone"))
+    return ("<div class='step-profile'><p><b>Profil kroków page objectów</b></p>"
+            f"<table border='1' cellpadding='3' style='width:100%'><tr>{header}</tr>{''.join(rows)}</table></div>")
+
+
+class StepProfileReport:
+    """Zapisuje profile kroków wszystkich testów (także z workerów xdist) do JSON"""
+
+    def __init__(self, path: str = DEFAULT_PROFILE_PATH):
+        self.path = path
+        self.tests: Dict[str, List[Dict[str, Any]]] = {}
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.tests[report.nodeid] = value
+
+    @pytest.hookimpl
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if not self.tests:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump(self.tests, handle, indent=2)
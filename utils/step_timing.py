@@ -0,0 +1,122 @@
+import contextvars
+import functools
+import inspect
+import logging
+import time
+import weakref
+from typing import Any, Callable, Dict, List
+
+from playwright.sync_api import Page
+
+from utils import step_instrumentation
+from utils.deadline import charge_step
+from utils.structured_logging import reset_step, set_step
+
+USER_PROPERTY = "step_timings"
+
+logger = logging.getLogger("vod.steps")
+
+# Głębokość zagnieżdżenia kroków w bieżącym wątku albo zadaniu asyncio -
+# liczymy tylko krok najwyższego poziomu (search_for_movie, a nie
+# wywoływane w nim type_text). Każde zadanie asyncio ma własną kopię
+# kontekstu, więc równoległe ścieżki w jednej pętli się nie mieszają.
+_depth: "contextvars.ContextVar[int]" = contextvars.ContextVar("step_depth", default=0)
+
+
+class StepLog:
+    """Czasy kroków page objectów per strona Playwright: krok -> [wywołania, sekundy]"""
+
+    def __init__(self) -> None:
+        self._entries: "weakref.WeakKeyDictionary[Page, Dict[str, List[float]]]" = weakref.WeakKeyDictionary()
+
+    def record(self, page: Page, step: str, duration_s: float) -> None:
+        steps = self._entries.setdefault(page, {})
+        calls, total = steps.get(step, (0, 0.0))
+        steps[step] = [calls + 1, total + duration_s]
+
+    def merge(self, page: Page, steps: Dict[str, Dict[str, Any]]) -> None:
+        """Dopisuje czasy zwrócone wcześniej przez pop (sumuje wywołania i czas)"""
+        entries = self._entries.setdefault(page, {})
+        for step, timing in steps.items():
+            calls, total = entries.get(step, (0, 0.0))
+            entries[step] = [calls + timing["calls"], total + timing["duration_s"]]
+
+    def pop(self, page: Page) -> Dict[str, Dict[str, Any]]:
+        """Zwraca i czyści czasy kroków strony"""
+        steps = self._entries.pop(page, {})
+        return {step: {"calls": int(calls), "duration_s": round(total, 4)}
+                for step, (calls, total) in steps.items()}
+
+
+step_log = StepLog()
+
+
+def timed_step(name: str, method: Callable) -> Callable:
+    """Opakowuje publiczną metodę page objectu (także async) pomiarem czasu kroku"""
+    if inspect.iscoroutinefunction(method):
+        return _timed_async_step(name, method)
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        step = f"{type(self).__name__}.{name}"
+        # Szczegółowy profil (--instrument-steps) obejmuje też kroki zagnieżdżone
+        frame = step_instrumentation.enter_step(step) if step_instrumentation.is_enabled() else None
+        token = _depth.set(_depth.get() + 1)
+        step_token = set_step(step)
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - started
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s: %.3f s", step, duration, extra={"duration_s": round(duration, 4)})
+            reset_step(step_token)
+            _depth.reset(token)
+            top_level = not _depth.get()
+            if top_level:
+                step_log.record(self.page, step, duration)
+            if frame is not None:
+                step_instrumentation.exit_step(frame, self.page)
+            if top_level:
+                # Krok, po którym budżet testu jest wyczerpany, oblewa test
+                charge_step(step, duration)
+
+    wrapper.__timed_step__ = True
+    return wrapper
+
+
+def _timed_async_step(name: str, method: Callable) -> Callable:
+    """
+    Wersja dla korutyn - czas liczony do zakończenia await. Profil
+    --instrument-steps dotyczy tylko synchronicznego API Playwright.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        step = f"{type(self).__name__}.{name}"
+        token = _depth.set(_depth.get() + 1)
+        step_token = set_step(step)
+        started = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - started
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s: %.3f s", step, duration, extra={"duration_s": round(duration, 4)})
+            reset_step(step_token)
+            _depth.reset(token)
+            if not _depth.get():
+                step_log.record(self.page, step, duration)
+                charge_step(step, duration)
+
+    wrapper.__timed_step__ = True
+    return wrapper
+
+
+def instrument_public_methods(cls: type) -> type:
+    """Dodaje pomiar czasu do publicznych metod zdefiniowanych w klasie"""
+    for name, value in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(value) or getattr(value, "__timed_step__", False):
+            continue
+        setattr(cls, name, timed_step(name, value))
+    return cls
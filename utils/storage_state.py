@@ -0,0 +1,149 @@
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlparse
+
+from playwright.sync_api import Browser
+
+from utils.structured_logging import get_logger
+
+
+DEFAULT_STORAGE_STATE_PATH = "reports/storage_state.json"
+
+
+def get_storage_state_ttl() -> int:
+    """
+    Czas życia snapshotu w sekundach (zmienna STORAGE_STATE_TTL, domyślnie 1 h).
+    0 wyłącza rozgrzewanie - każdy kontekst startuje pusty.
+    """
+    return int(os.getenv('STORAGE_STATE_TTL', '3600'))
+
+
+def storage_state_path_for(base_url: str, path: str = DEFAULT_STORAGE_STATE_PATH) -> str:
+    """
+    Osobny snapshot dla każdego hosta - stan z vod.film nie trafia
+    do testów na lokalnym serwerze (i odwrotnie)
+    """
+    host = re.sub(r"[^A-Za-z0-9.-]+", "_", urlparse(base_url).netloc)
+    root, ext = os.path.splitext(path)
+    return f"{root}_{host}{ext}" if host else path
+
+
+def is_snapshot_fresh(path: str, ttl: int) -> bool:
+    """Sprawdza czy snapshot istnieje i nie jest starszy niż ttl sekund"""
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return False
+    return age < ttl
+
+
+def load_storage_state(path: str) -> Optional[Dict[str, Any]]:
+    """Wczytuje snapshot storage state (None gdy brak lub uszkodzony)"""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def ensure_warm_storage_state(browser: Browser, base_url: str, context_options: Dict[str, Any],
+                              path: Optional[str] = DEFAULT_STORAGE_STATE_PATH,
+                              ttl: Optional[int] = None) -> Union[str, Dict[str, Any], None]:
+    """
+    Zwraca ścieżkę do świeżego snapshotu storage state dla base_url.
+
+    Jeśli snapshot jest starszy niż TTL (lub go nie ma), odwiedza stronę
+    raz w osobnym kontekście: akceptuje zgodę na cookies, czeka aż strona
+    się uspokoi i zapisuje ciasteczka oraz localStorage. Równoległe workery
+    xdist rozgrzewają stronę tylko raz - pozostałe czekają na plik blokady.
+    path=None rozgrzewa bez zapisu na dysk i zwraca sam stan (słownik) -
+    dla stron, których adres zmienia się przy każdym uruchomieniu.
+    """
+    ttl = get_storage_state_ttl() if ttl is None else ttl
+    if ttl <= 0:
+        return None
+    if path is None:
+        return _capture_storage_state(browser, base_url, context_options)
+    if is_snapshot_fresh(path, ttl):
+        return path
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with FileLock(f"{path}.lock"):
+        # Inny worker mógł właśnie zapisać snapshot
+        if is_snapshot_fresh(path, ttl):
+            return path
+        state = _capture_storage_state(browser, base_url, context_options)
+        if state is None:
+            return None
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, path)
+    return path
+
+
+def _capture_storage_state(browser: Browser, base_url: str,
+                           context_options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Jedna wizyta na stronie w osobnym kontekście; None, gdy się nie udała"""
+    from pages import HomePage
+
+    context = browser.new_context(**context_options)
+    try:
+        home_page = HomePage(context.new_page())
+        home_page.navigate_to(base_url)
+        home_page.accept_cookie_consent()
+        home_page.wait_for_page_settled()
+        return context.storage_state()
+    except Exception as e:
+        # Bez snapshotu testy nadal działają, tylko startują "na zimno"
+        get_logger(__name__).warning("Nie udało się rozgrzać %s: %s", base_url, e)
+        return None
+    finally:
+        context.close()
+
+
+class FileLock:
+    """Prosta blokada międzyprocesowa oparta o plik tworzony z O_EXCL"""
+
+    def __init__(self, path: str, timeout: float = 120, stale_after: float = 300):
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+
+    def __enter__(self) -> "FileLock":
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                # Blokada po procesie, który padł w trakcie rozgrzewania
+                if _age(self.path) > self.stale_after:
+                    _remove(self.path)
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Nie udało się uzyskać blokady {self.path}")
+                time.sleep(0.2)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _remove(self.path)
+
+
+def _age(path: str) -> float:
+    try:
+        return time.time() - os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
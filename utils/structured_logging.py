@@ -0,0 +1,193 @@
+"""
+Logowanie testów: rekordy JSON (jedna linia na rekord) oznaczone testem
+i krokiem page objectu.
+
+Logger tylko wkłada rekord do kolejki (QueueHandler) - zapis do pliku
+i na konsolę robi wątek QueueListener, więc logowanie nie dokłada czasu
+krokom page objectów. Konfiguracja jest jednorazowa: kolejne wywołania
+configure_logging/get_logger nie dodają handlerów.
+"""
+import contextlib
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Union
+
+from utils.reporting import get_worker_id
+
+ROOT_LOGGER = "vod"
+DEFAULT_LOG_DIR = "reports/logs"
+
+# Test i krok page objectu, w którym powstał rekord (per wątek i zadanie asyncio)
+_test_id: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar("log_test_id", default=None)
+_step: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar("log_step", default=None)
+
+# Standardowe pola LogRecord - pozostałe (z extra=...) trafiają do JSON
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "test_id", "step"}
+
+
+def get_log_level() -> str:
+    """Poziom logowania (zmienna LOG_LEVEL, domyślnie INFO)"""
+    return os.getenv('LOG_LEVEL', 'INFO').upper()
+
+
+def get_log_path() -> str:
+    """Plik logu procesu - osobny dla każdego workera xdist (LOG_DIR, domyślnie reports/logs)"""
+    return os.path.join(os.getenv('LOG_DIR', DEFAULT_LOG_DIR), f"tests-{get_worker_id()}.jsonl")
+
+
+class JsonFormatter(logging.Formatter):
+    """Rekord jako jedna linia JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "test_id": getattr(record, "test_id", None),
+            "step": getattr(record, "step", None),
+            "worker": get_worker_id(),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                data[key] = value
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _ContextQueueHandler(logging.handlers.QueueHandler):
+    """Dopisuje test i krok w wątku, który loguje, i oddaje rekord do kolejki"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.test_id = _test_id.get()
+        record.step = _step.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class LogPipeline:
+    """
+    Kolejka i wątek zapisujący dla jednego drzewa loggerów (domyślnie 'vod').
+    Handler pliku pisze JSON, konsola (stderr) tylko ostrzeżenia i błędy.
+    """
+
+    def __init__(self, logger_name: str = ROOT_LOGGER, level: Union[int, str] = logging.INFO,
+                 console_level: Optional[Union[int, str]] = logging.WARNING):
+        self.logger = logging.getLogger(logger_name)
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self._files: Dict[str, logging.Handler] = {}
+        self._lock = threading.Lock()
+        handlers = []
+        if console_level is not None:
+            # sys.__stderr__ - pytest podmienia sys.stderr na czas każdego testu
+            console = logging.StreamHandler(sys.__stderr__)
+            console.setLevel(console_level)
+            console.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+            handlers.append(console)
+        self.listener = logging.handlers.QueueListener(self._queue, *handlers, respect_handler_level=True)
+        self.logger.handlers = [_ContextQueueHandler(self._queue)]
+        self.logger.setLevel(level)
+        self.logger.propagate = False
+        self.listener.start()
+
+    def add_file(self, path: str) -> None:
+        """Dodaje plik JSON lines (ten sam plik dodany drugi raz jest pomijany)"""
+        path = os.path.abspath(path)
+        with self._lock:
+            if path in self._files:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handler = logging.FileHandler(path, encoding="utf-8", delay=True)
+            handler.setFormatter(JsonFormatter())
+            self._files[path] = handler
+            # QueueListener czyta krotkę handlers przy każdym rekordzie
+            self.listener.handlers = self.listener.handlers + (handler,)
+
+    def stop(self) -> None:
+        """Zapisuje rekordy z kolejki i zamyka pliki"""
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+_pipeline: Optional[LogPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def configure_logging(log_file: Optional[str] = None) -> LogPipeline:
+    """
+    Konfiguruje logowanie przy pierwszym wywołaniu (poziom LOG_LEVEL, plik
+    reports/logs/tests-<worker>.jsonl); kolejne wywołania najwyżej dodają
+    nowy plik logu
+    """
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = LogPipeline(ROOT_LOGGER, get_log_level())
+            _pipeline.add_file(get_log_path())
+    if log_file:
+        _pipeline.add_file(log_file)
+    return _pipeline
+
+
+def shutdown_logging() -> None:
+    """Opróżnia kolejkę i zamyka pliki (koniec sesji pytest)"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is not None:
+            _pipeline.stop()
+            _pipeline = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger modułu w drzewie 'vod' (konfiguruje logowanie przy pierwszym użyciu)"""
+    configure_logging()
+    return logging.getLogger(name if name.startswith(f"{ROOT_LOGGER}.") else f"{ROOT_LOGGER}.{name}")
+
+
+@contextlib.contextmanager
+def bound_test(test_id: str, level: Optional[Union[int, str]] = None,
+               logger_name: str = ROOT_LOGGER) -> Iterator[None]:
+    """
+    Oznacza rekordy identyfikatorem testu i na czas testu zmienia poziom
+    logowania (np. DEBUG dla jednego testu z markerem log_level)
+    """
+    logger = logging.getLogger(logger_name)
+    previous_level = logger.level
+    if level is not None:
+        logger.setLevel(level)
+    token = _test_id.set(test_id)
+    try:
+        yield
+    finally:
+        _test_id.reset(token)
+        logger.setLevel(previous_level)
+
+
+def set_step(step: str) -> "contextvars.Token[Optional[str]]":
+    """Oznacza kolejne rekordy krokiem page objectu (reset_step przywraca poprzedni)"""
+    return _step.set(step)
+
+
+def reset_step(token: "contextvars.Token[Optional[str]]") -> None:
+    _step.reset(token)
+
+
+def current_step() -> Optional[str]:
+    """Krok page objectu, który właśnie trwa"""
+    return _step.get()
@@ -0,0 +1,391 @@
+"""
+Lokalny zamiennik VOD.Film do szybkich, hermetycznych uruchomień testów.
+
+Serwuje stronę główną z wyszukiwarką, wyniki wyszukiwania, listę /filmy
+z sortowaniem i przyciskiem "Wyczyść", stronę filmu z odtwarzaczem
+i opóźnionym popupem oraz JSON-owe /api/search. Opóźnienia i błędy
+odpowiedzi są konfigurowalne, także w trakcie działania przez
+POST /__stub/config.
+
+Uruchomienie samodzielne:
+    python -m utils.stub_server --port 8000 --latency-ms 200
+"""
+import argparse
+import html
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import parse_qs, urlparse
+
+# Znane błędy produkcji (reports/bug_reports.md) odtwarzane domyślnie,
+# żeby testy regresyjne zachowywały się tak jak na prawdziwej stronie
+DEFAULT_BUGS = ("clear_sort", "empty_search")
+
+SORT_OPTIONS = (
+    ("", "Domyślne"),
+    ("added", "Data dodania"),
+    ("rating", "Ocena"),
+    ("title", "Tytuł"),
+)
+
+
+def build_catalog(size: int = 120) -> List[Dict[str, Any]]:
+    """Katalog filmów: 'The Pickup' i filmy testowe do stronicowania"""
+    movies = [
+        {"title": "The Pickup", "original_title": "The Pickup", "year": 2023, "rating": 6.4},
+        {"title": "The Pickup Artist", "original_title": "The Pickup Artist", "year": 2007, "rating": 5.1},
+    ]
+    for number in range(1, size - len(movies) + 1):
+        movies.append({
+            "title": f"Film testowy {number}",
+            "original_title": f"Test Movie {number}",
+            "year": 1980 + number % 45,
+            "rating": round(3 + (number * 37 % 70) / 10, 1),
+        })
+    catalog = []
+    for movie_id, movie in enumerate(movies, start=1):
+        slug = "-".join(movie["title"].lower().split()) + f"-{movie['year']}"
+        catalog.append({
+            "id": movie_id,
+            "title": movie["title"],
+            "original_title": movie["original_title"],
+            "year": movie["year"],
+            "type": "movie",
+            "rating": movie["rating"],
+            "poster": f"/static/posters/{movie_id}.svg",
+            "url": f"/film/{slug}",
+        })
+    return catalog
+
+
+class StubConfig:
+    """Warunki pracy serwera: opóźnienia, błędy, opóźnienie popupa, znane błędy"""
+
+    def __init__(self, latency_ms: float = 0, latency_jitter_ms: float = 0, failure_rate: float = 0,
+                 fail_paths: Sequence[str] = (), popup_delay_ms: int = 1500,
+                 bugs: Sequence[str] = DEFAULT_BUGS, retry_after_s: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.failure_rate = failure_rate
+        self.fail_paths = list(fail_paths)
+        self.popup_delay_ms = popup_delay_ms
+        self.bugs = list(bugs)
+        # Nagłówek Retry-After dla wstrzykniętych błędów 503 (None = bez nagłówka)
+        self.retry_after_s = retry_after_s
+
+    def update(self, values: Dict[str, Any]) -> None:
+        """Zmienia wybrane ustawienia (nieznane klucze są odrzucane)"""
+        for key, value in values.items():
+            if not hasattr(self, key):
+                raise KeyError(key)
+            setattr(self, key, value)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+
+class StubServer:
+    """Serwer HTTP w wątku tła; port 0 wybiera wolny port"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[StubConfig] = None,
+                 catalog: Optional[List[Dict[str, Any]]] = None):
+        self.config = config or StubConfig()
+        self.catalog = catalog if catalog is not None else build_catalog()
+        self._rng = random.Random()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="vod-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Filmy, których tytuł zawiera frazę (bez rozróżniania wielkości liter)"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        return [movie for movie in self.catalog
+                if query in movie["title"].lower() or query in movie["original_title"].lower()]
+
+    def find_by_url(self, path: str) -> Optional[Dict[str, Any]]:
+        return next((movie for movie in self.catalog if movie["url"] == path), None)
+
+    def should_fail(self, path: str) -> bool:
+        config = self.config
+        if any(path.startswith(prefix) for prefix in config.fail_paths):
+            return True
+        return config.failure_rate > 0 and self._rng.random() < config.failure_rate
+
+    def delay(self) -> None:
+        config = self.config
+        latency = config.latency_ms
+        if config.latency_jitter_ms:
+            latency += self._rng.uniform(0, config.latency_jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+
+def _make_handler(server: StubServer) -> type:
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Nagłówki i treść idą osobnymi zapisami - bez tego Nagle i opóźnione
+        # ACK dokładają ~40 ms do każdej odpowiedzi na połączeniu keep-alive
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Bez logowania każdego żądania na stderr
+            pass
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+            if url.path.startswith("/__stub/"):
+                self._send_json(200, server.config.as_dict())
+                return
+            server.delay()
+            if server.should_fail(url.path):
+                retry_after = server.config.retry_after_s
+                self._send(503, "text/plain; charset=utf-8", b"Service Unavailable (stub)",
+                           headers={} if retry_after is None else {"Retry-After": str(retry_after)})
+                return
+            route = ROUTES.get(url.path)
+            if route is not None:
+                route(self, params)
+            elif url.path.startswith("/film/"):
+                self._movie_page(url.path)
+            elif url.path.startswith("/static/"):
+                self._send(200, "image/svg+xml", POSTER_SVG)
+            else:
+                self._send_html(404, _layout("Nie znaleziono", "<h1>404</h1>"))
+
+        def do_POST(self) -> None:
+            url = urlparse(self.path)
+            if url.path != "/__stub/config":
+                self._send_json(404, {"error": "not found"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                server.config.update(json.loads(self.rfile.read(length) or b"{}"))
+            except (ValueError, KeyError) as e:
+                self._send_json(400, {"error": f"invalid config: {e}"})
+                return
+            self._send_json(200, server.config.as_dict())
+
+        # --- strony -------------------------------------------------------
+
+        def _home_page(self, params: Dict[str, str]) -> None:
+            self._send_html(200, _layout("VOD.Film", "<h1>Filmy online</h1>"))
+
+        def _search_page(self, params: Dict[str, str]) -> None:
+            query = params.get("q", "")
+            if not query.strip() and "empty_search" not in server.config.bugs:
+                self._redirect("/")
+                return
+            links = "".join(
+                f'<a class="film-link" href="{movie["url"]}">{html.escape(movie["title"])} ({movie["year"]})</a>'
+                for movie in server.search(query)
+            )
+            body = (f'<h1>Wyniki wyszukiwania: {html.escape(query)}</h1>'
+                    f'<div class="search-results">{links}</div>')
+            if not links:
+                body += '<p class="no-results">Brak wyników</p>'
+            self._send_html(200, _layout("Szukaj", body, query=query))
+
+        def _movies_page(self, params: Dict[str, str]) -> None:
+            sort = params.get("sort", "")
+            movies = list(server.catalog[:24])
+            if sort == "added":
+                movies.sort(key=lambda movie: movie["id"], reverse=True)
+            elif sort == "rating":
+                movies.sort(key=lambda movie: movie["rating"], reverse=True)
+            elif sort == "title":
+                movies.sort(key=lambda movie: movie["title"])
+            options = "".join(
+                f'<option value="{value}"{" selected" if value == sort else ""}>{label}</option>'
+                for value, label in SORT_OPTIONS
+            )
+            items = "".join(
+                f'<div class="movie-item"><a href="{movie["url"]}">'
+                f'<img src="{movie["poster"]}" alt="" width="120" height="180">'
+                f'<span class="title">{html.escape(movie["title"])}</span></a>'
+                f'<span class="year">{movie["year"]}</span></div>'
+                for movie in movies
+            )
+            clear_action = "" if "clear_sort" in server.config.bugs else "location.href = '/filmy';"
+            body = f"""
+<h1>Filmy</h1>
+<form class="filters">
+  <label>Sortuj wg. <select name="sort" onchange="location.href = '/filmy?sort=' + this.value">{options}</select></label>
+  <button type="button" class="clear-button" onclick="{clear_action}">Wyczyść</button>
+</form>
+<div class="movies">{items}</div>"""
+            self._send_html(200, _layout("Filmy", body))
+
+        def _movie_page(self, path: str) -> None:
+            movie = server.find_by_url(path)
+            if movie is None:
+                self._send_html(404, _layout("Nie znaleziono", "<h1>Film nie istnieje</h1>"))
+                return
+            redirect = f"https://ads.example.com/redirect?movie={movie['id']}"
+            body = f"""
+<h1>{html.escape(movie["title"])}</h1>
+<div class="video-player">
+  <video width="640" height="360" muted></video>
+  <button class="play-button" aria-label="play" title="play">Play</button>
+</div>
+<div class="modal" role="dialog" style="display: none">
+  <a href="{redirect}" target="_blank">Przejdź do oferty</a>
+  <button class="modal-close" aria-label="close">×</button>
+</div>
+<script>
+  document.querySelector('.play-button').addEventListener('click', () => {{
+    setTimeout(() => {{
+      document.querySelector('.modal').style.display = 'block';
+    }}, {int(server.config.popup_delay_ms)});
+  }});
+  document.querySelector('.modal-close').addEventListener('click', () => {{
+    document.querySelector('.modal').style.display = 'none';
+  }});
+</script>"""
+            self._send_html(200, _layout(movie["title"], body))
+
+        def _api_search(self, params: Dict[str, str]) -> None:
+            if "q" not in params:
+                self._send_json(400, {"error": "missing parameter: q"})
+                return
+            try:
+                limit = max(1, min(100, int(params.get("limit", 20))))
+                page = max(1, int(params.get("page", 1)))
+            except ValueError:
+                self._send_json(400, {"error": "limit and page must be integers"})
+                return
+            results = server.search(params["q"])
+            content_type = params.get("type")
+            if content_type:
+                results = [movie for movie in results if movie["type"] == content_type]
+            start = (page - 1) * limit
+            self._send_json(200, {
+                "results": [_public_movie(movie) for movie in results[start:start + limit]],
+                "total": len(results),
+                "page": page,
+                "limit": limit,
+                "pages": math.ceil(len(results) / limit),
+            })
+
+        # --- odpowiedzi ---------------------------------------------------
+
+        def _send(self, status: int, content_type: str, body: bytes,
+                  headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_html(self, status: int, document: str) -> None:
+            self._send(status, "text/html; charset=utf-8", document.encode("utf-8"))
+
+        def _send_json(self, status: int, data: Any) -> None:
+            self._send(status, "application/json; charset=utf-8", json.dumps(data).encode("utf-8"))
+
+        def _redirect(self, location: str) -> None:
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    ROUTES = {
+        "/": Handler._home_page,
+        "/search": Handler._search_page,
+        "/filmy": Handler._movies_page,
+        "/api/search": Handler._api_search,
+    }
+    return Handler
+
+
+def _public_movie(movie: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: movie[key] for key in ("id", "title", "original_title", "year", "type", "poster", "url")}
+
+
+def _layout(title: str, body: str, query: str = "") -> str:
+    """Wspólny szablon strony z nagłówkiem i wyszukiwarką"""
+    value = html.escape(query, quote=True)
+    return f"""<!DOCTYPE html>
+<html lang="pl">
+<head>
+  <meta charset="utf-8">
+  <title>{html.escape(title)} - VOD.Film</title>
+  <style>
+    body {{ font-family: sans-serif; margin: 0 20px; }}
+    header {{ display: flex; gap: 16px; align-items: center; height: 60px; }}
+    .search-form {{ display: none; }}
+    .search-form.open {{ display: inline-block; }}
+    .search-results a, .movie-item {{ display: block; margin: 8px 0; }}
+  </style>
+</head>
+<body>
+  <header>
+    <a class="logo" href="/">VOD.Film</a>
+    <a href="/filmy">Filmy</a>
+    <button title="Szukaj" class="search-icon" type="button"
+            onclick="document.querySelector('.search-form').classList.add('open'); document.querySelector('.search-form input').focus();">🔍</button>
+    <form class="search-form{' open' if query else ''}" action="/search" method="get">
+      <input name="q" type="search" placeholder="Szukaj filmu..." value="{value}">
+      <button type="submit">Szukaj</button>
+    </form>
+  </header>
+  <main>{body}</main>
+</body>
+</html>"""
+
+
+POSTER_SVG = (b'<svg xmlns="http://www.w3.org/2000/svg" width="120" height="180">'
+              b'<rect width="120" height="180" fill="#333"/></svg>')
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Lokalny zamiennik VOD.Film")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0)
+    parser.add_argument("--popup-delay-ms", type=int, default=1500)
+    parser.add_argument("--fixed", action="store_true", help="Nie odtwarzaj znanych błędów produkcji")
+    args = parser.parse_args(argv)
+    config = StubConfig(latency_ms=args.latency_ms, failure_rate=args.failure_rate,
+                        popup_delay_ms=args.popup_delay_ms, bugs=() if args.fixed else DEFAULT_BUGS)
+    server = StubServer(args.host, args.port, config).start()
+    print(f"Stub VOD.Film działa na {server.url} (Ctrl+C kończy)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
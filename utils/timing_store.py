@@ -0,0 +1,264 @@
+"""
+Historia czasów testów i kroków page objectów w SQLite.
+
+Każde uruchomienie pytest dopisuje czasy testów i kroków do
+reports/timings.db (tylko INSERT), z commitem, datą i środowiskiem.
+Zapisywany jest też czas od kliknięcia play do popupa (rodzaj 'popup').
+Porównanie z kroczącą bazą z poprzednich uruchomień i rozkład czasu do popupa:
+
+    python -m utils.timing_store compare --window 10 --threshold 3.5
+    python -m utils.timing_store runs
+    python -m utils.timing_store popups --last 50
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import pytest
+
+from utils.popup_timing import USER_PROPERTY as POPUP_PROPERTY
+from utils.popup_timing import latency_summary
+from utils.step_timing import USER_PROPERTY as STEP_PROPERTY
+
+DEFAULT_TIMING_DB = "reports/timings.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    commit_sha TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    environment TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    duration_s REAL NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 1,
+    outcome TEXT
+);
+CREATE INDEX IF NOT EXISTS timings_name ON timings(kind, name);
+"""
+
+# Stała skalująca MAD do odchylenia standardowego rozkładu normalnego
+MAD_SCALE = 1.4826
+
+
+def get_commit() -> str:
+    """Commit testowanego kodu (GITHUB_SHA w CI, inaczej git rev-parse)"""
+    commit = os.getenv('GITHUB_SHA')
+    if commit:
+        return commit[:12]
+    try:
+        return subprocess.run(["git", "rev-parse", "--short=12", "HEAD"], capture_output=True,
+                              text=True, check=True, timeout=5).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def get_environment(base_url: str) -> str:
+    """
+    Środowisko uruchomienia (zmienna TIMING_ENV albo 'ci'/'local' i host
+    testowanej strony) - czasy porównujemy tylko w obrębie środowiska
+    """
+    environment = os.getenv('TIMING_ENV')
+    if environment:
+        return environment
+    where = "ci" if os.getenv('CI', 'false').lower() == 'true' else "local"
+    return f"{where}:{urlparse(base_url).hostname or base_url}"
+
+
+def connect(path: str = DEFAULT_TIMING_DB) -> sqlite3.Connection:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class TimingStore:
+    """
+    Zbiera czasy testów (faza call), kroków page objectów i czasy do popupa
+    (z user_properties, także z workerów xdist) i na końcu sesji dopisuje
+    je jednym INSERT-em.
+    """
+
+    def __init__(self, path: str, environment: str):
+        self.path = path
+        self.environment = environment
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.rows: List[Tuple[str, str, float, int, Optional[str]]] = []
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "call":
+            return
+        self.rows.append(("test", report.nodeid, report.duration, 1, report.outcome))
+        for name, value in report.user_properties:
+            if name == STEP_PROPERTY:
+                for step, stats in value.items():
+                    self.rows.append(("step", f"{report.nodeid}::{step}", stats["duration_s"],
+                                      stats["calls"], report.outcome))
+            elif name == POPUP_PROPERTY:
+                # Tylko popupy zmierzone od kliknięcia - reszta nie jest porównywalna
+                for timing in value:
+                    if timing["since_click"] and not timing["already_visible"]:
+                        self.rows.append(("popup", report.nodeid, timing["latency_ms"] / 1000, 1,
+                                          report.outcome))
+
+    @pytest.hookimpl
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if not self.rows:
+            return
+        with connect(self.path) as connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (commit_sha, started_at, environment) VALUES (?, ?, ?)",
+                (get_commit(), self.started_at, self.environment),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO timings (run_id, kind, name, duration_s, calls, outcome) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id,) + row for row in self.rows],
+            )
+        connection.close()
+
+
+def robust_score(value: float, baseline: Sequence[float], min_spread: float = 0.05) -> Tuple[float, float, float]:
+    """
+    Mediana, skalowane MAD i odporny z-score wartości względem bazy.
+    MAD nie spada poniżej min_spread * mediana - stabilne testy nie
+    alarmują przy każdej milisekundzie różnicy.
+    """
+    median = statistics.median(baseline)
+    mad = statistics.median(abs(sample - median) for sample in baseline) * MAD_SCALE
+    spread = max(mad, min_spread * median, 1e-3)
+    return median, mad, (value - median) / spread
+
+
+def compare(connection: sqlite3.Connection, run_id: Optional[int] = None, window: int = 10,
+            threshold: float = 3.5, min_delta_s: float = 0.5, min_samples: int = 3,
+            kind: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Porównuje czasy uruchomienia (domyślnie ostatniego) z medianą z `window`
+    poprzednich uruchomień w tym samym środowisku. Zwraca nazwy, których
+    odporny z-score przekracza próg, a wzrost jest większy niż min_delta_s.
+    """
+    if run_id is None:
+        row = connection.execute("SELECT MAX(id) FROM runs").fetchone()
+        run_id = row[0] if row else None
+    if run_id is None:
+        return []
+    environment = connection.execute("SELECT environment FROM runs WHERE id = ?", (run_id,)).fetchone()
+    if environment is None:
+        raise ValueError(f"Brak uruchomienia {run_id}")
+    baseline_runs = [row[0] for row in connection.execute(
+        "SELECT id FROM runs WHERE environment = ? AND id < ? ORDER BY id DESC LIMIT ?",
+        (environment[0], run_id, window),
+    )]
+    if not baseline_runs:
+        return []
+    placeholders = ",".join("?" * len(baseline_runs))
+    kind_filter = "AND kind = ?" if kind else ""
+    kind_args = (kind,) if kind else ()
+    history: Dict[Tuple[str, str], List[float]] = {}
+    for row_kind, name, duration in connection.execute(
+            f"SELECT kind, name, duration_s FROM timings WHERE run_id IN ({placeholders}) "
+            f"AND outcome = 'passed' {kind_filter}", (*baseline_runs, *kind_args)):
+        history.setdefault((row_kind, name), []).append(duration)
+
+    regressions = []
+    for row_kind, name, duration in connection.execute(
+            f"SELECT kind, name, duration_s FROM timings WHERE run_id = ? {kind_filter} ORDER BY kind, name",
+            (run_id, *kind_args)):
+        baseline = history.get((row_kind, name), [])
+        if len(baseline) < min_samples:
+            continue
+        median, mad, score = robust_score(duration, baseline)
+        if score > threshold and duration - median > min_delta_s:
+            regressions.append({
+                "kind": row_kind,
+                "name": name,
+                "duration_s": round(duration, 3),
+                "baseline_median_s": round(median, 3),
+                "baseline_mad_s": round(mad, 3),
+                "score": round(score, 1),
+                "samples": len(baseline),
+            })
+    return sorted(regressions, key=lambda item: item["score"], reverse=True)
+
+
+def popup_distribution(connection: sqlite3.Connection, environment: Optional[str] = None,
+                       last: int = 50) -> Dict[str, Dict[str, Any]]:
+    """
+    Rozkład czasu do popupa per test z ostatnich `last` uruchomień
+    (domyślnie w środowisku ostatniego uruchomienia)
+    """
+    if environment is None:
+        row = connection.execute("SELECT environment FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        if row is None:
+            return {}
+        environment = row[0]
+    latencies: Dict[str, List[float]] = {}
+    for name, duration in connection.execute(
+            "SELECT t.name, t.duration_s FROM timings t WHERE t.kind = 'popup' AND t.run_id IN "
+            "(SELECT id FROM runs WHERE environment = ? ORDER BY id DESC LIMIT ?) ORDER BY t.name",
+            (environment, last)):
+        latencies.setdefault(name, []).append(round(duration * 1000, 1))
+    return {name: latency_summary(values) for name, values in latencies.items()}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Historia czasów testów i wykrywanie regresji")
+    parser.add_argument("--db", default=DEFAULT_TIMING_DB, help="Plik bazy SQLite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare_parser = commands.add_parser("compare", help="Porównaj uruchomienie z kroczącą bazą")
+    compare_parser.add_argument("--run", type=int, default=None, help="Id uruchomienia (domyślnie ostatnie)")
+    compare_parser.add_argument("--window", type=int, default=10, help="Ile poprzednich uruchomień w bazie")
+    compare_parser.add_argument("--threshold", type=float, default=3.5, help="Próg odpornego z-score")
+    compare_parser.add_argument("--min-delta", type=float, default=0.5, help="Minimalny wzrost w sekundach")
+    compare_parser.add_argument("--kind", choices=("test", "step", "popup"), default=None)
+    commands.add_parser("runs", help="Lista zapisanych uruchomień")
+    popups_parser = commands.add_parser("popups", help="Rozkład czasu do popupa z ostatnich uruchomień")
+    popups_parser.add_argument("--last", type=int, default=50, help="Ile ostatnich uruchomień")
+    popups_parser.add_argument("--env", default=None, help="Środowisko (domyślnie ostatniego uruchomienia)")
+    args = parser.parse_args(argv)
+
+    connection = connect(args.db)
+    try:
+        if args.command == "runs":
+            for run_id, commit, started_at, environment, tests in connection.execute(
+                    "SELECT r.id, r.commit_sha, r.started_at, r.environment, "
+                    "(SELECT COUNT(*) FROM timings t WHERE t.run_id = r.id AND t.kind = 'test') "
+                    "FROM runs r ORDER BY r.id"):
+                print(f"{run_id:>5}  {started_at}  {commit}  {environment}  {tests} testów")
+            return
+        if args.command == "popups":
+            distribution = popup_distribution(connection, args.env, args.last)
+            if not distribution:
+                print("Brak zmierzonych popupów")
+            for name, summary in distribution.items():
+                print(f"{name}: n={summary['count']}  p50={summary['p50_ms']} ms  p90={summary['p90_ms']} ms  "
+                      f"p99={summary['p99_ms']} ms  max={summary['max_ms']} ms")
+            return
+        regressions = compare(connection, args.run, args.window, args.threshold, args.min_delta,
+                              kind=args.kind)
+    finally:
+        connection.close()
+    if not regressions:
+        print("Brak regresji czasów")
+        return
+    print(f"Regresje czasów ({len(regressions)}):")
+    for item in regressions:
+        print(f"  [{item['kind']}] {item['name']}: {item['duration_s']} s "
+              f"(mediana {item['baseline_median_s']} s, MAD {item['baseline_mad_s']} s, "
+              f"z={item['score']}, n={item['samples']})")
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()